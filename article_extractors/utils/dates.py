@@ -0,0 +1,35 @@
+"""
+Published-date parsing shared by the RSS, scraping and summarization services.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a published date string into a timezone-aware datetime.
+
+    Accepts ISO 8601 (what `BaseNewsFeedParser._parse_datetime` and the
+    scrapers emit) and RFC 822 dates (raw RSS pubDate). Naive dates are
+    taken as UTC.
+
+    Returns:
+        Aware datetime, or None if the value is missing or unparseable.
+    """
+    if not value or value == "NA":
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
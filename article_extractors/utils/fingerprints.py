@@ -0,0 +1,179 @@
+"""
+Text fingerprints for near-duplicate detection.
+
+- `shingles`: normalized word k-shingles of a text
+- `MinHasher`: MinHash signatures whose agreement estimates the Jaccard
+  similarity of two shingle sets
+- `MinHashLSH`: banded locality-sensitive hashing over MinHash signatures,
+  so candidates are found without comparing every pair
+- `simhash`: 64-bit SimHash of a text; near-identical texts differ in few
+  bits (`hamming_distance`)
+- `fingerprint`: content hash and SimHash of an article body, as stored for
+  change detection
+
+All hashing uses crc32 so fingerprints are stable across processes and can
+be stored.
+"""
+
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+# Mersenne prime used by the MinHash permutations
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Words ignored when shingling headlines and descriptions
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was "
+    "were will with after over amid says said".split()
+)
+
+
+def shingles(text: str, k: int = 1) -> Set[str]:
+    """
+    Word k-shingles of a text (lowercased, punctuation and stopwords removed).
+
+    Args:
+        text: Input text.
+        k: Words per shingle (1 = word set, robust to rewording across sources).
+    """
+    words = [w for w in _WORD.findall((text or "").lower()) if w not in _STOPWORDS]
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+
+
+def _hash_shingles(items: Set[str]) -> np.ndarray:
+    return np.fromiter((zlib.crc32(s.encode()) for s in items), dtype=np.uint64, count=len(items))
+
+
+class MinHasher:
+    """MinHash signatures with universal hash permutations."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1) -> None:
+        """
+        Args:
+            num_perm: Signature length (more = more accurate, slower).
+            seed: Seed of the permutations (signatures are only comparable
+                  between hashers with the same seed and num_perm).
+        """
+        self.num_perm = num_perm
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: Set[str]) -> np.ndarray:
+        """MinHash signature (uint32 per permutation) of a shingle set."""
+        if not items:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+
+        hashes = _hash_shingles(items)
+        # (num_perm, n_shingles) permuted hashes; min over shingles
+        permuted = ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def jaccard(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+def lsh_parameters(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows <= num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) is closest to the threshold.
+    """
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """Banded LSH index over MinHash signatures."""
+
+    def __init__(self, num_perm: int, threshold: float) -> None:
+        self.bands, self.rows = lsh_parameters(num_perm, threshold)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[b * self.rows : (b + 1) * self.rows].tobytes() for b in range(self.bands)
+        ]
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> Set[Hashable]:
+        """Keys sharing at least one band with the signature."""
+        candidates: Set[Hashable] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        return candidates
+
+
+def simhash(text: str, k: int = 3) -> int:
+    """
+    64-bit SimHash over word k-shingles.
+
+    Returns:
+        Signed 64-bit integer (fits a BIGINT column).
+    """
+    items = shingles(text, k)
+    if not items:
+        return 0
+
+    # two crc32 halves make a 64-bit hash per shingle
+    low = _hash_shingles(items)
+    high = np.fromiter(
+        (zlib.crc32(s.encode(), 0x5BD1E995) for s in items), dtype=np.uint64, count=len(items)
+    )
+    hashes = (high << np.uint64(32)) | low
+
+    bits = ((hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)).astype(np.int8)
+    votes = (2 * bits - 1).sum(axis=0)
+
+    value = int(sum(1 << i for i in range(64) if votes[i] > 0))
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two 64-bit fingerprints."""
+    return bin((first ^ second) & ((1 << 64) - 1)).count("1")
+
+
+def fingerprint(body: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Content hash and SimHash of an article body.
+
+    Returns:
+        (sha256 hex digest, signed 64-bit SimHash), or (None, None) for an empty body.
+    """
+    if not body:
+        return None, None
+
+    normalized = " ".join(body.split())
+    return hashlib.sha256(normalized.encode()).hexdigest(), simhash(normalized)
+
+
+def jaccard(first: Sequence[str], second: Sequence[str]) -> float:
+    """Exact Jaccard similarity of two shingle collections."""
+    a, b = set(first), set(second)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
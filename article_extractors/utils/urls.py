@@ -0,0 +1,78 @@
+"""
+Canonical article URLs.
+
+Feeds link to the same article with different tracking parameters, letter
+case, fragments and trailing slashes. `canonicalize_url` maps those variants
+to one string, stored in raw_articles.canonical_url and registered once in
+article_urls (the unique key across the raw_articles partitions).
+"""
+
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# query parameters that never change the article
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "mc_cid",
+        "mc_eid",
+        "ref",
+        "ref_src",
+        "referrer",
+        "from",
+        "at_medium",
+        "at_campaign",
+        "ocid",
+        "cmpid",
+        "ito",
+    }
+)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of an article URL.
+
+    - scheme and host lowercased, default ports dropped
+    - fragment and tracking parameters (utm_*, fbclid, ...) removed
+    - remaining query parameters sorted
+    - trailing slash removed from the path
+
+    The scheme is kept as is (http and https pages may differ).
+
+    Returns:
+        The canonical URL, or None for an empty or relative URL or one with
+        an invalid port.
+    """
+    if not url or url == "NA":
+        return None
+
+    parts = urlsplit(url.strip())
+    if not parts.scheme or not parts.netloc:
+        return None
+
+    try:
+        port = parts.port
+    except ValueError:
+        # non-numeric or out of range ("example.com:99999")
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
@@ -2,6 +2,8 @@ service_names = {
     "rss_service": "kalinga",
     "scraping_service": "bundelkhand",
     "summarization_service": "amarkantak",
+    "revisit_service": "chitrakoot",
+    "outbox_relay_service": "rameshwaram",
     "all_service": "mahabharat",
 }
 
@@ -0,0 +1,172 @@
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from config.env import get_env
+from database.connection import DBConnection, pool_options
+
+
+# async driver used for each sync URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Rewrite a DATABASE_URL for its async driver
+    (postgresql:// -> postgresql+asyncpg://). URLs that already name an
+    async driver are returned unchanged.
+    """
+    scheme, _, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+class AsyncDBConnection:
+    """
+    Async engine for asyncio services, next to the sync `DBConnection`.
+
+    Uses the same DATABASE_URL and DB_POOL_* settings; the pool is the
+    async-adapted QueuePool, so checkouts await instead of blocking a thread.
+    """
+
+    _engine: Optional[AsyncEngine] = None
+
+    _session_factory: Optional[async_sessionmaker] = None
+
+    _lock = Lock()
+
+    @classmethod
+    def init(cls, database_url: str) -> AsyncEngine:
+
+        if cls._engine is not None:
+            return cls._engine
+
+        with cls._lock:
+            if cls._engine is None:
+                url = async_database_url(database_url)
+
+                options = pool_options(database_url)
+                # the instrumented pool is sync-only
+                options.pop("poolclass", None)
+
+                try:
+                    cls._engine = create_async_engine(url, **options)
+                    cls._session_factory = async_sessionmaker(
+                        cls._engine, expire_on_commit=False
+                    )
+                    logging.info(f"Async database engine ready ({make_url(url).drivername})")
+
+                except Exception as e:
+                    logging.error(f"Failed to create async engine {str(e)}")
+
+                    raise e
+
+        return cls._engine
+
+    @classmethod
+    def get_engine(cls) -> AsyncEngine:
+
+        if cls._engine is None:
+            logging.info("First initilize async database connection.")
+            raise Exception("First initilize async database connection.")
+
+        return cls._engine
+
+    @classmethod
+    def get_session_factory(cls, engine: Optional[AsyncEngine] = None) -> async_sessionmaker:
+        """Session factory of an async engine (cached per engine)."""
+        if engine is None or engine is cls._engine:
+            if cls._session_factory is None:
+                cls.get_engine()
+            return cls._session_factory
+
+        with cls._lock:
+            factory = _session_factories.get(engine)
+            if factory is None:
+                factory = async_sessionmaker(engine, expire_on_commit=False)
+                _session_factories[engine] = factory
+        return factory
+
+    @classmethod
+    def pool_stats(cls, engine: Optional[AsyncEngine] = None) -> Dict[str, Any]:
+        """Connection pool statistics (see `DBConnection.pool_stats`)."""
+        engine = engine or cls._engine
+        if engine is None:
+            return {}
+        return DBConnection.pool_stats(engine.sync_engine)
+
+    @classmethod
+    async def dispose(cls) -> None:
+        """Close every pooled connection (call before the event loop stops)."""
+        engine = cls._engine
+        if engine is None:
+            return
+
+        with cls._lock:
+            cls._engine = None
+            cls._session_factory = None
+
+        await engine.dispose()
+
+
+# session factories of engines other than the initialized one
+_session_factories: "weakref.WeakKeyDictionary[AsyncEngine, async_sessionmaker]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@asynccontextmanager
+async def async_session_scope(engine: Optional[AsyncEngine] = None) -> AsyncIterator[AsyncSession]:
+    """
+    Async counterpart of `session_scope`: commits on success, rolls back on
+    error and always returns the connection to the pool.
+
+    Args:
+        engine: Async engine to use (default: the one set up by `AsyncDBConnection.init`).
+    """
+    session = AsyncDBConnection.get_session_factory(engine)()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """
+    Async engine for DATABASE_URL, or None when the async driver is not
+    installed or ASYNC_DB_ENABLED=false (callers then fall back to the sync
+    engine in a worker thread).
+    """
+    if get_env("ASYNC_DB_ENABLED", default="true").lower() == "false":
+        return None
+
+    database_url = get_env("DATABASE_URL")
+    if not database_url:
+        return None
+
+    try:
+        # asyncio support needs greenlet; the driver is imported by create_async_engine
+        import greenlet  # noqa: F401
+
+        return AsyncDBConnection.init(database_url)
+    except ImportError as e:
+        logging.warning(f"Async database driver not available, using the sync engine: {e}")
+        return None
@@ -0,0 +1,344 @@
+"""
+Chunked backfills of derived columns.
+
+Each chunk is read with keyset pagination (id > last id, ordered by id) and
+written in its own short transaction, so no long-running statement holds
+row locks on the whole table and the backfill can be stopped and resumed.
+
+    python -m database.backfill published-at [--batch-size 5000]
+    python -m database.backfill article-bodies [--batch-size 5000]
+    python -m database.backfill canonical-urls [--batch-size 5000]
+"""
+
+import argparse
+import logging
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import (
+    Connection,
+    Engine,
+    MetaData,
+    Row,
+    Select,
+    Table,
+    bindparam,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from article_extractors.utils.dates import parse_published_at
+from article_extractors.utils.urls import canonicalize_url
+from database.body_codec import decompress_body
+from database.repository.article_bodies import ArticleBodyRepository
+
+
+# Rows read and updated per transaction
+BATCH_SIZE = 5000
+
+PUBLISHED_AT_TABLES = ("raw_articles", "summarized_articles")
+
+# tables whose legacy inline body column moves to article_bodies
+BODY_TABLES = ("summarized_articles", "summarized_article_versions")
+
+
+def _in_chunks(
+    bind: Union[Engine, Connection],
+    table_name: str,
+    read: Select,
+    apply: Callable[[Connection, List[Row]], int],
+    after_id: int,
+) -> int:
+    """
+    Run `apply` on keyset chunks of `read` (which takes an :after_id
+    parameter), one transaction per chunk.
+
+    Args:
+        bind: Engine, or a connection in autocommit mode (as inside an Alembic
+              `autocommit_block`) so every chunk commits on its own.
+
+    Returns:
+        Total of what `apply` returned.
+    """
+    logger = logging.getLogger("Backfill")
+
+    updated = 0
+    while True:
+        if isinstance(bind, Engine):
+            with bind.connect() as connection:
+                rows = connection.execute(read, {"after_id": after_id}).all()
+        else:
+            rows = bind.execute(read, {"after_id": after_id}).all()
+
+        if not rows:
+            break
+
+        after_id = rows[-1].id
+        if isinstance(bind, Engine):
+            with bind.begin() as connection:
+                updated += apply(connection, rows)
+        else:
+            updated += apply(bind, rows)
+
+        logger.info(f"{table_name}: backfilled up to id {after_id} ({updated} rows)")
+
+    return updated
+
+
+def backfill_published_at(
+    bind: Union[Engine, Connection],
+    table_name: str,
+    batch_size: int = BATCH_SIZE,
+    after_id: int = 0,
+) -> int:
+    """
+    Fill published_at from the published_date strings where it is NULL.
+
+    Args:
+        bind: Engine, or a connection in autocommit mode (as inside an Alembic
+              `autocommit_block`) so every chunk commits on its own.
+        table_name: raw_articles or summarized_articles.
+        batch_size: Rows per chunk.
+        after_id: Resume after this id.
+
+    Returns:
+        Number of rows updated.
+    """
+    table = Table(table_name, MetaData(), autoload_with=bind)
+    read = (
+        select(table.c.id, table.c.published_date)
+        .where(table.c.id > bindparam("after_id"))
+        .where(table.c.published_at.is_(None))
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    write = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(published_at=bindparam("value"))
+    )
+
+    def apply(connection: Connection, rows: List[Row]) -> int:
+        values = [
+            {"row_id": row.id, "value": parsed}
+            for row in rows
+            if (parsed := parse_published_at(row.published_date)) is not None
+        ]
+        if values:
+            connection.execute(write, values)
+        return len(values)
+
+    return _in_chunks(bind, table_name, read, apply, after_id)
+
+
+def backfill_article_bodies(
+    bind: Union[Engine, Connection],
+    table_name: str,
+    batch_size: int = BATCH_SIZE,
+    after_id: int = 0,
+) -> int:
+    """
+    Move bodies from the legacy inline body column to article_bodies.
+
+    Each chunk stores the compressed bodies, points body_hash at them and
+    clears the inline column, so the table shrinks as vacuum reclaims it.
+
+    Args:
+        bind: Engine or autocommit connection (see `_in_chunks`).
+        table_name: summarized_articles or summarized_article_versions.
+        batch_size: Rows per chunk.
+        after_id: Resume after this id.
+
+    Returns:
+        Number of rows moved.
+    """
+    table = Table(table_name, MetaData(), autoload_with=bind)
+    if "body" not in table.c:
+        return 0
+
+    read = (
+        select(table.c.id, table.c.body)
+        .where(table.c.id > bindparam("after_id"))
+        .where(table.c.body.is_not(None))
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    write = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(body_hash=bindparam("hash"), body=None)
+    )
+
+    def apply(connection: Connection, rows: List[Row]) -> int:
+        hashes = ArticleBodyRepository.store_all(connection, (row.body for row in rows))
+        connection.execute(
+            write, [{"row_id": row.id, "hash": hashes.get(row.body)} for row in rows]
+        )
+        return len(rows)
+
+    return _in_chunks(bind, table_name, read, apply, after_id)
+
+
+def restore_inline_bodies(
+    bind: Union[Engine, Connection],
+    table_name: str,
+    batch_size: int = BATCH_SIZE,
+    after_id: int = 0,
+) -> int:
+    """
+    Copy bodies from article_bodies back into the inline body column
+    (reverse of `backfill_article_bodies`, used by the downgrade).
+
+    Returns:
+        Number of rows restored.
+    """
+    metadata = MetaData()
+    table = Table(table_name, metadata, autoload_with=bind)
+    bodies = Table("article_bodies", metadata, autoload_with=bind)
+
+    read = (
+        select(table.c.id, bodies.c.codec, bodies.c.data)
+        .join(bodies, bodies.c.hash == table.c.body_hash)
+        .where(table.c.id > bindparam("after_id"))
+        .where(table.c.body.is_(None))
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    write = (
+        update(table).where(table.c.id == bindparam("row_id")).values(body=bindparam("text"))
+    )
+
+    def apply(connection: Connection, rows: List[Row]) -> int:
+        connection.execute(
+            write,
+            [{"row_id": row.id, "text": decompress_body(row.codec, row.data)} for row in rows],
+        )
+        return len(rows)
+
+    return _in_chunks(bind, table_name, read, apply, after_id)
+
+
+def backfill_canonical_urls(
+    bind: Union[Engine, Connection],
+    batch_size: int = BATCH_SIZE,
+    after_id: int = 0,
+) -> int:
+    """
+    Fill raw_articles.canonical_url for rows stored before it existed and
+    register the URLs in article_urls. PostgreSQL only.
+
+    The first article (lowest id) with a canonical URL keeps it in
+    article_urls; later ones with the same URL get the URL too and point
+    duplicate_of_id at that article (unless they already have a
+    representative), so they are no longer offered as story representatives.
+    Rows whose article_url cannot be canonicalized stay NULL.
+
+    Args:
+        bind: Engine or autocommit connection (see `_in_chunks`).
+        batch_size: Rows per chunk.
+        after_id: Resume after this id.
+
+    Returns:
+        Number of rows updated.
+    """
+    metadata = MetaData()
+    table = Table("raw_articles", metadata, autoload_with=bind)
+    urls = Table("article_urls", metadata, autoload_with=bind)
+
+    read = (
+        select(table.c.id, table.c.article_url, table.c.createdAt)
+        .where(table.c.id > bindparam("after_id"))
+        .where(table.c.canonical_url.is_(None))
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    write = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(
+            canonical_url=bindparam("url"),
+            duplicate_of_id=func.coalesce(table.c.duplicate_of_id, bindparam("first_id")),
+        )
+    )
+
+    def apply(connection: Connection, rows: List[Row]) -> int:
+        canonical = {
+            row.id: url for row in rows if (url := canonicalize_url(row.article_url)) is not None
+        }
+        if not canonical:
+            return 0
+
+        # rows come in id order, so the first of each URL is the oldest article
+        first: Dict[str, Row] = {}
+        for row in rows:
+            if row.id in canonical:
+                first.setdefault(canonical[row.id], row)
+
+        connection.execute(
+            insert(urls)
+            .values(
+                [
+                    {"canonical_url": url, "raw_article_id": row.id, "createdAt": row.createdAt}
+                    for url, row in first.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["canonical_url"])
+        )
+        registered = dict(
+            connection.execute(
+                select(urls.c.canonical_url, urls.c.raw_article_id).where(
+                    urls.c.canonical_url.in_(list(first))
+                )
+            ).all()
+        )
+
+        connection.execute(
+            write,
+            [
+                {
+                    "row_id": id,
+                    "url": url,
+                    "first_id": None if registered[url] == id else registered[url],
+                }
+                for id, url in canonical.items()
+            ],
+        )
+        return len(canonical)
+
+    return _in_chunks(bind, "raw_articles", read, apply, after_id)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill derived columns in chunks")
+    parser.add_argument("column", choices=["published-at", "article-bodies", "canonical-urls"])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+
+    from config.env import get_env
+    from database.connection import DBConnection
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    engine = DBConnection.init(get_env("DATABASE_URL", required=True))
+
+    if args.column == "published-at":
+        for table_name in PUBLISHED_AT_TABLES:
+            backfill_published_at(engine, table_name, batch_size=args.batch_size)
+
+    elif args.column == "canonical-urls":
+        backfill_canonical_urls(engine, batch_size=args.batch_size)
+
+    else:
+        for table_name in BODY_TABLES:
+            backfill_article_bodies(engine, table_name, batch_size=args.batch_size)
+
+        bodies, size, stored = ArticleBodyRepository.stats(engine)
+        logging.info(f"article_bodies: {bodies} bodies, {size} bytes stored in {stored}")
+
+
+if __name__ == "__main__":
+    main()
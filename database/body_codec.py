@@ -0,0 +1,63 @@
+"""
+Compression of article bodies stored in article_bodies.
+
+Bodies are keyed by the sha256 of their exact text, so identical bodies
+(syndicated copies, unchanged revisits, the previous version of a revised
+article) are stored once. They are compressed with zstd when the
+`zstandard` package is installed and with zlib otherwise; the codec is
+stored next to the data, so rows written with either stay readable.
+"""
+
+import hashlib
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # zlib fallback
+    zstandard = None
+
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+# zstd level: article text compresses ~3-4x, higher levels gain little
+ZSTD_LEVEL = 9
+
+ZLIB_LEVEL = 6
+
+
+def body_hash(body: str) -> str:
+    """sha256 hex digest of the exact body text (the article_bodies key)."""
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def compress_body(body: str) -> Tuple[str, bytes]:
+    """
+    Compress a body with the best available codec.
+
+    Returns:
+        (codec, compressed bytes).
+    """
+    raw = body.encode()
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return CODEC_ZLIB, zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_body(codec: str, data: bytes) -> str:
+    """
+    Decompress a stored body.
+
+    Raises:
+        ValueError: Unknown codec, or zstd data without `zstandard` installed.
+    """
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode()
+
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd-compressed body but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode()
+
+    raise ValueError(f"Unknown body codec {codec!r}")
@@ -0,0 +1,415 @@
+"""
+Bulk loader for historical archives.
+
+Streams articles from JSONL or CSV files into raw_articles and
+summarized_articles with PostgreSQL COPY instead of ORM inserts:
+
+1. a chunk of records is normalized in Python (canonical URL, published_at,
+   compressed body) and copied into temporary staging tables
+2. one statement merges the chunk: canonical URLs are registered in
+   article_urls with ON CONFLICT DO NOTHING, and only the newly registered
+   articles are inserted into raw_articles, summarized_articles (records
+   with a body or summary) and article_bodies
+3. the chunk commits and the checkpoint file records how many input lines
+   are done
+
+A rerun resumes after the last checkpoint; articles already stored (by an
+earlier run or by the RSS service) are skipped, so replaying a chunk is
+harmless.
+
+Records use the feed keys (title, link, source, image_url, pub_date) or the
+column names (article_url, img_src, published_date); body and summary are
+optional. "createdAt" is the publish time (capped at now): articles from
+before the tables were partitioned land in the <table>_legacy partition
+(MINVALUE up to the cutover month), later ones in their monthly partitions.
+
+    python -m database.bulk_loader archive.jsonl [more.csv ...] [--chunk-size 50000]
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Engine
+from tqdm import tqdm
+
+from article_extractors.utils.dates import parse_published_at
+from article_extractors.utils.fingerprints import fingerprint
+from article_extractors.utils.urls import canonicalize_url
+from database.body_codec import body_hash, compress_body
+from database.models.models import SUMMARY_STATUS_FINAL, SUMMARY_STATUS_PENDING
+
+
+_STAGING_SQL = """
+CREATE TEMP TABLE staging_articles (
+    line_no bigint,
+    title text,
+    article_url text,
+    canonical_url text,
+    source text,
+    image_url text,
+    published_date text,
+    published_at timestamptz,
+    body_hash varchar(64),
+    content_hash varchar(64),
+    simhash bigint,
+    summary text
+) ON COMMIT DROP;
+CREATE TEMP TABLE staging_bodies (
+    hash varchar(64),
+    codec varchar(8),
+    size integer,
+    data bytea
+) ON COMMIT DROP;
+"""
+
+_ARTICLE_COLUMNS = (
+    "line_no",
+    "title",
+    "article_url",
+    "canonical_url",
+    "source",
+    "image_url",
+    "published_date",
+    "published_at",
+    "body_hash",
+    "content_hash",
+    "simhash",
+    "summary",
+)
+
+_MERGE_SQL = """
+WITH batch AS (
+    SELECT DISTINCT ON (canonical_url)
+        *,
+        LEAST(COALESCE(published_at, now()), now())::timestamp AS created_at
+    FROM staging_articles
+    ORDER BY canonical_url, line_no
+),
+registered AS (
+    INSERT INTO article_urls (canonical_url, raw_article_id, "createdAt")
+    SELECT canonical_url, nextval('raw_articles_id_seq'), created_at FROM batch
+    ON CONFLICT (canonical_url) DO NOTHING
+    RETURNING canonical_url, raw_article_id
+),
+raw AS (
+    INSERT INTO raw_articles (
+        id, title, article_url, canonical_url, source, image_url,
+        published_date, published_at, processed, "createdAt", "updatedAt"
+    )
+    SELECT
+        r.raw_article_id, b.title, b.article_url, b.canonical_url, b.source, b.image_url,
+        b.published_date, b.published_at,
+        b.body_hash IS NOT NULL OR b.summary IS NOT NULL,
+        b.created_at, b.created_at
+    FROM registered r JOIN batch b USING (canonical_url)
+    RETURNING id
+),
+summarized AS (
+    INSERT INTO summarized_articles (
+        title, article_url, source, img_src, published_date, published_at,
+        body_hash, content_hash, simhash, summary, summary_status, raw_article_id, version,
+        "createdAt", "updatedAt"
+    )
+    SELECT
+        b.title, b.article_url, b.source, b.image_url, b.published_date, b.published_at,
+        b.body_hash, b.content_hash, b.simhash, b.summary,
+        CASE WHEN b.summary IS NULL THEN %(pending)s ELSE %(final)s END,
+        r.raw_article_id, 1,
+        b.created_at, b.created_at
+    FROM registered r JOIN batch b USING (canonical_url)
+    WHERE b.body_hash IS NOT NULL OR b.summary IS NOT NULL
+    RETURNING body_hash
+),
+bodies AS (
+    INSERT INTO article_bodies (hash, codec, size, data, "createdAt")
+    SELECT DISTINCT ON (hash) hash, codec, size, data, now()
+    FROM staging_bodies
+    WHERE hash IN (SELECT body_hash FROM summarized)
+    ON CONFLICT (hash) DO NOTHING
+    RETURNING 1
+)
+SELECT
+    (SELECT count(*) FROM raw),
+    (SELECT count(*) FROM summarized),
+    (SELECT count(*) FROM bodies)
+"""
+
+
+def _first(record: Dict[str, Any], *keys: str) -> Optional[str]:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, "", "NA"):
+            return str(value)
+    return None
+
+
+def read_records(path: str, fmt: str = "auto") -> Iterator[Dict[str, Any]]:
+    """
+    Records of a JSONL or CSV file, one per line / row.
+
+    Args:
+        path: Input file.
+        fmt: "jsonl", "csv" or "auto" (by extension).
+    """
+    if fmt == "auto":
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as file:
+        if fmt == "csv":
+            yield from csv.DictReader(file)
+            return
+
+        for line in file:
+            line = line.strip()
+            yield json.loads(line) if line else {}
+
+
+class BulkLoader:
+    """COPY-based loader of archived articles with resumable checkpoints."""
+
+    # Records merged per transaction
+    CHUNK_SIZE = 50_000
+
+    def __init__(
+        self,
+        engine: Engine,
+        chunk_size: Optional[int] = None,
+        default_source: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            engine: SQLAlchemy engine on PostgreSQL (psycopg2 driver).
+            chunk_size: Override for CHUNK_SIZE.
+            default_source: Source for records without one.
+        """
+        if engine.dialect.name != "postgresql":
+            raise ValueError(f"Bulk loading needs PostgreSQL COPY, got {engine.dialect.name}")
+
+        self._logger = logging.getLogger("BulkLoader")
+        self.engine = engine
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.default_source = default_source or "NA"
+
+    def _normalize(
+        self, line_no: int, record: Dict[str, Any]
+    ) -> Optional[Tuple[List[Any], Optional[List[Any]]]]:
+        """Staging rows (article, body) of a record, or None if it has no usable URL."""
+        article_url = _first(record, "link", "article_url", "url")
+        canonical_url = canonicalize_url(article_url)
+        if canonical_url is None:
+            return None
+
+        published_date = _first(record, "pub_date", "published_date")
+        published_at = parse_published_at(published_date)
+
+        body = _first(record, "body")
+        body_row = None
+        hash = None
+        if body:
+            hash = body_hash(body)
+            codec, data = compress_body(body)
+            body_row = [hash, codec, len(body.encode()), "\\x" + data.hex()]
+        content_hash, body_simhash = fingerprint(body)
+
+        article_row = [
+            line_no,
+            _first(record, "title") or "NA",
+            article_url,
+            canonical_url,
+            _first(record, "source") or self.default_source,
+            _first(record, "image_url", "img_src") or "NA",
+            published_date or "NA",
+            published_at.isoformat() if published_at else None,
+            hash,
+            content_hash,
+            body_simhash,
+            _first(record, "summary"),
+        ]
+        return article_row, body_row
+
+    @staticmethod
+    def _csv(rows: List[List[Any]]) -> io.StringIO:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        return buffer
+
+    def load_chunk(self, records: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, int]:
+        """
+        Copy and merge one chunk in a single transaction.
+
+        Args:
+            records: (line number, record) pairs.
+
+        Returns:
+            Counts of raw_articles, summarized_articles and article_bodies
+            rows inserted and of records skipped for a missing URL.
+        """
+        articles, bodies = [], []
+        for line_no, record in records:
+            rows = self._normalize(line_no, record)
+            if rows is None:
+                continue
+            articles.append(rows[0])
+            if rows[1] is not None:
+                bodies.append(rows[1])
+
+        counts = {
+            "raw_articles": 0,
+            "summarized_articles": 0,
+            "article_bodies": 0,
+            "skipped": len(records) - len(articles),
+        }
+        if not articles:
+            return counts
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(_STAGING_SQL)
+            cursor.copy_expert(
+                f"COPY staging_articles ({', '.join(_ARTICLE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                self._csv(articles),
+            )
+            if bodies:
+                cursor.copy_expert(
+                    "COPY staging_bodies (hash, codec, size, data) FROM STDIN WITH (FORMAT csv)",
+                    self._csv(bodies),
+                )
+
+            cursor.execute(
+                _MERGE_SQL, {"pending": SUMMARY_STATUS_PENDING, "final": SUMMARY_STATUS_FINAL}
+            )
+            raw, summarized, stored = cursor.fetchone()
+            connection.commit()
+
+        except Exception:
+            connection.rollback()
+            raise
+
+        finally:
+            connection.close()
+
+        counts.update(raw_articles=raw, summarized_articles=summarized, article_bodies=stored)
+        return counts
+
+    @staticmethod
+    def _read_checkpoint(path: str, source_path: str) -> Dict[str, Any]:
+        if not os.path.exists(path):
+            return {}
+        with open(path) as file:
+            checkpoint = json.load(file)
+        return checkpoint if checkpoint.get("file") == source_path else {}
+
+    @staticmethod
+    def _write_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+        # write-then-rename, so a crash never leaves a truncated checkpoint
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(checkpoint, file)
+        os.replace(temp_path, path)
+
+    def load(
+        self, path: str, fmt: str = "auto", checkpoint_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Load one file, resuming after its checkpoint.
+
+        Args:
+            path: JSONL or CSV file.
+            fmt: "jsonl", "csv" or "auto".
+            checkpoint_path: Checkpoint file (default: <path>.checkpoint.json).
+
+        Returns:
+            The final checkpoint (lines done and running counts).
+        """
+        source_path = os.path.abspath(path)
+        checkpoint_path = checkpoint_path or f"{path}.checkpoint.json"
+
+        checkpoint = self._read_checkpoint(checkpoint_path, source_path) or {
+            "file": source_path,
+            "lines": 0,
+            "raw_articles": 0,
+            "summarized_articles": 0,
+            "article_bodies": 0,
+            "skipped": 0,
+        }
+        done = checkpoint["lines"]
+        if done:
+            self._logger.info(f"Resuming {path} after line {done}")
+
+        progress = tqdm(desc=os.path.basename(path), unit=" rows", initial=done)
+
+        def flush(chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+            counts = self.load_chunk(chunk)
+            for key, value in counts.items():
+                checkpoint[key] += value
+            checkpoint["lines"] = chunk[-1][0]
+            self._write_checkpoint(checkpoint_path, checkpoint)
+
+            progress.update(len(chunk))
+            progress.set_postfix(
+                new=checkpoint["raw_articles"],
+                summarized=checkpoint["summarized_articles"],
+                skipped=checkpoint["skipped"],
+            )
+
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            for line_no, record in enumerate(read_records(path, fmt), start=1):
+                if line_no <= done:
+                    continue
+                chunk.append((line_no, record))
+                if len(chunk) >= self.chunk_size:
+                    flush(chunk)
+                    chunk = []
+            if chunk:
+                flush(chunk)
+
+        finally:
+            progress.close()
+
+        self._logger.info(
+            f"{path}: {checkpoint['lines']} lines, {checkpoint['raw_articles']} articles loaded, "
+            f"{checkpoint['summarized_articles']} with summary or body, "
+            f"{checkpoint['skipped']} without a usable URL"
+        )
+        return checkpoint
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load archived articles with COPY")
+    parser.add_argument("paths", nargs="+", help="JSONL or CSV files")
+    parser.add_argument("--format", choices=["auto", "jsonl", "csv"], default="auto")
+    parser.add_argument("--chunk-size", type=int, default=BulkLoader.CHUNK_SIZE)
+    parser.add_argument("--source", help="source for records without one")
+    parser.add_argument("--checkpoint", help="checkpoint file (single input only)")
+    args = parser.parse_args(argv)
+
+    if args.checkpoint and len(args.paths) > 1:
+        parser.error("--checkpoint needs a single input file")
+
+    from dotenv import load_dotenv
+
+    from config.env import get_env
+    from database.connection import DBConnection
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    engine = DBConnection.init(get_env("DATABASE_URL", required=True))
+    loader = BulkLoader(engine, chunk_size=args.chunk_size, default_source=args.source)
+
+    for path in args.paths:
+        loader.load(path, fmt=args.format, checkpoint_path=args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
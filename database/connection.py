@@ -1,14 +1,77 @@
 import logging
+import time
+import weakref
+from contextlib import contextmanager
 from threading import Lock
+from typing import Any, Dict, Iterator, Optional
 
 import sqlalchemy
-from sqlalchemy import Engine, Connection
+from sqlalchemy import Engine, Connection, exc
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from config.env import get_env
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+
+def pool_options(database_url: str) -> Dict[str, Any]:
+    """
+    Engine pool settings from the environment.
+
+    Environment Variables:
+        DB_POOL_SIZE:      Connections kept open (default: 10).
+        DB_MAX_OVERFLOW:   Extra connections opened under load (default: 20).
+        DB_POOL_TIMEOUT:   Seconds to wait for a free connection (default: 30).
+        DB_POOL_RECYCLE:   Reopen connections older than this many seconds (default: 1800).
+        DB_POOL_PRE_PING:  Test connections before use (default: true).
+
+    SQLite URLs keep SQLAlchemy's default pool.
+    """
+    if database_url.startswith("sqlite"):
+        return {}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(get_env("DB_POOL_SIZE", default="10")),
+        "max_overflow": int(get_env("DB_MAX_OVERFLOW", default="20")),
+        "pool_timeout": float(get_env("DB_POOL_TIMEOUT", default="30")),
+        "pool_recycle": int(get_env("DB_POOL_RECYCLE", default="1800")),
+        "pool_pre_ping": get_env("DB_POOL_PRE_PING", default="true").lower() != "false",
+    }
 
 
 class DBConnection:
 
     _engine = None
 
+    _session_factory = None
+
     _lock = Lock()
 
     @classmethod
@@ -21,7 +84,10 @@ class DBConnection:
             if cls._engine is None:
 
                 try:
-                    cls._engine = sqlalchemy.create_engine(database_url)
+                    cls._engine = sqlalchemy.create_engine(
+                        database_url, **pool_options(database_url)
+                    )
+                    cls._session_factory = sessionmaker(cls._engine, expire_on_commit=False)
                     logging.info("Database connection estb")
                     # return cls._engine
 
@@ -49,3 +115,86 @@ class DBConnection:
             return None
 
         return cls._engine.connect()
+
+    @classmethod
+    def get_session_factory(cls, engine: Optional[Engine] = None) -> sessionmaker:
+        """
+        Session factory bound to an engine.
+
+        The factory of the initialized engine is created once; other engines
+        (scripts, tests) get a cached factory of their own.
+        """
+        if engine is None or engine is cls._engine:
+            if cls._session_factory is None:
+                cls.get_engine()
+            return cls._session_factory
+
+        with cls._lock:
+            factory = _session_factories.get(engine)
+            if factory is None:
+                factory = sessionmaker(engine, expire_on_commit=False)
+                _session_factories[engine] = factory
+        return factory
+
+    @classmethod
+    def pool_stats(cls, engine: Optional[Engine] = None) -> Dict[str, Any]:
+        """
+        Connection pool statistics.
+
+        Returns:
+            size, checked_out, checked_in and overflow from the pool; for
+            pools created by `init` also checkouts, timeouts and the average
+            and maximum time a checkout waited (ms). Empty without an engine.
+        """
+        engine = engine or cls._engine
+        if engine is None:
+            return {}
+
+        pool = engine.pool
+        stats: Dict[str, Any] = {"pool": pool.__class__.__name__}
+
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+
+        if isinstance(pool, InstrumentedQueuePool):
+            with pool._stats_lock:
+                stats.update(
+                    checkouts=pool.checkouts,
+                    timeouts=pool.timeouts,
+                    wait_avg_ms=round(1000 * pool.wait_total / max(pool.checkouts, 1), 2),
+                    wait_max_ms=round(1000 * pool.wait_max, 2),
+                )
+
+        return stats
+
+
+# session factories of engines other than the initialized one
+_session_factories: "weakref.WeakKeyDictionary[Engine, sessionmaker]" = weakref.WeakKeyDictionary()
+
+
+@contextmanager
+def session_scope(engine: Optional[Engine] = None) -> Iterator[Session]:
+    """
+    Transactional session: commits on success, rolls back on error and always
+    returns the connection to the pool.
+
+    Objects stay usable after the commit (expire_on_commit=False), so ids of
+    inserted rows can be read once the block exits.
+
+    Args:
+        engine: Engine to use (default: the one set up by `DBConnection.init`).
+    """
+    session = DBConnection.get_session_factory(engine)()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
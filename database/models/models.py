@@ -1,5 +1,18 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Boolean
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.sql.functions import func
 from sqlalchemy.orm import relationship
 
@@ -8,17 +21,43 @@ from database.table_names import TABLES
 Base = declarative_base()
 metadata = Base.metadata
 
+# summarized_articles.summary_status values
+SUMMARY_STATUS_PENDING = "pending"  # no summary yet
+SUMMARY_STATUS_PROVISIONAL = "provisional"  # feed description, shown until the LLM summary lands
+SUMMARY_STATUS_FINAL = "final"  # LLM summary
+
+
+# On PostgreSQL raw_articles and summarized_articles are partitioned by month
+# on "createdAt" (database.partitions): their primary key there is
+# (id, "createdAt"), unique lookups go through article_urls and the foreign
+# keys pointing at them are declared here for the ORM only.
+
 
 class RawArticles(Base):
 
     __tablename__ = TABLES["raw_articles"]
 
+    __table_args__ = (
+        # work queue scans only touch rows not yet processed
+        Index(
+            "ix_raw_articles_unprocessed",
+            "id",
+            postgresql_where=text("processed = false"),
+            sqlite_where=text("processed = 0"),
+        ),
+        Index("ix_raw_articles_source_published_at", "source", "published_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
     title = Column(String, nullable=False)
 
     article_url = Column(String, nullable=False)
 
+    # article_url without tracking parameters, fragment, case differences
+    # (dedup key, unique through article_urls)
+    canonical_url = Column(String, nullable=True, index=True)
+
     source = Column(String, nullable=False)
 
     image_url = Column(String, nullable=False)
@@ -27,6 +66,14 @@ class RawArticles(Base):
 
     published_date = Column(String, nullable=False)
 
+    # typed publish time parsed from published_date (time-window queries)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+
+    # representative of the story this article duplicates (other source)
+    duplicate_of_id = Column(
+        Integer(), ForeignKey(f"{TABLES['raw_articles']}.id"), nullable=True, index=True
+    )
+
     createdAt = Column(DateTime, nullable=False, insert_default=func.now())
 
     updatedAt = Column(
@@ -45,6 +92,13 @@ class SummarizedArticles(Base):
 
     __tablename__ = TABLES["summarized_articles"]
 
+    __table_args__ = (
+        # latest articles per source / per category
+        Index("ix_summarized_articles_source_createdAt", "source", "createdAt"),
+        Index("ix_summarized_articles_category_id_createdAt", "category_id", "createdAt"),
+        Index("ix_summarized_articles_source_published_at", "source", "published_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
     title = Column(String, nullable=False)
@@ -53,14 +107,35 @@ class SummarizedArticles(Base):
 
     source = Column(String, nullable=False)
 
-    body = Column(String, nullable=True)
+    # full text lives in article_bodies (see ArticleBodyRepository.get_body)
+    body_hash = Column(
+        String(64), ForeignKey(f"{TABLES['article_bodies']}.hash"), nullable=True
+    )
 
     summary = Column(String, nullable=True)
 
+    summary_status = Column(
+        String, nullable=False, default=SUMMARY_STATUS_PENDING, index=True
+    )
+
     img_src = Column(String)
 
     published_date = Column(String)
 
+    # typed publish time parsed from published_date (time-window queries)
+    published_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    # change detection: sha256 of the body, 64-bit SimHash, revisit schedule
+    content_hash = Column(String(64), nullable=True)
+
+    simhash = Column(BigInteger, nullable=True)
+
+    version = Column(Integer, nullable=False, default=1)
+
+    last_checked_at = Column(DateTime, nullable=True)
+
+    next_check_at = Column(DateTime, nullable=True, index=True)
+
     createdAt = Column(DateTime, nullable=False, insert_default=func.now())
 
     updatedAt = Column(
@@ -72,10 +147,112 @@ class SummarizedArticles(Base):
 
     raw_article = relationship("RawArticles", back_populates="summary", uselist=False)
     raw_article_id = Column(
-        Integer(), ForeignKey(f"{TABLES['raw_articles']}.id"), unique=True
+        Integer(), ForeignKey(f"{TABLES['raw_articles']}.id"), index=True
     )
 
 
+class SummarizedArticleVersions(Base):
+    """A superseded version of a summarized article (body and summary before a revision)."""
+
+    __tablename__ = TABLES["summarized_article_versions"]
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+
+    article_id = Column(
+        Integer(),
+        ForeignKey(f"{TABLES['summarized_articles']}.id"),
+        nullable=False,
+        index=True,
+    )
+
+    version = Column(Integer, nullable=False)
+
+    body_hash = Column(
+        String(64), ForeignKey(f"{TABLES['article_bodies']}.hash"), nullable=True
+    )
+
+    summary = Column(String, nullable=True)
+
+    content_hash = Column(String(64), nullable=True)
+
+    simhash = Column(BigInteger, nullable=True)
+
+    createdAt = Column(DateTime, nullable=False, insert_default=func.now())
+
+
+class ArticleBodies(Base):
+    """Compressed article text, stored once per distinct body (see database.body_codec)."""
+
+    __tablename__ = TABLES["article_bodies"]
+
+    # sha256 of the uncompressed text
+    hash = Column(String(64), primary_key=True)
+
+    codec = Column(String(8), nullable=False)
+
+    # uncompressed size in bytes
+    size = Column(Integer, nullable=False)
+
+    data = Column(LargeBinary, nullable=False)
+
+    createdAt = Column(DateTime, nullable=False, insert_default=func.now())
+
+
+class ArticleUrls(Base):
+    """Registry of stored canonical URLs (global uniqueness across raw_articles partitions)."""
+
+    __tablename__ = TABLES["article_urls"]
+
+    canonical_url = Column(String, primary_key=True)
+
+    raw_article_id = Column(Integer, nullable=False)
+
+    createdAt = Column(DateTime, nullable=False, insert_default=func.now())
+
+
+class OutboxMessages(Base):
+    """Queue message written with the rows it announces, published by the outbox relay."""
+
+    __tablename__ = TABLES["outbox_messages"]
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # queue name (see config.config.queue_names)
+    queue = Column(String, nullable=False)
+
+    # JSON message body, published as is
+    payload = Column(Text, nullable=False)
+
+    createdAt = Column(DateTime, nullable=False, insert_default=func.now())
+
+
+class QueueJobs(Base):
+    """Message of the PostgreSQL queue backend (msg_queue.pg_queue_handler)."""
+
+    __tablename__ = TABLES["job_queue"]
+
+    __table_args__ = (
+        # claims scan a queue's oldest jobs
+        Index("ix_job_queue_queue_id", "queue", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # queue name (see config.config.queue_names)
+    queue = Column(String, nullable=False)
+
+    # JSON message body
+    payload = Column(Text, nullable=False)
+
+    # deliveries so far (a job is redelivered after a nack or an expired lease)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # lease of the consumer working on the job (NULL: available)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    createdAt = Column(DateTime, nullable=False, insert_default=func.now())
+
+
 class ArticlesCategory(Base):
 
     __tablename__ = TABLES["article_category"]
@@ -95,3 +272,33 @@ class ArticlesCategory(Base):
     )
 
     articles = relationship("SummarizedArticles", back_populates="category")
+
+
+class SummarizationUsage(Base):
+    """One LLM call made while summarizing an article (chunk, synthesis or summary)."""
+
+    __tablename__ = TABLES["summarization_usage"]
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+
+    article_id = Column(
+        Integer(), ForeignKey(f"{TABLES['summarized_articles']}.id"), index=True
+    )
+
+    model = Column(String, nullable=False, index=True)
+
+    kind = Column(String, nullable=False)
+
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+
+    completion_tokens = Column(Integer, nullable=False, default=0)
+
+    latency_ms = Column(Integer, nullable=False, default=0)
+
+    retries = Column(Integer, nullable=False, default=0)
+
+    cost = Column(Float, nullable=True)
+
+    succeeded = Column(Boolean, nullable=False, default=True)
+
+    createdAt = Column(DateTime, nullable=False, insert_default=func.now())
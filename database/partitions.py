@@ -0,0 +1,230 @@
+"""
+Monthly range partitions of raw_articles and summarized_articles.
+
+On PostgreSQL both tables are partitioned by "createdAt" (one partition per
+calendar month, named <table>_pYYYYMM; rows from before partitioning live in
+<table>_legacy). Queries that bound "createdAt" only touch the partitions
+they need, and old months can be detached as a whole instead of deleted row
+by row.
+
+Partitions must exist before rows for their month arrive, so the
+maintenance job is run daily (cron, `make partitions`):
+
+    python -m database.partitions [--dry-run]
+
+It creates partitions MONTHS_AHEAD months ahead and, when RETAIN_MONTHS is
+set, detaches partitions older than that and moves them to ARCHIVE_SCHEMA
+(or drops them when no archive schema is configured).
+"""
+
+import argparse
+import logging
+import re
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Connection, Engine, text
+
+from config.env import get_env
+
+
+PARTITIONED_TABLES = ("raw_articles", "summarized_articles")
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_p{month:%Y%m}"
+
+
+def create_partition_sql(table_name: str, month: date) -> str:
+    """CREATE TABLE statement of the partition holding one month."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, month)} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+class PartitionManager:
+    """Creates upcoming monthly partitions and retires old ones."""
+
+    # Months of partitions kept ready ahead of the current one
+    MONTHS_AHEAD = 3
+
+    # Months of history kept attached (0 keeps everything)
+    RETAIN_MONTHS = 0
+
+    # Schema detached partitions are moved to ("" drops them)
+    ARCHIVE_SCHEMA = "archive"
+
+    def __init__(
+        self,
+        engine: Engine,
+        months_ahead: Optional[int] = None,
+        retain_months: Optional[int] = None,
+        archive_schema: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            engine: SQLAlchemy database engine (PostgreSQL; others are skipped).
+            months_ahead: Override for MONTHS_AHEAD.
+            retain_months: Override for RETAIN_MONTHS.
+            archive_schema: Override for ARCHIVE_SCHEMA.
+            dry_run: Log the statements instead of running them.
+        """
+        self._logger = logging.getLogger("PartitionManager")
+        self.engine = engine
+        self.months_ahead = self.MONTHS_AHEAD if months_ahead is None else months_ahead
+        self.retain_months = self.RETAIN_MONTHS if retain_months is None else retain_months
+        self.archive_schema = self.ARCHIVE_SCHEMA if archive_schema is None else archive_schema
+        self.dry_run = dry_run
+
+    def partitions(self, connection: Connection, table_name: str) -> List[Tuple[str, Optional[date]]]:
+        """
+        Attached partitions of a table.
+
+        Returns:
+            (name, upper bound) pairs, ordered by upper bound; the bound is
+            None for a partition without one (MAXVALUE or DEFAULT).
+        """
+        rows = connection.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table_name AS regclass)"
+            ),
+            {"table_name": table_name},
+        )
+
+        partitions = []
+        for name, bound in rows:
+            match = _UPPER_BOUND.search(bound or "")
+            upper = datetime.fromisoformat(match.group(1)).date() if match else None
+            partitions.append((name, upper))
+
+        return sorted(partitions, key=lambda p: (p[1] is None, p[1] or date.min))
+
+    def _execute(self, connection: Connection, statement: str) -> None:
+        self._logger.info(statement)
+        if not self.dry_run:
+            connection.execute(text(statement))
+
+    def create_ahead(self, connection: Connection, table_name: str, today: date) -> int:
+        """
+        Create the partitions from the end of the covered range up to
+        MONTHS_AHEAD months after today's.
+
+        Returns:
+            Number of partitions created.
+        """
+        bounds = [upper for _, upper in self.partitions(connection, table_name) if upper]
+        month = max(bounds) if bounds else month_start(today)
+        last = add_months(month_start(today), self.months_ahead)
+
+        created = 0
+        while month <= last:
+            self._execute(connection, create_partition_sql(table_name, month))
+            month = add_months(month, 1)
+            created += 1
+
+        return created
+
+    def retire_old(self, connection: Connection, table_name: str, today: date) -> int:
+        """
+        Detach partitions that end before the retention window and archive
+        or drop them.
+
+        Returns:
+            Number of partitions retired.
+        """
+        if self.retain_months <= 0:
+            return 0
+
+        cutoff = add_months(month_start(today), -self.retain_months)
+
+        retired = 0
+        for name, upper in self.partitions(connection, table_name):
+            if upper is None or upper > cutoff:
+                continue
+
+            # CONCURRENTLY keeps reads and writes on the parent going
+            self._execute(connection, f"ALTER TABLE {table_name} DETACH PARTITION {name} CONCURRENTLY")
+            if self.archive_schema:
+                self._execute(connection, f"CREATE SCHEMA IF NOT EXISTS {self.archive_schema}")
+                self._execute(connection, f"ALTER TABLE {name} SET SCHEMA {self.archive_schema}")
+            else:
+                self._execute(connection, f"DROP TABLE {name}")
+            retired += 1
+
+        return retired
+
+    def run_once(self, today: Optional[date] = None) -> None:
+        if self.engine.dialect.name != "postgresql":
+            self._logger.info(f"Partitions are PostgreSQL only, skipping ({self.engine.dialect.name})")
+            return
+
+        today = today or date.today()
+
+        # DETACH ... CONCURRENTLY cannot run inside a transaction block
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for table_name in PARTITIONED_TABLES:
+                created = self.create_ahead(connection, table_name, today)
+                retired = self.retire_old(connection, table_name, today)
+                self._logger.info(
+                    f"{table_name}: {created} partitions created, {retired} retired"
+                )
+
+
+def create_partition_manager(engine: Engine, dry_run: bool = False) -> PartitionManager:
+    """
+    Create a manager configured from the environment.
+
+    Environment Variables:
+        PARTITION_MONTHS_AHEAD:    Months of partitions created ahead (default: 3).
+        PARTITION_RETAIN_MONTHS:   Months kept attached, 0 keeps all (default: 0).
+        PARTITION_ARCHIVE_SCHEMA:  Schema for detached partitions, "none" drops them (default: archive).
+    """
+    months_ahead = get_env("PARTITION_MONTHS_AHEAD")
+    retain_months = get_env("PARTITION_RETAIN_MONTHS")
+    archive_schema = get_env("PARTITION_ARCHIVE_SCHEMA", default=PartitionManager.ARCHIVE_SCHEMA)
+
+    return PartitionManager(
+        engine,
+        months_ahead=int(months_ahead) if months_ahead else None,
+        retain_months=int(retain_months) if retain_months else None,
+        archive_schema="" if archive_schema.lower() == "none" else archive_schema,
+        dry_run=dry_run,
+    )
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Create and retire monthly partitions")
+    parser.add_argument("--dry-run", action="store_true", help="only log the statements")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+
+    from database.connection import DBConnection
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    engine = DBConnection.init(get_env("DATABASE_URL", required=True))
+    create_partition_manager(engine, dry_run=args.dry_run).run_once()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Connection, Engine, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database.body_codec import body_hash, compress_body, decompress_body
+from database.models.models import ArticleBodies
+from database.repository.repository_base import RepositoryBase
+
+
+class ArticleBodyRepository(RepositoryBase):
+    """
+    Content-addressed store of compressed article bodies.
+
+    Writes go through the caller's session so a body and the row that points
+    at it commit together; reads are explicit, so list queries on
+    summarized_articles never load body text.
+    """
+
+    # dialects with INSERT ... ON CONFLICT DO NOTHING
+    _INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+    @classmethod
+    def _row(cls, body: str) -> Dict[str, object]:
+        codec, data = compress_body(body)
+        return {"hash": body_hash(body), "codec": codec, "size": len(body.encode()), "data": data}
+
+    @classmethod
+    def _insert_statement(cls, dialect_name: str, row: Dict[str, object]):
+        insert = cls._INSERTS.get(dialect_name)
+        if insert is None:
+            return None
+        return insert(ArticleBodies).values(**row).on_conflict_do_nothing(index_elements=["hash"])
+
+    @classmethod
+    def store(cls, session: Session, body: Optional[str]) -> Optional[str]:
+        """
+        Add a body inside the caller's transaction (no-op if already stored).
+
+        Args:
+            session: Open session of the write the body belongs to.
+            body: Article text.
+
+        Returns:
+            The body hash to reference, or None for an empty body.
+        """
+        if not body:
+            return None
+
+        row = cls._row(body)
+        statement = cls._insert_statement(session.bind.dialect.name, row)
+
+        if statement is not None:
+            session.execute(statement)
+        elif session.get(ArticleBodies, row["hash"]) is None:
+            session.add(ArticleBodies(**row))
+            session.flush()
+
+        return row["hash"]  # type: ignore
+
+    @classmethod
+    async def store_async(cls, session: AsyncSession, body: Optional[str]) -> Optional[str]:
+        """Async `store`."""
+        if not body:
+            return None
+
+        row = cls._row(body)
+        statement = cls._insert_statement(session.bind.dialect.name, row)
+
+        if statement is not None:
+            await session.execute(statement)
+        elif await session.get(ArticleBodies, row["hash"]) is None:
+            session.add(ArticleBodies(**row))
+            await session.flush()
+
+        return row["hash"]  # type: ignore
+
+    @classmethod
+    def store_all(cls, connection: Connection, bodies: Iterable[str]) -> Dict[str, str]:
+        """
+        Add many bodies with one multi-row insert (used by backfills).
+
+        Args:
+            connection: Connection of the caller's transaction.
+            bodies: Article texts (empty ones are skipped).
+
+        Returns:
+            Dict of body text to its hash.
+        """
+        rows = {}
+        hashes = {}
+        for body in bodies:
+            if body and body not in hashes:
+                row = cls._row(body)
+                hashes[body] = row["hash"]
+                rows[row["hash"]] = row
+        if not rows:
+            return {}
+
+        insert = cls._INSERTS.get(connection.dialect.name)
+        if insert is not None:
+            connection.execute(
+                insert(ArticleBodies).on_conflict_do_nothing(index_elements=["hash"]),
+                list(rows.values()),
+            )
+        else:
+            existing = set(
+                connection.execute(
+                    select(ArticleBodies.hash).where(ArticleBodies.hash.in_(rows))
+                ).scalars()
+            )
+            missing = [row for hash, row in rows.items() if hash not in existing]
+            if missing:
+                connection.execute(ArticleBodies.__table__.insert(), missing)
+
+        return hashes  # type: ignore
+
+    @classmethod
+    def get_bodies(cls, engine: Engine, hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+        """
+        Load and decompress bodies.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            hashes: Body hashes (None entries are ignored).
+
+        Returns:
+            Dict of hash to body text; empty on error.
+        """
+        hashes = {hash for hash in hashes if hash}
+        if not hashes:
+            return {}
+
+        query = select(ArticleBodies.hash, ArticleBodies.codec, ArticleBodies.data).where(
+            ArticleBodies.hash.in_(hashes)
+        )
+
+        try:
+            with engine.connect() as connection:
+                return {
+                    row.hash: decompress_body(row.codec, row.data)
+                    for row in connection.execute(query)
+                }
+
+        except Exception as e:
+            logging.error(f"Failed to read article bodies: {str(e)}")
+            return {}
+
+    @classmethod
+    def get_body(cls, engine: Engine, hash: Optional[str]) -> Optional[str]:
+        """Load one body by hash (None if missing)."""
+        return cls.get_bodies(engine, [hash]).get(hash) if hash else None
+
+    @classmethod
+    def stats(cls, engine: Engine) -> Tuple[int, int, int]:
+        """
+        Returns:
+            (bodies, uncompressed bytes, stored bytes); zeros on error.
+        """
+        query = select(
+            func.count(ArticleBodies.hash),
+            func.coalesce(func.sum(ArticleBodies.size), 0),
+            func.coalesce(func.sum(func.length(ArticleBodies.data)), 0),
+        )
+
+        try:
+            with engine.connect() as connection:
+                count, size, stored = connection.execute(query).one()
+                return int(count), int(size), int(stored)
+
+        except Exception as e:
+            logging.error(f"Failed to read article body stats: {str(e)}")
+            return 0, 0, 0
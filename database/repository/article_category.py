@@ -0,0 +1,100 @@
+import logging
+from typing import Dict, Iterable
+
+from sqlalchemy import Engine, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.async_connection import async_session_scope
+from database.connection import session_scope
+from database.models.models import ArticlesCategory
+from database.repository.repository_base import RepositoryBase
+
+
+class ArticleCategoryRepository(RepositoryBase):
+
+    @classmethod
+    def get_or_create_ids(cls, engine: Engine, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Map category names to ids, creating missing categories.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            names: Category names (e.g. the labels of the category model).
+
+        Returns:
+            Dict of name to id (empty if the lookup failed).
+        """
+        names = sorted(set(names))
+        if not names:
+            return {}
+
+        try:
+            with session_scope(engine) as session:
+                existing = {
+                    name: id
+                    for id, name in session.execute(
+                        select(ArticlesCategory.id, ArticlesCategory.name).where(
+                            ArticlesCategory.name.in_(names)
+                        )
+                    )
+                }
+
+                missing = [
+                    ArticlesCategory(name=name, logo_src="", description="")
+                    for name in names
+                    if name not in existing
+                ]
+
+                if missing:
+                    session.add_all(missing)
+                    session.flush()
+                    existing.update({category.name: category.id for category in missing})
+
+                    logging.info(f"{len(missing)} article categories created")
+
+                return existing
+
+        except Exception as e:
+            logging.error(f"Failed to load categories: {str(e)}")
+            return {}
+
+    @classmethod
+    async def get_or_create_ids_async(
+        cls, engine: AsyncEngine, names: Iterable[str]
+    ) -> Dict[str, int]:
+        """
+        Async `get_or_create_ids`.
+        """
+        names = sorted(set(names))
+        if not names:
+            return {}
+
+        try:
+            async with async_session_scope(engine) as session:
+                existing = {
+                    name: id
+                    for id, name in await session.execute(
+                        select(ArticlesCategory.id, ArticlesCategory.name).where(
+                            ArticlesCategory.name.in_(names)
+                        )
+                    )
+                }
+
+                missing = [
+                    ArticlesCategory(name=name, logo_src="", description="")
+                    for name in names
+                    if name not in existing
+                ]
+
+                if missing:
+                    session.add_all(missing)
+                    await session.flush()
+                    existing.update({category.name: category.id for category in missing})
+
+                    logging.info(f"{len(missing)} article categories created")
+
+                return existing
+
+        except Exception as e:
+            logging.error(f"Failed to load categories: {str(e)}")
+            return {}
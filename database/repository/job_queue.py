@@ -0,0 +1,229 @@
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Engine, delete, func, literal, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from database.connection import session_scope
+from database.models.models import QueueJobs
+from database.repository.repository_base import RepositoryBase
+
+
+def notify_channel(queue: str) -> str:
+    """LISTEN/NOTIFY channel announcing new jobs on a queue."""
+    return f"job_queue_{queue}"
+
+
+class JobQueueRepository(RepositoryBase):
+    """
+    Jobs of the PostgreSQL queue backend.
+
+    A job is claimed by setting a lease (locked_until) on it; claims select
+    with FOR UPDATE SKIP LOCKED, so concurrent consumers never take the same
+    job, and a job whose lease expired (its consumer died) is claimed again.
+    A failed job waits out a growing backoff before its next delivery; after
+    its last allowed attempt it is parked (locked_until = 'infinity') for
+    inspection, and setting locked_until back to NULL requeues it.
+    Lease times come from the database clock. PostgreSQL only.
+    """
+
+    @classmethod
+    def add(cls, session: Session, queue: str, message: Dict[str, Any]) -> None:
+        """
+        Add a job inside the caller's transaction; listeners are notified on commit.
+
+        Args:
+            session: Open session.
+            queue: Queue name.
+            message: JSON-serializable message.
+        """
+        session.add(QueueJobs(queue=queue, payload=json.dumps(message), attempts=0))
+        session.execute(select(func.pg_notify(notify_channel(queue), "")))
+
+    @classmethod
+    def publish(cls, engine: Engine, queue: str, message: Dict[str, Any]) -> bool:
+        """
+        Add a job in its own transaction.
+
+        Returns:
+            True when the job was stored.
+        """
+        try:
+            with session_scope(engine) as session:
+                cls.add(session, queue, message)
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to add job to {queue}: {str(e)}")
+            return False
+
+    @classmethod
+    def claim(
+        cls, engine: Engine, queue: str, limit: int, lease_seconds: float
+    ) -> List[Tuple[int, str, int]]:
+        """
+        Lease the oldest available jobs of a queue.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            queue: Queue name.
+            limit: Maximum number of jobs.
+            lease_seconds: Time the consumer has before the jobs are handed out again.
+
+        Returns:
+            (id, payload, attempts) in id order; empty on error.
+        """
+        available = (
+            select(QueueJobs.id)
+            .where(QueueJobs.queue == queue)
+            .where(or_(QueueJobs.locked_until.is_(None), QueueJobs.locked_until < func.now()))
+            .order_by(QueueJobs.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(QueueJobs)
+            .where(QueueJobs.id.in_(available.scalar_subquery()))
+            .values(
+                locked_until=func.now() + timedelta(seconds=lease_seconds),
+                attempts=QueueJobs.attempts + 1,
+            )
+            .returning(QueueJobs.id, QueueJobs.payload, QueueJobs.attempts)
+        )
+
+        try:
+            with session_scope(engine) as session:
+                return sorted(tuple(row) for row in session.execute(statement))  # type: ignore
+
+        except Exception as e:
+            logging.error(f"Failed to claim jobs from {queue}: {str(e)}")
+            return []
+
+    @classmethod
+    def complete(cls, engine: Engine, ids: List[int]) -> bool:
+        """Remove finished (or rejected) jobs."""
+        if not ids:
+            return True
+
+        try:
+            with session_scope(engine) as session:
+                session.execute(delete(QueueJobs).where(QueueJobs.id.in_(ids)))
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to complete jobs: {str(e)}")
+            return False
+
+    @classmethod
+    def extend(cls, engine: Engine, claims: List[Tuple[int, int]], lease_seconds: float) -> int:
+        """
+        Renew the leases of jobs a consumer still holds.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            claims: (id, attempts) as returned by `claim`; a job claimed again
+                    by someone else since (its attempts moved on) is left alone.
+            lease_seconds: New lease from now.
+
+        Returns:
+            Number of leases renewed (0 on error).
+        """
+        if not claims:
+            return 0
+
+        try:
+            with session_scope(engine) as session:
+                return session.execute(
+                    update(QueueJobs)
+                    .where(tuple_(QueueJobs.id, QueueJobs.attempts).in_(claims))
+                    .values(locked_until=func.now() + timedelta(seconds=lease_seconds))
+                ).rowcount
+
+        except Exception as e:
+            logging.error(f"Failed to extend job leases: {str(e)}")
+            return 0
+
+    @classmethod
+    def release(cls, engine: Engine, ids: List[int]) -> bool:
+        """
+        Give back jobs that were claimed but never delivered (they are
+        claimed again right away and the claim does not count as an attempt).
+        """
+        if not ids:
+            return True
+
+        try:
+            with session_scope(engine) as session:
+                session.execute(
+                    update(QueueJobs)
+                    .where(QueueJobs.id.in_(ids))
+                    .values(locked_until=None, attempts=func.greatest(QueueJobs.attempts - 1, 0))
+                )
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to release jobs: {str(e)}")
+            return False
+
+    @classmethod
+    def retry(
+        cls,
+        engine: Engine,
+        ids: List[int],
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+    ) -> bool:
+        """
+        Schedule failed jobs for another attempt after a backoff, or park them.
+
+        The delay doubles with every attempt (base_delay, 2 * base_delay, ...
+        up to max_delay). A job that has used max_attempts deliveries is parked.
+
+        Returns:
+            True when the jobs were updated.
+        """
+        if not ids:
+            return True
+
+        # base_delay * 2^(attempts - 1), capped at max_delay
+        backoff = func.make_interval(
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            func.least(
+                literal(float(base_delay)) * func.power(2, func.greatest(QueueJobs.attempts - 1, 0)),
+                literal(float(max_delay)),
+            ),
+        )
+
+        try:
+            with session_scope(engine) as session:
+                parked = list(
+                    session.scalars(
+                        update(QueueJobs)
+                        .where(QueueJobs.id.in_(ids))
+                        .where(QueueJobs.attempts >= max_attempts)
+                        .values(locked_until=literal("infinity").cast(QueueJobs.locked_until.type))
+                        .returning(QueueJobs.id)
+                    )
+                )
+                session.execute(
+                    update(QueueJobs)
+                    .where(QueueJobs.id.in_(ids))
+                    .where(QueueJobs.attempts < max_attempts)
+                    .values(locked_until=func.now() + backoff)
+                )
+
+            if parked:
+                logging.error(f"Jobs {parked} failed {max_attempts} times, parked")
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to reschedule jobs: {str(e)}")
+            return False
@@ -0,0 +1,89 @@
+import json
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import Engine, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config.env import get_env
+from database.models.models import OutboxMessages
+from database.repository.job_queue import JobQueueRepository
+from database.repository.repository_base import RepositoryBase
+
+
+def outbox_enabled() -> bool:
+    """
+    Environment Variables:
+        OUTBOX_ENABLED: "true" hands messages to the outbox relay instead of
+                        publishing them directly (default: false).
+    """
+    return get_env("OUTBOX_ENABLED", default="false").lower() == "true"
+
+
+class OutboxRepository(RepositoryBase):
+    """
+    Transactional outbox of queue messages.
+
+    A message is added in the session that writes the rows it announces, so
+    both commit or neither does. The relay (msg_queue.outbox_relay) claims
+    the oldest messages with FOR UPDATE SKIP LOCKED, publishes them and
+    deletes them in the same transaction. With QUEUE_BACKEND=postgres the
+    message goes straight to job_queue instead (no relay needed).
+    """
+
+    @classmethod
+    def add(cls, session: Session, queue: str, message: Dict[str, Any]) -> None:
+        """
+        Add a message inside the caller's transaction.
+
+        Args:
+            session: Open session of the write the message belongs to.
+            queue: Queue name.
+            message: JSON-serializable message.
+        """
+        from msg_queue.queue_handler import queue_backend
+
+        if queue_backend() == "postgres":
+            JobQueueRepository.add(session, queue, message)
+            return
+
+        session.add(OutboxMessages(queue=queue, payload=json.dumps(message)))
+
+    @classmethod
+    async def claim_async(cls, session: AsyncSession, limit: int) -> List[OutboxMessages]:
+        """
+        Lock the oldest unpublished messages (rows locked by another relay
+        are skipped). The locks are held until the session's transaction ends.
+
+        Args:
+            session: Open session of the relay's transaction.
+            limit: Maximum number of messages.
+
+        Returns:
+            Messages in id (write) order.
+        """
+        query = (
+            select(OutboxMessages)
+            .order_by(OutboxMessages.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list((await session.scalars(query)).all())
+
+    @classmethod
+    async def delete_async(cls, session: AsyncSession, ids: List[int]) -> None:
+        """Remove published messages inside the relay's transaction."""
+        if ids:
+            await session.execute(delete(OutboxMessages).where(OutboxMessages.id.in_(ids)))
+
+    @classmethod
+    def pending_count(cls, engine: Engine) -> int:
+        """Messages waiting for the relay (0 on error)."""
+        try:
+            with engine.connect() as connection:
+                return int(connection.execute(select(func.count(OutboxMessages.id))).scalar() or 0)
+
+        except Exception as e:
+            logging.error(f"Failed to count outbox messages: {str(e)}")
+            return 0
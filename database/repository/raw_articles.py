@@ -1,31 +1,38 @@
 from abc import abstractmethod
 import logging
 
-from sqlalchemy import Engine
-from typing import List
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from sqlalchemy import Engine, select
+from typing import Any, Dict, Iterable, List, Optional, Set
 
-from database.models.models import RawArticles
+from database.connection import session_scope
+from database.models.models import ArticleUrls, RawArticles, SummarizedArticles
+from database.repository.outbox import OutboxRepository
 from database.repository.repository_base import RepositoryBase
 
 
 class RawArticleRepository(RepositoryBase):
 
+    @classmethod
+    def _register_urls(cls, session, data: List[RawArticles]) -> None:
+        # a canonical URL that is already registered fails the whole insert,
+        # as the unique index on raw_articles did before partitioning
+        session.flush()
+        session.add_all(
+            ArticleUrls(canonical_url=article.canonical_url, raw_article_id=article.id)
+            for article in data
+            if article.canonical_url
+        )
+
     @classmethod
     def insert_all(cls, engine: Engine, data: List[RawArticles]):
         """
         to insert data into database
         """
         try:
-            Session = sessionmaker(engine)
-
-            session = Session()
-
-            session.add_all(data)
-
-            session.commit()
-
-            session.close()
+            with session_scope(engine) as session:
+                session.add_all(data)
+                cls._register_urls(session, data)
 
             logging.info(f"Data sucessfully inserted into database")
 
@@ -34,20 +41,35 @@ class RawArticleRepository(RepositoryBase):
             # return None
 
     @classmethod
-    def insert(cls, engine: Engine, data: RawArticles):
+    def insert(
+        cls,
+        engine: Engine,
+        data: RawArticles,
+        summary: Optional[SummarizedArticles] = None,
+        outbox_queue: Optional[str] = None,
+        message: Optional[Dict[str, Any]] = None,
+    ):
         """
         to insert data into database and return id
+
+        In the same transaction, optionally stores a summarized row for the
+        article (a provisional summary; its raw_article_id is set here) and
+        adds message (plus "raw_article_id") to the outbox for outbox_queue,
+        so the message is only published once both rows exist.
         """
         try:
-            Session = sessionmaker(engine)
-
-            session = Session()
+            with session_scope(engine) as session:
+                session.add(data)
+                cls._register_urls(session, [data])
 
-            session.add(data)
+                if summary is not None:
+                    summary.raw_article_id = data.id
+                    session.add(summary)
 
-            session.commit()
-
-            # session.close()
+                if outbox_queue:
+                    OutboxRepository.add(
+                        session, outbox_queue, {**(message or {}), "raw_article_id": data.id}
+                    )
 
             logging.info(f"Data sucessfully inserted into database")
 
@@ -56,3 +78,66 @@ class RawArticleRepository(RepositoryBase):
         except Exception as e:
             logging.error(f"Failed to insert data into database: {str(e)}")
             return None
+
+    @classmethod
+    def get_story_representatives(
+        cls, engine: Engine, since: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Raw articles published since a point in time that are not duplicates
+        of another article (used to seed story clustering).
+
+        Articles are stored after they are published, so the same bound on
+        createdAt limits the scan to the recent partitions.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            since: Lower bound on published_at (timezone-aware).
+
+        Returns:
+            Dicts with "id", "title" and "published_at"; empty on error.
+        """
+        query = (
+            select(RawArticles.id, RawArticles.title, RawArticles.published_at)
+            .where(RawArticles.createdAt >= since)
+            .where(RawArticles.published_at >= since)
+            .where(RawArticles.duplicate_of_id.is_(None))
+            .order_by(RawArticles.id)
+        )
+
+        try:
+            with engine.connect() as connection:
+                return [
+                    {"id": row.id, "title": row.title, "published_at": row.published_at}
+                    for row in connection.execute(query)
+                ]
+
+        except Exception as e:
+            logging.error(f"Failed to read recent raw articles: {str(e)}")
+            return []
+
+    @classmethod
+    def get_known_canonical_urls(cls, engine: Engine, urls: Iterable[str]) -> Set[str]:
+        """
+        Canonical URLs that are already stored (primary key lookup in article_urls).
+
+        Args:
+            engine: SQLAlchemy database engine.
+            urls: Canonical URLs to check.
+
+        Returns:
+            The subset of urls already in raw_articles; empty on error.
+        """
+        urls = list(set(urls))
+        if not urls:
+            return set()
+
+        query = select(ArticleUrls.canonical_url).where(ArticleUrls.canonical_url.in_(urls))
+
+        try:
+            with engine.connect() as connection:
+                return set(connection.execute(query).scalars())
+
+        except Exception as e:
+            logging.error(f"Failed to look up article urls: {str(e)}")
+            return set()
@@ -0,0 +1,86 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Engine, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.async_connection import async_session_scope
+from database.connection import session_scope
+from database.models.models import SummarizationUsage
+from database.repository.repository_base import RepositoryBase
+
+
+class SummarizationUsageRepository(RepositoryBase):
+
+    @classmethod
+    def insert_all(cls, engine: Engine, data: List[SummarizationUsage]):
+        """
+        to insert usage rows of one article in a single transaction
+        """
+        if not data:
+            return
+
+        try:
+            with session_scope(engine) as session:
+                session.add_all(data)
+
+            logging.debug(f"{len(data)} usage rows inserted into database")
+
+        except Exception as e:
+            logging.error(f"Failed to insert usage: {str(e)}")
+
+    @classmethod
+    async def insert_all_async(cls, engine: AsyncEngine, data: List[SummarizationUsage]):
+        """
+        Async `insert_all`.
+        """
+        if not data:
+            return
+
+        try:
+            async with async_session_scope(engine) as session:
+                session.add_all(data)
+
+            logging.debug(f"{len(data)} usage rows inserted into database")
+
+        except Exception as e:
+            logging.error(f"Failed to insert usage: {str(e)}")
+
+    @classmethod
+    def model_stats(
+        cls, engine: Engine, since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate usage per model.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            since: Only include calls made after this time (all calls if None).
+
+        Returns:
+            One dict per model with call count, token totals, average latency,
+            retries and cost.
+        """
+        query = select(
+            SummarizationUsage.model,
+            func.count().label("calls"),
+            func.count().filter(SummarizationUsage.succeeded.is_(False)).label("failures"),
+            func.sum(SummarizationUsage.prompt_tokens).label("prompt_tokens"),
+            func.sum(SummarizationUsage.completion_tokens).label("completion_tokens"),
+            func.avg(SummarizationUsage.latency_ms).label("latency_ms_avg"),
+            func.sum(SummarizationUsage.retries).label("retries"),
+            func.sum(SummarizationUsage.cost).label("cost"),
+            func.count(func.distinct(SummarizationUsage.article_id)).label("articles"),
+        ).group_by(SummarizationUsage.model)
+
+        if since is not None:
+            query = query.where(SummarizationUsage.createdAt >= since)
+
+        try:
+            with engine.connect() as connection:
+                return [dict(row._mapping) for row in connection.execute(query)]
+
+        except Exception as e:
+            logging.error(f"Failed to read usage stats: {str(e)}")
+            return []
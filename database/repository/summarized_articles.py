@@ -1,31 +1,58 @@
 from abc import abstractmethod
+import asyncio
 import logging
 
-from sqlalchemy import Engine, update
-from typing import List
-from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from sqlalchemy import Engine, Integer, String, cast, column, or_, select, update, values
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
-from database.models.models import SummarizedArticles
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.async_connection import async_session_scope
+from database.connection import session_scope
+from database.models.models import (
+    SUMMARY_STATUS_FINAL,
+    RawArticles,
+    SummarizedArticles,
+    SummarizedArticleVersions,
+)
+from database.repository.article_bodies import ArticleBodyRepository
+from database.repository.outbox import OutboxRepository
 from database.repository.repository_base import RepositoryBase
 
 
 class PresummarizedArticleRepository(RepositoryBase):
 
+    # columns the scraper never overwrites on an existing row (version only
+    # moves forward through record_revision)
+    _KEEP_ON_UPSERT = ("id", "summary", "summary_status", "version", "createdAt", "updatedAt")
+
+    @classmethod
+    def _fill_in(cls, existing: SummarizedArticles, data: SummarizedArticles) -> None:
+        for column in SummarizedArticles.__table__.columns.keys():
+            if column in cls._KEEP_ON_UPSERT:
+                continue
+            value = getattr(data, column)
+            if value is not None:
+                setattr(existing, column, value)
+
+    @classmethod
+    def _mark_processed_statement(cls, raw_article_id):
+        # the raw article has been scraped and handed on; the UPDATE also
+        # locks its row (summarized_articles.raw_article_id is not unique on
+        # the partitioned table)
+        return (
+            update(RawArticles).where(RawArticles.id == raw_article_id).values(processed=True)
+        )
+
     @classmethod
     def insert_all(cls, engine: Engine, data: List[SummarizedArticles]):
         """
         to insert data in batches into database
         """
         try:
-            Session = sessionmaker(engine)
-
-            session = Session()
-
-            session.add_all(data)
-
-            session.commit()
-
-            session.close()
+            with session_scope(engine) as session:
+                session.add_all(data)
 
             logging.info(f"Data sucessfully inserted into database")
 
@@ -34,20 +61,49 @@ class PresummarizedArticleRepository(RepositoryBase):
             # return None
 
     @classmethod
-    def insert(cls, engine: Engine, data: SummarizedArticles):
+    def insert(
+        cls,
+        engine: Engine,
+        data: SummarizedArticles,
+        body: Optional[str] = None,
+        outbox_queue: Optional[str] = None,
+        message: Optional[Dict[str, Any]] = None,
+    ):
         """
         to insert one record at a time and return back the id
+        (body goes to article_bodies in the same transaction; with
+        outbox_queue, so does message plus "id" in the outbox)
         """
         try:
-            Session = sessionmaker(engine)
+            with session_scope(engine) as session:
+                if body:
+                    data.body_hash = ArticleBodyRepository.store(session, body)  # type: ignore
+                session.add(data)
 
-            session = Session()
+                if outbox_queue:
+                    session.flush()
+                    OutboxRepository.add(session, outbox_queue, {**(message or {}), "id": data.id})
 
-            session.add(data)
+            logging.info(f"Data sucessfully inserted into database")
 
-            session.commit()
+            return data.id
 
-            # session.close()
+        except Exception as e:
+            logging.error(f"Failed to insert: {str(e)}")
+            return None
+
+    @classmethod
+    async def insert_async(
+        cls, engine: AsyncEngine, data: SummarizedArticles, body: Optional[str] = None
+    ):
+        """
+        Async `insert`: insert one record and return its id (None on failure).
+        """
+        try:
+            async with async_session_scope(engine) as session:
+                if body:
+                    data.body_hash = await ArticleBodyRepository.store_async(session, body)  # type: ignore
+                session.add(data)
 
             logging.info(f"Data sucessfully inserted into database")
 
@@ -57,10 +113,119 @@ class PresummarizedArticleRepository(RepositoryBase):
             logging.error(f"Failed to insert: {str(e)}")
             return None
 
+    @classmethod
+    def upsert_by_raw_article_id(
+        cls,
+        engine: Engine,
+        data: SummarizedArticles,
+        body: Optional[str] = None,
+        outbox_queue: Optional[str] = None,
+        message: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Insert a scraped article, or fill in the row the RSS service already
+        created for the same raw article (with a provisional summary).
+
+        The existing summary and summary_status are kept; everything the
+        scraper knows (body, fingerprints, metadata) is written.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            data: The scraped article.
+            body: Article text, stored in article_bodies.
+            outbox_queue: Queue to hand message to through the outbox, in
+                          the same transaction.
+            message: Message for outbox_queue ("id" is set to the article id).
+
+        Returns:
+            The article id, or None on failure.
+        """
+        if data.raw_article_id is None:
+            return cls.insert(
+                engine=engine, data=data, body=body, outbox_queue=outbox_queue, message=message
+            )
+
+        try:
+            with session_scope(engine) as session:
+                if body:
+                    data.body_hash = ArticleBodyRepository.store(session, body)  # type: ignore
+
+                # the raw article's row lock serializes upserts for it, so a
+                # concurrent or redelivered scrape sees the row inserted here
+                session.execute(cls._mark_processed_statement(data.raw_article_id))
+
+                existing = session.scalars(
+                    select(SummarizedArticles)
+                    .where(SummarizedArticles.raw_article_id == data.raw_article_id)
+                    .with_for_update()
+                ).first()
+
+                if existing is None:
+                    session.add(data)
+                    session.flush()
+                    article_id = data.id
+                else:
+                    cls._fill_in(existing, data)
+                    article_id = existing.id
+                    logging.info(f"Article {existing.id} filled in for raw article {data.raw_article_id}")
+
+                if outbox_queue:
+                    OutboxRepository.add(session, outbox_queue, {**(message or {}), "id": article_id})
+
+                return article_id
+
+        except Exception as e:
+            logging.error(f"Failed to upsert: {str(e)}")
+            return None
+
+    @classmethod
+    async def upsert_by_raw_article_id_async(
+        cls, engine: AsyncEngine, data: SummarizedArticles, body: Optional[str] = None
+    ):
+        """
+        Async `upsert_by_raw_article_id`.
+
+        Returns:
+            The article id, or None on failure.
+        """
+        if data.raw_article_id is None:
+            return await cls.insert_async(engine=engine, data=data, body=body)
+
+        try:
+            async with async_session_scope(engine) as session:
+                if body:
+                    data.body_hash = await ArticleBodyRepository.store_async(session, body)  # type: ignore
+
+                # the raw article's row lock serializes upserts for it (see
+                # upsert_by_raw_article_id)
+                await session.execute(cls._mark_processed_statement(data.raw_article_id))
+
+                existing = (
+                    await session.scalars(
+                        select(SummarizedArticles)
+                        .where(SummarizedArticles.raw_article_id == data.raw_article_id)
+                        .with_for_update()
+                    )
+                ).first()
+
+                if existing is None:
+                    session.add(data)
+                    await session.flush()
+                    return data.id
+
+                cls._fill_in(existing, data)
+
+                logging.info(f"Article {existing.id} filled in for raw article {data.raw_article_id}")
+                return existing.id
+
+        except Exception as e:
+            logging.error(f"Failed to upsert: {str(e)}")
+            return None
+
     @classmethod
     def update_summary(cls, id, engine: Engine, summary: str):
         """
-        Update the summary column for an article.
+        Update the summary column for an article and mark it final.
 
         Args:
             id: The article ID to update.
@@ -68,22 +233,657 @@ class PresummarizedArticleRepository(RepositoryBase):
             summary: The summarized article text.
         """
         try:
-            Session = sessionmaker(engine)
+            with session_scope(engine) as session:
+                updated = session.execute(
+                    update(SummarizedArticles)
+                    .where(SummarizedArticles.id == id)
+                    .values(summary=summary, summary_status=SUMMARY_STATUS_FINAL)
+                ).rowcount
 
-            session = Session()
-
-            article_to_update = (
-                session.query(SummarizedArticles).filter_by(id=id).first()
-            )
-
-            if article_to_update is None:
+            if not updated:
                 logging.warning(f"Article with {id} not found")
                 return
 
-            article_to_update.summary = summary  # type: ignore
-            session.commit()
+            logging.info(f"Article {id} summary is updated.")
+
+        except Exception as e:
+            logging.error(f"Failed to update: {str(e)}")
+
+    @classmethod
+    async def update_summary_async(cls, id, engine: AsyncEngine, summary: str) -> bool:
+        """
+        Async `update_summary`.
+
+        Returns:
+            True if the article was updated.
+        """
+        try:
+            async with async_session_scope(engine) as session:
+                result = await session.execute(
+                    update(SummarizedArticles)
+                    .where(SummarizedArticles.id == id)
+                    .values(summary=summary, summary_status=SUMMARY_STATUS_FINAL)
+                )
+
+            if not result.rowcount:
+                logging.warning(f"Article with {id} not found")
+                return False
 
             logging.info(f"Article {id} summary is updated.")
+            return True
 
         except Exception as e:
             logging.error(f"Failed to update: {str(e)}")
+            return False
+
+    @classmethod
+    def _update_summaries_statement(
+        cls, summaries: Dict[int, str], versions: Optional[Dict[int, int]] = None
+    ):
+        """
+        One UPDATE ... FROM (VALUES ...) RETURNING id for a batch of summaries.
+
+        A row with a version only matches the article at that version; a
+        summary without one (message from before versions were sent) always
+        matches.
+        """
+        versions = versions or {}
+        rows = values(
+            column("id", Integer), column("summary", String), column("version", Integer), name="v"
+        ).data([(id, summary, versions.get(id)) for id, summary in summaries.items()])
+
+        return (
+            update(SummarizedArticles)
+            .where(SummarizedArticles.id == rows.c.id)
+            # a VALUES column of NULLs only is typed text by PostgreSQL
+            .where(
+                or_(
+                    rows.c.version.is_(None),
+                    SummarizedArticles.version == cast(rows.c.version, Integer),
+                )
+            )
+            .values(summary=rows.c.summary, summary_status=SUMMARY_STATUS_FINAL)
+            .returning(SummarizedArticles.id)
+        )
+
+    @classmethod
+    def _update_summary_statement(cls, id: int, summary: str, version: Optional[int]):
+        """Single-row form of `_update_summaries_statement` (non-PostgreSQL fallback)."""
+        statement = update(SummarizedArticles).where(SummarizedArticles.id == id)
+        if version is not None:
+            statement = statement.where(SummarizedArticles.version == version)
+        return statement.values(summary=summary, summary_status=SUMMARY_STATUS_FINAL)
+
+    @classmethod
+    def _existing_ids_statement(cls, ids: Set[int]):
+        return select(SummarizedArticles.id).where(SummarizedArticles.id.in_(ids))
+
+    @classmethod
+    def update_summaries(
+        cls,
+        engine: Engine,
+        summaries: Dict[int, str],
+        versions: Optional[Dict[int, int]] = None,
+    ) -> Tuple[Set[int], Set[int]]:
+        """
+        Set many summaries (and mark them final) in one statement.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            summaries: Article id to summary.
+            versions: Article id to the version the summary was made from.
+                      The summary is only stored while the article is still
+                      at that version, so a summary of an older body never
+                      overwrites the summary of a revision.
+
+        Returns:
+            (ids updated, ids superseded: the article exists at another version).
+            Missing ids are in neither.
+
+        Raises:
+            Exception: Database errors are raised so the caller can retry the batch.
+        """
+        if not summaries:
+            return set(), set()
+
+        versions = versions or {}
+
+        with session_scope(engine) as session:
+            if engine.dialect.name != "postgresql":
+                # VALUES lists in FROM are PostgreSQL syntax; update row by row
+                updated = {
+                    id
+                    for id, summary in summaries.items()
+                    if session.execute(
+                        cls._update_summary_statement(id, summary, versions.get(id))
+                    ).rowcount
+                }
+            else:
+                updated = set(
+                    session.scalars(cls._update_summaries_statement(summaries, versions))
+                )
+
+            # a versioned summary that matched nothing may have been superseded
+            unmatched = {id for id in summaries if id not in updated and id in versions}
+            superseded = (
+                set(session.scalars(cls._existing_ids_statement(unmatched))) if unmatched else set()
+            )
+
+        return updated, superseded
+
+    @classmethod
+    async def update_summaries_async(
+        cls,
+        engine: AsyncEngine,
+        summaries: Dict[int, str],
+        versions: Optional[Dict[int, int]] = None,
+    ) -> Tuple[Set[int], Set[int]]:
+        """
+        Async `update_summaries`.
+        """
+        if not summaries:
+            return set(), set()
+
+        versions = versions or {}
+
+        async with async_session_scope(engine) as session:
+            if engine.dialect.name != "postgresql":
+                updated = set()
+                for id, summary in summaries.items():
+                    result = await session.execute(
+                        cls._update_summary_statement(id, summary, versions.get(id))
+                    )
+                    if result.rowcount:
+                        updated.add(id)
+            else:
+                updated = set(
+                    await session.scalars(cls._update_summaries_statement(summaries, versions))
+                )
+
+            unmatched = {id for id in summaries if id not in updated and id in versions}
+            superseded = (
+                set(await session.scalars(cls._existing_ids_statement(unmatched)))
+                if unmatched
+                else set()
+            )
+
+        return updated, superseded
+
+    @classmethod
+    def update_categories(cls, engine: Engine, categories: Dict[int, int]):
+        """
+        Set category_id for many articles in one executemany UPDATE.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            categories: Article id to category id.
+        """
+        if not categories:
+            return
+
+        try:
+            with session_scope(engine) as session:
+                session.execute(
+                    update(SummarizedArticles),
+                    [
+                        {"id": article_id, "category_id": category_id}
+                        for article_id, category_id in categories.items()
+                    ],
+                )
+
+            logging.info(f"Categories updated for {len(categories)} articles")
+
+        except Exception as e:
+            logging.error(f"Failed to update categories: {str(e)}")
+
+    @classmethod
+    async def update_categories_async(cls, engine: AsyncEngine, categories: Dict[int, int]):
+        """
+        Async `update_categories`.
+        """
+        if not categories:
+            return
+
+        try:
+            async with async_session_scope(engine) as session:
+                await session.execute(
+                    update(SummarizedArticles),
+                    [
+                        {"id": article_id, "category_id": category_id}
+                        for article_id, category_id in categories.items()
+                    ],
+                )
+
+            logging.info(f"Categories updated for {len(categories)} articles")
+
+        except Exception as e:
+            logging.error(f"Failed to update categories: {str(e)}")
+
+    @classmethod
+    def get_summaries_after(
+        cls, engine: Engine, after_id: int, limit: int, body_chars: int = 1000
+    ) -> List[Tuple[int, str, str]]:
+        """
+        Keyset page of summarized articles, ordered by id.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            after_id: Return articles with an id greater than this.
+            limit: Page size.
+            body_chars: Characters of the body returned (the lead only).
+
+        Returns:
+            (id, summary, body lead) tuples; empty when done or on error.
+        """
+        query = (
+            select(SummarizedArticles.id, SummarizedArticles.summary, SummarizedArticles.body_hash)
+            .where(SummarizedArticles.id > after_id)
+            .where(SummarizedArticles.summary.is_not(None))
+            .order_by(SummarizedArticles.id)
+            .limit(limit)
+        )
+
+        try:
+            with engine.connect() as connection:
+                rows = list(connection.execute(query))
+
+        except Exception as e:
+            logging.error(f"Failed to read summaries: {str(e)}")
+            return []
+
+        bodies = ArticleBodyRepository.get_bodies(engine, (row.body_hash for row in rows))
+        return [
+            (row.id, row.summary, (bodies.get(row.body_hash) or "")[:body_chars])
+            for row in rows
+        ]
+
+    @classmethod
+    def get_body(cls, engine: Engine, id: int) -> Optional[str]:
+        """
+        Load the body of an article (list queries leave it out).
+
+        Args:
+            engine: SQLAlchemy database engine.
+            id: The article ID.
+
+        Returns:
+            The article text, or None if the article or its body is missing.
+        """
+        try:
+            with engine.connect() as connection:
+                body_hash = connection.execute(
+                    select(SummarizedArticles.body_hash).where(SummarizedArticles.id == id)
+                ).scalar()
+
+        except Exception as e:
+            logging.error(f"Failed to read body of article {id}: {str(e)}")
+            return None
+
+        return ArticleBodyRepository.get_body(engine, body_hash)
+
+    @classmethod
+    def get_recent_by_source(
+        cls, engine: Engine, source: str, since: datetime, limit: int = 100
+    ) -> List[SummarizedArticles]:
+        """
+        Articles of one source published since a point in time, newest first
+        (index range scan on (source, published_at); the same bound on
+        createdAt prunes older partitions).
+
+        Args:
+            engine: SQLAlchemy database engine.
+            source: Feed source, e.g. "BBC".
+            since: Lower bound on published_at (timezone-aware).
+            limit: Maximum number of rows.
+
+        Returns:
+            Summarized articles; empty on error.
+        """
+        query = (
+            select(SummarizedArticles)
+            .where(SummarizedArticles.source == source)
+            .where(SummarizedArticles.createdAt >= since)
+            .where(SummarizedArticles.published_at >= since)
+            .order_by(SummarizedArticles.published_at.desc())
+            .limit(limit)
+        )
+
+        try:
+            with session_scope(engine) as session:
+                return list(session.scalars(query))
+
+        except Exception as e:
+            logging.error(f"Failed to read recent articles of {source}: {str(e)}")
+            return []
+
+    @classmethod
+    def get_due_for_revisit(
+        cls, engine: Engine, now: datetime, limit: int, created_after: Optional[datetime] = None
+    ) -> List[Any]:
+        """
+        Articles whose next revisit is due, oldest schedule first.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            now: Current time.
+            limit: Maximum number of rows.
+            created_after: Skip articles created earlier (no longer revisited;
+                           limits the scan to recent partitions).
+
+        Returns:
+            Rows with id, article_url, source, published_date, raw_article_id,
+            content_hash, simhash and createdAt; empty on error.
+        """
+        query = (
+            select(
+                SummarizedArticles.id,
+                SummarizedArticles.article_url,
+                SummarizedArticles.source,
+                SummarizedArticles.published_date,
+                SummarizedArticles.raw_article_id,
+                SummarizedArticles.content_hash,
+                SummarizedArticles.simhash,
+                SummarizedArticles.createdAt,
+            )
+            .where(SummarizedArticles.next_check_at <= now)
+            .order_by(SummarizedArticles.next_check_at)
+            .limit(limit)
+        )
+        if created_after is not None:
+            query = query.where(SummarizedArticles.createdAt >= created_after)
+
+        try:
+            with engine.connect() as connection:
+                return list(connection.execute(query))
+
+        except Exception as e:
+            logging.error(f"Failed to read articles due for revisit: {str(e)}")
+            return []
+
+    @classmethod
+    def schedule_revisit(
+        cls,
+        engine: Engine,
+        id: int,
+        checked_at: datetime,
+        next_check_at: Optional[datetime],
+        body: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        simhash: Optional[int] = None,
+    ):
+        """
+        Record a revisit that did not need a new summary.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            id: The article ID.
+            checked_at: When the article was fetched.
+            next_check_at: Next revisit (None stops revisiting).
+            body: New body after a minor edit (the summary is kept).
+            content_hash: Content hash of the new body.
+            simhash: SimHash of the new body.
+        """
+        values: Dict[str, Any] = {"last_checked_at": checked_at, "next_check_at": next_check_at}
+
+        try:
+            with session_scope(engine) as session:
+                if body is not None:
+                    values.update(
+                        body_hash=ArticleBodyRepository.store(session, body),
+                        content_hash=content_hash,
+                        simhash=simhash,
+                    )
+
+                session.execute(
+                    update(SummarizedArticles)
+                    .where(SummarizedArticles.id == id)
+                    .values(**values)
+                )
+
+        except Exception as e:
+            logging.error(f"Failed to schedule revisit of article {id}: {str(e)}")
+
+    @classmethod
+    def record_revision(
+        cls,
+        engine: Engine,
+        id: int,
+        body: str,
+        content_hash: str,
+        simhash: int,
+        checked_at: datetime,
+        next_check_at: Optional[datetime],
+        outbox_queue: Optional[str] = None,
+        message: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """
+        Keep the current body and summary as a version and store the new body.
+
+        The summary is left in place until the summarization service
+        replaces it, so readers never see an article without one.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            id: The article ID.
+            body: The changed body.
+            content_hash: Content hash of the changed body.
+            simhash: SimHash of the changed body.
+            checked_at: When the article was fetched.
+            next_check_at: Next revisit (None stops revisiting).
+            outbox_queue: Queue to hand message to through the outbox, in
+                          the same transaction (so a stored revision is
+                          always re-summarized).
+            message: Message for outbox_queue ("id" and "version" are set).
+
+        Returns:
+            The new version number, or None on failure.
+        """
+        try:
+            with session_scope(engine) as session:
+                article = session.get(SummarizedArticles, id, with_for_update=True)
+
+                if article is None:
+                    logging.warning(f"Article with {id} not found")
+                    return None
+
+                version = article.version or 1
+                session.add(
+                    SummarizedArticleVersions(
+                        article_id=id,
+                        version=version,
+                        body_hash=article.body_hash,
+                        summary=article.summary,
+                        content_hash=article.content_hash,
+                        simhash=article.simhash,
+                    )
+                )
+
+                article.body_hash = ArticleBodyRepository.store(session, body)  # type: ignore
+                article.content_hash = content_hash  # type: ignore
+                article.simhash = simhash  # type: ignore
+                article.version = version + 1  # type: ignore
+                article.last_checked_at = checked_at  # type: ignore
+                article.next_check_at = next_check_at  # type: ignore
+
+                if outbox_queue:
+                    OutboxRepository.add(
+                        session,
+                        outbox_queue,
+                        {**(message or {}), "id": id, "version": version + 1},
+                    )
+
+            logging.info(f"Article {id} revised to version {version + 1}")
+            return version + 1
+
+        except Exception as e:
+            logging.error(f"Failed to record revision of article {id}: {str(e)}")
+            return None
+
+
+class SummaryWriteBuffer:
+    """
+    Write-behind buffer for summary updates.
+
+    `write` queues an update and returns once it is stored. Updates are
+    flushed together as one `update_summaries` statement when MAX_BATCH
+    are waiting or MAX_DELAY seconds after the first one arrived, whichever
+    comes first. Each caller gets its own result, so a queue message can be
+    acked or rejected per article. `close` flushes whatever is left.
+
+    Works with an async engine (awaited on the loop) or a sync engine (run
+    in a worker thread).
+    """
+
+    # Results of `write`
+    STORED = "stored"
+    MISSING = "missing"
+    # a summary of another version (or a newer write) of the article won
+    SUPERSEDED = "superseded"
+
+    # Updates per statement
+    MAX_BATCH = 64
+
+    # Seconds an update may wait for the batch to fill
+    MAX_DELAY = 0.05
+
+    def __init__(
+        self,
+        engine: Union[Engine, AsyncEngine],
+        max_batch: Optional[int] = None,
+        max_delay: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the buffer.
+
+        Args:
+            engine: Sync or async SQLAlchemy engine.
+            max_batch: Override for MAX_BATCH.
+            max_delay: Override for MAX_DELAY.
+        """
+        self._logger = logging.getLogger("SummaryWriteBuffer")
+        self.engine = engine
+        self.max_batch = max_batch or self.MAX_BATCH
+        self.max_delay = self.MAX_DELAY if max_delay is None else max_delay
+
+        # article id -> (summary, version, waiting caller)
+        self._pending: Dict[int, Tuple[str, Optional[int], asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self._closed = False
+
+        self.stats = {"writes": 0, "flushes": 0, "missing": 0, "superseded": 0, "failed": 0}
+
+    async def write(self, id: int, summary: str, version: Optional[int] = None) -> str:
+        """
+        Store a summary (marked final).
+
+        Args:
+            id: Article id.
+            summary: The summary.
+            version: Article version the summary was made from; it is only
+                     stored while the article is at that version.
+
+        Returns:
+            STORED, MISSING (no such article) or SUPERSEDED (the article has
+            been revised since, or a newer summary replaced this one).
+
+        Raises:
+            Exception: The database error of the batch, so the caller can requeue.
+        """
+        if self._closed:
+            raise RuntimeError("SummaryWriteBuffer is closed")
+
+        future = asyncio.get_running_loop().create_future()
+        self.stats["writes"] += 1
+
+        queued = self._pending.get(id)
+        if queued is not None:
+            _, queued_version, queued_future = queued
+            if version is not None and queued_version is not None and version < queued_version:
+                # a summary of a later version is already waiting
+                self.stats["superseded"] += 1
+                return self.SUPERSEDED
+
+            # the newer summary for the same article replaces the queued one
+            self.stats["superseded"] += 1
+            if not queued_future.done():
+                queued_future.set_result(self.SUPERSEDED)
+
+        self._pending[id] = (summary, version, future)
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._start_flush
+            )
+
+        return await future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: Dict[int, Tuple[str, Optional[int], asyncio.Future]]) -> None:
+        summaries = {id: summary for id, (summary, _, _) in batch.items()}
+        versions = {
+            id: version for id, (_, version, _) in batch.items() if version is not None
+        }
+
+        try:
+            if isinstance(self.engine, AsyncEngine):
+                updated, superseded = await PresummarizedArticleRepository.update_summaries_async(
+                    self.engine, summaries, versions
+                )
+            else:
+                updated, superseded = await asyncio.to_thread(
+                    PresummarizedArticleRepository.update_summaries,
+                    self.engine,
+                    summaries,
+                    versions,
+                )
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            self._logger.error(f"Failed to store {len(batch)} summaries: {str(e)}")
+            for _, _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats["flushes"] += 1
+        for id, (_, version, future) in batch.items():
+            if id in updated:
+                result = self.STORED
+            elif id in superseded:
+                result = self.SUPERSEDED
+                self.stats["superseded"] += 1
+                self._logger.info(f"Summary of article {id} version {version} is superseded")
+            else:
+                result = self.MISSING
+                self.stats["missing"] += 1
+                self._logger.warning(f"Article with {id} not found")
+
+            if not future.done():
+                future.set_result(result)
+
+        self._logger.debug(f"{len(updated)} summaries stored in one statement")
+
+    async def flush(self) -> None:
+        """Store everything queued so far and wait for in-flight batches."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flush and stop accepting writes (call on shutdown)."""
+        self._closed = True
+        await self.flush()
@@ -2,4 +2,10 @@ TABLES = {
     "raw_articles": "raw_articles",
     "summarized_articles": "summarized_articles",
     "article_category": "article_category",
+    "summarization_usage": "summarization_usage",
+    "summarized_article_versions": "summarized_article_versions",
+    "article_bodies": "article_bodies",
+    "article_urls": "article_urls",
+    "outbox_messages": "outbox_messages",
+    "job_queue": "job_queue",
 }
@@ -0,0 +1,228 @@
+"""
+Token, latency and cost accounting for summarization.
+
+Every API call made by a summarizer is recorded as a `CallUsage`. Calls
+made while an article is being processed (inside `track_article`) are
+grouped into an `ArticleUsage`, including chunk and synthesis calls made
+concurrently for long articles. A process-wide `UsageAccountant` keeps
+rolling per-model statistics that can be queried in-process; the per-call
+rows are persisted to the `summarization_usage` table by the service.
+"""
+
+import logging
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+@dataclass
+class CallUsage:
+    """One API call (one chunk, synthesis or single-shot summary)."""
+
+    model: str
+    kind: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    retries: int = 0
+    cost: Optional[float] = None
+    succeeded: bool = True
+    streamed: bool = False
+    time_to_first_token: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class ArticleUsage:
+    """All calls made to summarize one article."""
+
+    article_id: Optional[Any]
+    calls: List[CallUsage] = field(default_factory=list)
+    wall_time: float = 0.0
+    # Input tokens removed by the token-reduction pass before summarizing
+    tokens_saved: int = 0
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(c.prompt_tokens for c in self.calls)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(c.completion_tokens for c in self.calls)
+
+    @property
+    def retries(self) -> int:
+        return sum(c.retries for c in self.calls)
+
+    @property
+    def cost(self) -> Optional[float]:
+        costs = [c.cost for c in self.calls if c.cost is not None]
+        return sum(costs) if costs else None
+
+    @property
+    def models(self) -> List[str]:
+        return sorted({c.model for c in self.calls})
+
+
+@dataclass
+class ModelStats:
+    """Rolling statistics for one model."""
+
+    model: str
+    calls: int
+    failures: int
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    cost: Optional[float]
+    latency_p50: float
+    latency_p95: float
+    latency_mean: float
+
+    @property
+    def cost_per_call(self) -> Optional[float]:
+        succeeded = self.calls - self.failures
+        if self.cost is None or succeeded <= 0:
+            return None
+        return self.cost / succeeded
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cost_per_call"] = self.cost_per_call
+        return data
+
+
+_current_article: ContextVar[Optional[ArticleUsage]] = ContextVar(
+    "current_article_usage", default=None
+)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+class UsageAccountant:
+    """Process-wide collector of call and article usage."""
+
+    # Calls kept per model for the rolling statistics
+    WINDOW = 1000
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        self._logger = logging.getLogger("UsageAccountant")
+        self._window = window or self.WINDOW
+        self._lock = Lock()
+        self._calls: Dict[str, Deque[CallUsage]] = defaultdict(lambda: deque(maxlen=self._window))
+        self._articles: Deque[ArticleUsage] = deque(maxlen=self._window)
+
+    def record_call(self, call: CallUsage) -> None:
+        """Record an API call (and attach it to the article being processed)."""
+        with self._lock:
+            self._calls[call.model].append(call)
+
+        article = _current_article.get()
+        if article is not None:
+            article.calls.append(call)
+
+    def record_article(self, article: ArticleUsage) -> None:
+        """Record a finished article."""
+        with self._lock:
+            self._articles.append(article)
+
+        self._logger.info(
+            f"Article {article.article_id} usage: {len(article.calls)} calls, "
+            f"{article.prompt_tokens} prompt + {article.completion_tokens} completion tokens, "
+            f"{article.tokens_saved} tokens saved, {article.retries} retries, "
+            f"cost {article.cost}, {article.wall_time:.2f}s"
+        )
+
+    def model_stats(self) -> Dict[str, ModelStats]:
+        """Rolling statistics per model over the last WINDOW calls."""
+        with self._lock:
+            snapshot = {model: list(calls) for model, calls in self._calls.items()}
+
+        stats: Dict[str, ModelStats] = {}
+        for model, calls in snapshot.items():
+            latencies = sorted(c.latency for c in calls if c.succeeded)
+            costs = [c.cost for c in calls if c.cost is not None]
+
+            stats[model] = ModelStats(
+                model=model,
+                calls=len(calls),
+                failures=sum(1 for c in calls if not c.succeeded),
+                prompt_tokens=sum(c.prompt_tokens for c in calls),
+                completion_tokens=sum(c.completion_tokens for c in calls),
+                retries=sum(c.retries for c in calls),
+                cost=sum(costs) if costs else None,
+                latency_p50=_percentile(latencies, 50),
+                latency_p95=_percentile(latencies, 95),
+                latency_mean=sum(latencies) / len(latencies) if latencies else 0.0,
+            )
+
+        return stats
+
+    def article_stats(self) -> Dict[str, Any]:
+        """Rolling per-article averages over the last WINDOW articles."""
+        with self._lock:
+            articles = list(self._articles)
+
+        if not articles:
+            return {"articles": 0}
+
+        costs = [a.cost for a in articles if a.cost is not None]
+        wall_times = sorted(a.wall_time for a in articles)
+
+        return {
+            "articles": len(articles),
+            "calls_per_article": sum(len(a.calls) for a in articles) / len(articles),
+            "prompt_tokens_per_article": sum(a.prompt_tokens for a in articles) / len(articles),
+            "completion_tokens_per_article": sum(a.completion_tokens for a in articles)
+            / len(articles),
+            "tokens_saved_per_article": sum(a.tokens_saved for a in articles) / len(articles),
+            "cost_per_summary": sum(costs) / len(costs) if costs else None,
+            "wall_time_p50": _percentile(wall_times, 50),
+            "wall_time_p95": _percentile(wall_times, 95),
+        }
+
+    @contextmanager
+    def track_article(self, article_id: Any) -> Iterator[ArticleUsage]:
+        """
+        Group every call made inside the block under one article.
+
+        The usage object is yielded so callers can persist it; it is recorded
+        with the accountant when the block exits.
+        """
+        usage = ArticleUsage(article_id=article_id)
+        token = _current_article.set(usage)
+        start = time.perf_counter()
+        try:
+            yield usage
+        finally:
+            usage.wall_time = time.perf_counter() - start
+            _current_article.reset(token)
+            self.record_article(usage)
+
+
+_accountant: Optional[UsageAccountant] = None
+_accountant_lock = Lock()
+
+
+def get_accountant() -> UsageAccountant:
+    """Get the process-wide usage accountant."""
+    global _accountant
+
+    if _accountant is None:
+        with _accountant_lock:
+            if _accountant is None:
+                _accountant = UsageAccountant()
+
+    return _accountant
@@ -0,0 +1,389 @@
+"""
+Local article category classifier.
+
+Hashed word n-gram features with a linear (softmax) model, trained with
+NumPy from a labelled CSV. No vocabulary is stored: n-grams are hashed
+(crc32) into a fixed number of buckets, so a trained model is just a weight
+matrix and the category names. Scoring a batch is one gather and one
+segmented sum over the batch's hashed features, which keeps the cost per
+article around a hundred microseconds instead of a second LLM call.
+
+Train:
+    python -m llm_explorer.category_classifier train labelled.csv \
+        --text-column text --label-column category --out models/category.npz
+
+Predict:
+    python -m llm_explorer.category_classifier predict models/category.npz "Sensex falls 500 points"
+"""
+
+import argparse
+import csv
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.env import get_env
+from llm_explorer.text_features import hash_ngrams, tokenize
+
+
+# Characters of an article used for classification (title/summary + lead)
+MAX_TEXT_CHARS = 1000
+
+
+@dataclass
+class SparseBatch:
+    """Hashed features of a batch in CSR-like form."""
+
+    indices: np.ndarray  # feature bucket per entry
+    values: np.ndarray  # weight per entry
+    offsets: np.ndarray  # start of each document's entries (len = n_docs)
+    n_docs: int
+
+    @property
+    def doc_of_entry(self) -> np.ndarray:
+        lengths = np.diff(np.append(self.offsets, len(self.indices)))
+        return np.repeat(np.arange(self.n_docs), lengths)
+
+
+class HashedNgramVectorizer:
+    """Maps text to hashed, L2-normalized word n-gram counts."""
+
+    def __init__(self, n_features: int = 2**18, ngram_max: int = 2) -> None:
+        """
+        Args:
+            n_features: Number of hash buckets.
+            ngram_max: Longest word n-gram (1 = unigrams only).
+        """
+        self.n_features = n_features
+        self.ngram_max = ngram_max
+
+    def _hash_document(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        indices, counts = hash_ngrams(
+            tokenize(text[:MAX_TEXT_CHARS]), self.n_features, self.ngram_max
+        )
+        if not len(indices):
+            return indices, np.empty(0, dtype=np.float32)
+
+        # sublinear tf, unit length
+        values = (1.0 + np.log(counts)).astype(np.float32)
+        values /= np.linalg.norm(values)
+        return indices, values
+
+    def transform(self, texts: Sequence[str]) -> SparseBatch:
+        """Hash a batch of texts."""
+        hashed = [self._hash_document(text or "") for text in texts]
+        lengths = np.array([len(i) for i, _ in hashed], dtype=np.int64)
+
+        return SparseBatch(
+            indices=np.concatenate([i for i, _ in hashed]) if hashed else np.empty(0, np.int64),
+            values=np.concatenate([v for _, v in hashed]) if hashed else np.empty(0, np.float32),
+            offsets=np.concatenate(([0], np.cumsum(lengths)[:-1])) if hashed else np.empty(0, np.int64),
+            n_docs=len(texts),
+        )
+
+
+class CategoryClassifier:
+    """Softmax regression over hashed n-grams."""
+
+    # Training defaults
+    EPOCHS = 30
+    LEARNING_RATE = 0.5
+    L2 = 1e-6
+    BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        vectorizer: Optional[HashedNgramVectorizer] = None,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+    ) -> None:
+        self._logger = logging.getLogger("CategoryClassifier")
+        self.labels = list(labels)
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+
+        n_classes = len(self.labels)
+        self.weights = (
+            weights
+            if weights is not None
+            else np.zeros((self.vectorizer.n_features, n_classes), dtype=np.float32)
+        )
+        self.bias = bias if bias is not None else np.zeros(n_classes, dtype=np.float32)
+
+    # scoring
+
+    def _scores(self, batch: SparseBatch) -> np.ndarray:
+        """Linear scores, shape (n_docs, n_classes)."""
+        scores = np.tile(self.bias, (batch.n_docs, 1))
+        if len(batch.indices):
+            contributions = self.weights[batch.indices] * batch.values[:, None]
+            doc_of_entry = batch.doc_of_entry
+            # segmented sum per class (bincount handles documents without features)
+            for c in range(scores.shape[1]):
+                scores[:, c] += np.bincount(
+                    doc_of_entry, weights=contributions[:, c], minlength=batch.n_docs
+                )
+        return scores
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Class probabilities, shape (len(texts), n_classes)."""
+        return self._softmax(self._scores(self.vectorizer.transform(texts)))
+
+    def predict(
+        self, texts: Sequence[str], min_confidence: float = 0.0
+    ) -> List[Optional[str]]:
+        """
+        Predict a category per text.
+
+        Args:
+            texts: Article texts (title or summary plus lead works best).
+            min_confidence: Below this probability the prediction is None.
+
+        Returns:
+            Category name (or None) per text.
+        """
+        if not texts:
+            return []
+
+        batch = self.vectorizer.transform(texts)
+        probabilities = self._softmax(self._scores(batch))
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[np.arange(len(texts)), best]
+
+        # texts without a single feature would only get the prior
+        has_features = np.diff(np.append(batch.offsets, len(batch.indices))) > 0
+
+        return [
+            self.labels[b] if ok and c >= min_confidence else None
+            for b, c, ok in zip(best, confidence, has_features)
+        ]
+
+    # training
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        vectorizer: Optional[HashedNgramVectorizer] = None,
+        epochs: Optional[int] = None,
+        learning_rate: Optional[float] = None,
+        seed: int = 0,
+    ) -> "CategoryClassifier":
+        """
+        Train with mini-batch gradient descent (AdaGrad) on cross-entropy.
+
+        Args:
+            texts: Training texts.
+            labels: Category per text.
+            vectorizer: Feature hashing settings.
+            epochs: Override for EPOCHS.
+            learning_rate: Override for LEARNING_RATE.
+            seed: Shuffling seed.
+        """
+        classes = sorted(set(labels))
+        model = cls(classes, vectorizer=vectorizer)
+        targets = np.array([classes.index(label) for label in labels])
+
+        epochs = epochs or cls.EPOCHS
+        learning_rate = learning_rate or cls.LEARNING_RATE
+        rng = np.random.default_rng(seed)
+
+        # hash once, slice per mini-batch
+        features = [model.vectorizer._hash_document(text) for text in texts]
+
+        grad_sq_w = np.full_like(model.weights, 1e-8)
+        grad_sq_b = np.full_like(model.bias, 1e-8)
+
+        for epoch in range(epochs):
+            order = rng.permutation(len(texts))
+            loss = 0.0
+
+            for start in range(0, len(order), cls.BATCH_SIZE):
+                rows = order[start : start + cls.BATCH_SIZE]
+                lengths = np.array([len(features[r][0]) for r in rows], dtype=np.int64)
+                batch = SparseBatch(
+                    indices=np.concatenate([features[r][0] for r in rows]),
+                    values=np.concatenate([features[r][1] for r in rows]),
+                    offsets=np.concatenate(([0], np.cumsum(lengths)[:-1])),
+                    n_docs=len(rows),
+                )
+
+                probabilities = model._softmax(model._scores(batch))
+                batch_targets = targets[rows]
+                loss -= np.log(probabilities[np.arange(len(rows)), batch_targets] + 1e-12).sum()
+
+                delta = probabilities
+                delta[np.arange(len(rows)), batch_targets] -= 1.0
+                delta /= len(rows)
+
+                # sparse gradient: only touched buckets
+                entry_grad = delta[batch.doc_of_entry] * batch.values[:, None]
+                touched, inverse = np.unique(batch.indices, return_inverse=True)
+                grad_w = np.zeros((len(touched), len(classes)), dtype=np.float32)
+                np.add.at(grad_w, inverse, entry_grad)
+                grad_w += cls.L2 * model.weights[touched]
+                grad_b = delta.sum(axis=0)
+
+                grad_sq_w[touched] += grad_w**2
+                grad_sq_b += grad_b**2
+                model.weights[touched] -= learning_rate * grad_w / np.sqrt(grad_sq_w[touched])
+                model.bias -= learning_rate * grad_b / np.sqrt(grad_sq_b)
+
+            model._logger.info(f"Epoch {epoch + 1}/{epochs} loss {loss / len(texts):.4f}")
+
+        return model
+
+    # persistence
+
+    def save(self, path: str) -> None:
+        """Save the model as a compressed .npz file."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            weights=self.weights.astype(np.float32),
+            bias=self.bias.astype(np.float32),
+            labels=np.array(self.labels),
+            n_features=self.vectorizer.n_features,
+            ngram_max=self.vectorizer.ngram_max,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryClassifier":
+        """Load a model saved with `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            vectorizer = HashedNgramVectorizer(
+                n_features=int(data["n_features"]), ngram_max=int(data["ngram_max"])
+            )
+            return cls(
+                [str(label) for label in data["labels"]],
+                vectorizer=vectorizer,
+                weights=data["weights"],
+                bias=data["bias"],
+            )
+
+
+def read_labelled_csv(
+    path: str, text_column: str, label_column: str
+) -> Tuple[List[str], List[str]]:
+    """Read (text, label) pairs, skipping rows with an empty text or label."""
+    texts: List[str] = []
+    labels: List[str] = []
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            text = (row.get(text_column) or "").strip()
+            label = (row.get(label_column) or "").strip()
+            if text and label:
+                texts.append(text)
+                labels.append(label)
+
+    return texts, labels
+
+
+_classifier: Optional[CategoryClassifier] = None
+_classifier_lock = Lock()
+_classifier_loaded = False
+
+
+def get_category_classifier() -> Optional[CategoryClassifier]:
+    """
+    Get the process-wide classifier, or None if no model is configured.
+
+    Environment Variables:
+        CATEGORY_MODEL_PATH: Path to a model trained with this module (.npz).
+    """
+    global _classifier, _classifier_loaded
+
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                path = get_env("CATEGORY_MODEL_PATH")
+                if path:
+                    try:
+                        _classifier = CategoryClassifier.load(path)
+                        logging.getLogger("CategoryClassifier").info(
+                            f"Loaded category model {path} ({len(_classifier.labels)} categories)"
+                        )
+                    except Exception as e:
+                        logging.getLogger("CategoryClassifier").error(
+                            f"Failed to load category model {path}: {str(e)}"
+                        )
+                _classifier_loaded = True
+
+    return _classifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hashed n-gram category classifier")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Train from a labelled CSV")
+    train_parser.add_argument("csv")
+    train_parser.add_argument("--text-column", default="text")
+    train_parser.add_argument("--label-column", default="category")
+    train_parser.add_argument("--out", default="models/category.npz")
+    train_parser.add_argument("--features", type=int, default=2**18)
+    train_parser.add_argument("--ngram-max", type=int, default=2)
+    train_parser.add_argument("--epochs", type=int, default=CategoryClassifier.EPOCHS)
+    train_parser.add_argument(
+        "--holdout", type=float, default=0.1, help="Share of rows used for evaluation"
+    )
+
+    predict_parser = commands.add_parser("predict", help="Classify texts")
+    predict_parser.add_argument("model")
+    predict_parser.add_argument("texts", nargs="+")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "predict":
+        model = CategoryClassifier.load(args.model)
+        for text, label in zip(args.texts, model.predict(args.texts)):
+            print(f"{label}\t{text}")
+        return
+
+    texts, labels = read_labelled_csv(args.csv, args.text_column, args.label_column)
+    if not texts:
+        sys.exit(f"No labelled rows found in {args.csv}")
+
+    order = np.random.default_rng(0).permutation(len(texts))
+    n_holdout = int(len(texts) * args.holdout)
+    holdout, train_rows = order[:n_holdout], order[n_holdout:]
+
+    model = CategoryClassifier.train(
+        [texts[i] for i in train_rows],
+        [labels[i] for i in train_rows],
+        vectorizer=HashedNgramVectorizer(n_features=args.features, ngram_max=args.ngram_max),
+        epochs=args.epochs,
+    )
+
+    if n_holdout:
+        holdout_texts = [texts[i] for i in holdout]
+        start = time.perf_counter()
+        predicted = model.predict(holdout_texts)
+        elapsed = time.perf_counter() - start
+        accuracy = np.mean([p == labels[i] for p, i in zip(predicted, holdout)])
+        print(
+            f"Holdout accuracy: {accuracy:.3f} on {n_holdout} rows "
+            f"({elapsed / n_holdout * 1e6:.0f}us per article)"
+        )
+
+    model.save(args.out)
+    print(f"Saved {len(model.labels)} categories to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
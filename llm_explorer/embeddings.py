@@ -0,0 +1,154 @@
+"""
+Fixed-size article embeddings without a model download.
+
+`HashedEmbedder` turns text into a dense unit vector in two steps:
+
+1. Hashed TF-IDF: words (optionally n-grams) are hashed into N_FEATURES buckets and
+   weighted by sublinear term frequency times IDF. Document frequencies are
+   kept per bucket and updated as articles are embedded (`fit_partial`), so
+   no vocabulary is stored.
+2. Sparse random projection: every bucket is projected to DIM dimensions
+   through PROJECTION_NNZ pseudo-random (+1/-1) entries derived from the
+   bucket index, so the projection matrix is never materialized.
+
+Texts that share vocabulary end up with a high cosine similarity, which is
+what "related stories" needs. IDF weights drift slowly as the corpus grows;
+vectors already stored are not recomputed.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from llm_explorer.text_features import hash_ngrams, l2_normalize, tokenize
+
+
+# Characters of an article used for the embedding (summary + lead)
+MAX_TEXT_CHARS = 4000
+
+
+class HashedEmbedder:
+    """Hashed TF-IDF + sparse random projection embeddings."""
+
+    # Hash buckets for word n-grams
+    N_FEATURES = 2**20
+
+    # Embedding dimensions
+    DIM = 256
+
+    # Non-zero projection entries per bucket
+    PROJECTION_NNZ = 4
+
+    def __init__(
+        self,
+        dim: Optional[int] = None,
+        n_features: Optional[int] = None,
+        ngram_max: int = 1,
+        seed: int = 17,
+        document_frequency: Optional[np.ndarray] = None,
+        documents: int = 0,
+    ) -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Override for DIM.
+            n_features: Override for N_FEATURES.
+            ngram_max: Longest word n-gram. Unigrams by default: at a few hundred
+                       dimensions, sparse high-IDF bigrams mostly add noise.
+            seed: Seed of the random projection (must match the stored vectors).
+            document_frequency: Per-bucket document counts (from `load_state`).
+            documents: Number of documents counted in document_frequency.
+        """
+        self._logger = logging.getLogger("HashedEmbedder")
+        self.dim = dim or self.DIM
+        self.n_features = n_features or self.N_FEATURES
+        self.ngram_max = ngram_max
+        self.seed = seed
+
+        self.document_frequency = (
+            document_frequency
+            if document_frequency is not None
+            else np.zeros(self.n_features, dtype=np.int32)
+        )
+        self.documents = documents
+
+        rng = np.random.default_rng(seed)
+        self._projection_mix = rng.integers(
+            1, 2**31 - 1, size=(self.PROJECTION_NNZ, 2), dtype=np.int64
+        )
+
+    def _project(self, buckets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Target dimension and sign of each projection entry, shape (nnz, n)."""
+        mixed = (buckets[None, :] * self._projection_mix[:, :1] + self._projection_mix[:, 1:]) % (
+            2**31 - 1
+        )
+        dims = mixed % self.dim
+        signs = np.where((mixed >> 16) & 1, 1.0, -1.0).astype(np.float32)
+        return dims, signs
+
+    def fit_partial(self, texts: Sequence[str]) -> None:
+        """Count the texts' buckets into the document frequencies."""
+        for text in texts:
+            buckets, _ = hash_ngrams(
+                tokenize((text or "")[:MAX_TEXT_CHARS]), self.n_features, self.ngram_max
+            )
+            self.document_frequency[buckets] += 1
+        self.documents += len(texts)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed a batch of texts.
+
+        Returns:
+            float32 array of shape (len(texts), dim) with unit-length rows
+            (all-zero rows for texts without tokens).
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        idf_norm = np.log1p(max(self.documents, 1))
+
+        for row, text in enumerate(texts):
+            buckets, counts = hash_ngrams(
+                tokenize((text or "")[:MAX_TEXT_CHARS]), self.n_features, self.ngram_max
+            )
+            if not len(buckets):
+                continue
+
+            # smoothed idf; unseen buckets get the maximum weight
+            idf = idf_norm - np.log1p(self.document_frequency[buckets]) + 1.0
+            weights = ((1.0 + np.log(counts)) * idf).astype(np.float32)
+
+            dims, signs = self._project(buckets)
+            vectors[row] = np.bincount(
+                dims.ravel(), weights=(signs * weights[None, :]).ravel(), minlength=self.dim
+            )
+
+        return l2_normalize(vectors)
+
+    # persistence of the IDF state (the projection is derived from the seed)
+
+    def save_state(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            document_frequency=self.document_frequency,
+            documents=self.documents,
+            dim=self.dim,
+            n_features=self.n_features,
+            ngram_max=self.ngram_max,
+            seed=self.seed,
+        )
+
+    @classmethod
+    def load_state(cls, path: str) -> "HashedEmbedder":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                dim=int(data["dim"]),
+                n_features=int(data["n_features"]),
+                ngram_max=int(data["ngram_max"]),
+                seed=int(data["seed"]),
+                document_frequency=data["document_frequency"].copy(),
+                documents=int(data["documents"]),
+            )
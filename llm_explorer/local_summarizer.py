@@ -0,0 +1,327 @@
+"""
+Local seq2seq summarizer (e.g. BART) running on CPU.
+
+Loads a HuggingFace seq2seq model from a local path - nothing is downloaded
+and no article leaves the machine. Requests are grouped by a dynamic
+batcher so that concurrent articles of similar length share one forward
+pass.
+
+Requires the optional `local` dependencies:
+    uv sync --extra local
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from config.env import get_env
+from llm_explorer.base_summarizer import BaseSummarizer, SummarizationError
+
+
+@dataclass
+class _BatchItem:
+    text: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class DynamicBatcher:
+    """
+    Groups queued texts by length bucket and runs them as one batch.
+
+    A single worker runs one batch at a time in an executor thread. While a
+    batch is running, new requests pile up and form the next (larger)
+    batch, so throughput grows with load without hurting latency at low
+    load. A bucket is flushed when it is full or when its oldest item has
+    waited `max_wait` seconds.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[str]], List[str]],
+        bucket_of: Callable[[str], int],
+        max_batch_size: int = 8,
+        max_wait: float = 0.05,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            run_batch: Blocking function turning a list of texts into outputs.
+            bucket_of: Maps a text to its length bucket.
+            max_batch_size: Maximum texts per forward pass.
+            max_wait: Seconds the oldest text may wait for its batch to fill.
+            executor: Executor the batches run in (single thread by default).
+        """
+        self._logger = logging.getLogger("DynamicBatcher")
+
+        self._run_batch = run_batch
+        self._bucket_of = bucket_of
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="LocalSummarizer"
+        )
+
+        self._pending: Dict[int, List[_BatchItem]] = defaultdict(list)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, text: str) -> str:
+        """Queue a text and wait for its output."""
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._bucket_of(text)].append(_BatchItem(text, future))
+        self._wakeup.set()
+
+        return await future
+
+    async def close(self) -> None:
+        """Stop the worker, failing anything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        for items in self._pending.values():
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(SummarizationError("Summarizer closed"))
+        self._pending.clear()
+
+        self._executor.shutdown(wait=False)
+
+    def _oldest_bucket(self) -> Optional[int]:
+        buckets = [(items[0].enqueued_at, bucket) for bucket, items in self._pending.items() if items]
+        return min(buckets)[1] if buckets else None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            bucket = self._oldest_bucket()
+            if bucket is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            items = self._pending[bucket]
+            remaining = items[0].enqueued_at + self._max_wait - time.monotonic()
+
+            if len(items) < self._max_batch_size and remaining > 0:
+                # Give the batch a moment to fill up
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = items[: self._max_batch_size]
+            self._pending[bucket] = items[self._max_batch_size :]
+
+            # Skip requests whose caller already gave up
+            batch = [item for item in batch if not item.future.done()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                outputs = await loop.run_in_executor(
+                    self._executor, self._run_batch, [item.text for item in batch]
+                )
+            except Exception as e:
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+
+            self._logger.debug(
+                f"Batch of {len(batch)} (bucket {bucket}) took {time.perf_counter() - start:.3f}s"
+            )
+
+            for item, output in zip(batch, outputs):
+                if not item.future.done():
+                    item.future.set_result(output)
+
+
+class LocalSeq2SeqSummarizer(BaseSummarizer):
+    """
+    Summarizer backed by a local HuggingFace seq2seq model.
+
+    Any `AutoModelForSeq2SeqLM` checkpoint works (facebook/bart-large-cnn,
+    distilbart, t5-small, ...), as long as it is on local disk.
+    """
+
+    # Model input limit in tokens (BART's maximum)
+    MAX_INPUT_TOKENS = 1024
+
+    # Generated summary length in tokens (~50-70 words)
+    MIN_SUMMARY_TOKENS = 60
+    MAX_SUMMARY_TOKENS = 110
+
+    # Beam search width (1 = greedy, fastest)
+    NUM_BEAMS = 2
+
+    # Input length buckets in tokens; articles in the same bucket share a batch
+    LENGTH_BUCKETS = (128, 256, 512, 1024)
+
+    # Dynamic batching limits
+    MAX_BATCH_SIZE = 8
+    MAX_BATCH_WAIT = 0.05
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        quantize: Optional[bool] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_wait: Optional[float] = None,
+    ) -> None:
+        """
+        Load the model and tokenizer.
+
+        Args:
+            model_path: Directory holding the model (LOCAL_MODEL_PATH env var if None).
+            num_threads: Cap on torch intra-op threads (LOCAL_MODEL_THREADS env var).
+            quantize: Apply dynamic int8 quantization to Linear layers
+                      (LOCAL_MODEL_QUANTIZE env var, default off).
+            max_batch_size: Override for MAX_BATCH_SIZE.
+            max_batch_wait: Override for MAX_BATCH_WAIT in seconds.
+
+        Raises:
+            SummarizationError: If the optional dependencies or the model are missing.
+        """
+        super().__init__()
+
+        self._logger = logging.getLogger("LocalSeq2SeqSummarizer")
+
+        try:
+            import torch
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        except ImportError as e:
+            raise SummarizationError(
+                f"Local summarizer needs torch and transformers ({e}). "
+                "Install them with: uv sync --extra local"
+            )
+
+        self._torch = torch
+
+        model_path = model_path or get_env("LOCAL_MODEL_PATH")
+        if not model_path:
+            raise SummarizationError("LOCAL_MODEL_PATH environment variable is required but not set")
+
+        if num_threads is None:
+            num_threads = int(get_env("LOCAL_MODEL_THREADS", default="0")) or None
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        if quantize is None:
+            quantize = get_env("LOCAL_MODEL_QUANTIZE", default="false").lower() in ("1", "true", "int8")
+
+        self._tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_path, local_files_only=True)
+        model.eval()
+
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        self._model = model
+        self._max_input_tokens = min(
+            self.MAX_INPUT_TOKENS,
+            getattr(model.config, "max_position_embeddings", None) or self.MAX_INPUT_TOKENS,
+        )
+
+        self._batcher = DynamicBatcher(
+            run_batch=self._generate_batch,
+            bucket_of=self._bucket_of,
+            max_batch_size=max_batch_size
+            or int(get_env("LOCAL_MODEL_BATCH_SIZE", default="0"))
+            or self.MAX_BATCH_SIZE,
+            max_wait=max_batch_wait
+            or float(get_env("LOCAL_MODEL_BATCH_WAIT_MS", default="0")) / 1000.0
+            or self.MAX_BATCH_WAIT,
+        )
+
+        self._model_name = f"local:{model_path}" + (" (int8)" if quantize else "")
+
+        self._logger.info(
+            f"Local summarizer loaded {model_path} "
+            f"(threads: {torch.get_num_threads()}, int8: {bool(quantize)})"
+        )
+
+    async def summarize_article(self, article: str) -> Optional[str]:
+        """
+        Summarize an article with the local model.
+
+        Args:
+            article: The article text to summarize.
+
+        Returns:
+            Summarized article, or None if generation failed.
+        """
+        article = self._ensure_string(article)
+        if not article:
+            self._logger.warning("Empty article provided for summarization")
+            return None
+
+        if len(article) < 500:
+            self._logger.info("Article too short, returning as-is")
+            return article
+
+        try:
+            summary = await self._batcher.submit(article)
+        except SummarizationError:
+            raise
+        except Exception as e:
+            self._logger.error(f"Local summarization failed: {str(e)}")
+            return None
+
+        return self._ensure_string(summary) or None
+
+    async def close(self) -> None:
+        """Stop the batcher."""
+        await self._batcher.close()
+
+    def _bucket_of(self, text: str) -> int:
+        """Length bucket of a text, from a cheap ~4 chars/token estimate."""
+        estimated_tokens = len(text) // 4
+        for bucket in self.LENGTH_BUCKETS:
+            if estimated_tokens <= bucket:
+                return bucket
+        return self.LENGTH_BUCKETS[-1]
+
+    def _generate_batch(self, texts: Sequence[str]) -> List[str]:
+        """Run one batched forward pass (called in the executor thread)."""
+        inputs = self._tokenizer(
+            list(texts),
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=self._max_input_tokens,
+        )
+
+        generate_kwargs: Dict[str, Any] = {
+            "max_new_tokens": self.MAX_SUMMARY_TOKENS,
+            "min_new_tokens": self.MIN_SUMMARY_TOKENS,
+            "num_beams": self.NUM_BEAMS,
+            "no_repeat_ngram_size": 3,
+        }
+        if self.NUM_BEAMS > 1:
+            generate_kwargs["early_stopping"] = True
+
+        with self._torch.inference_mode():
+            output_ids = self._model.generate(**inputs, **generate_kwargs)
+
+        return self._tokenizer.batch_decode(output_ids, skip_special_tokens=True)
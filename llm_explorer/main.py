@@ -1,82 +1,57 @@
 import asyncio
 import json
 import logging
-import threading
+import signal
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from aio_pika.abc import AbstractIncomingMessage
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from config.config import queue_names, service_names
 from config.env import get_env
+from database.async_connection import AsyncDBConnection, get_async_engine
 from database.connection import DBConnection
-from database.repository.summarized_articles import PresummarizedArticleRepository
-from dotenv import load_dotenv
+from database.models.models import SummarizationUsage
+from database.repository.article_category import ArticleCategoryRepository
+from database.repository.summarization_usage import SummarizationUsageRepository
+from database.repository.summarized_articles import (
+    PresummarizedArticleRepository,
+    SummaryWriteBuffer,
+)
+from llm_explorer.accounting import ArticleUsage, get_accountant
+from llm_explorer.category_classifier import get_category_classifier
+from llm_explorer.scheduler import FreshnessScheduler, create_scheduler
 from llm_explorer.summarizer_factory import create_summarizer
-from msg_queue.queue_handler import QueueHandler
-
-
-# Global event loop and thread for async operations
-_event_loop: Optional[asyncio.AbstractEventLoop] = None
-_loop_thread: Optional[threading.Thread] = None
-_loop_lock = threading.Lock()
-_loop_ready = threading.Event()
-
-
-def _run_event_loop():
-    """Run the event loop in a background thread."""
-    global _event_loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    _event_loop = loop
-    _loop_ready.set()  # Signal that the loop is ready
-    loop.run_forever()
-
-
-def get_event_loop() -> asyncio.AbstractEventLoop:
-    """
-    Get or create the persistent event loop for async operations.
-
-    Starts a background thread with a long-running event loop on first call.
-    Subsequent calls return the existing loop.
-
-    Returns:
-        The event loop running in the background thread.
-    """
-    global _loop_thread
-
-    with _loop_lock:
-        if _event_loop is None or _event_loop.is_closed():
-            _loop_ready.clear()
-            _loop_thread = threading.Thread(
-                target=_run_event_loop, name="AsyncEventLoopThread", daemon=True
-            )
-            _loop_thread.start()
-            # Wait for the loop to be ready
-            _loop_ready.wait(timeout=5)
-
-    return _event_loop
-
-
-def stop_event_loop():
-    """
-    Stop the background event loop and cleanup resources.
-
-    Call this before program exit to ensure clean shutdown.
-    """
-    global _event_loop, _loop_thread
-
-    with _loop_lock:
-        if _event_loop is not None and not _event_loop.is_closed():
-            _event_loop.call_soon_threadsafe(_event_loop.stop)
-            _event_loop.close()
-            _event_loop = None
-
-        if _loop_thread is not None and _loop_thread.is_alive():
-            _loop_thread.join(timeout=2)
-            _loop_thread = None
+from llm_explorer.token_reduction import get_token_reducer
+from llm_explorer.vector_index import get_related_index, related_text
+from msg_queue.async_queue_handler import create_async_queue_handler
+
+
+def usage_rows(usage: ArticleUsage) -> List[SummarizationUsage]:
+    """Convert the calls recorded for an article into database rows."""
+    return [
+        SummarizationUsage(
+            article_id=usage.article_id,
+            model=call.model,
+            kind=call.kind,
+            prompt_tokens=call.prompt_tokens,
+            completion_tokens=call.completion_tokens,
+            latency_ms=int(call.latency * 1000),
+            retries=call.retries,
+            cost=call.cost,
+            succeeded=call.succeeded,
+        )
+        for call in usage.calls
+    ]
 
 
 async def process_article(
-    model_handler, article_body: str, article_id: str, logger: logging.Logger
+    model_handler,
+    article_body: str,
+    article_id: str,
+    logger: logging.Logger,
+    database_engine=None,
 ) -> Optional[str]:
     """
     Process a single article asynchronously.
@@ -86,6 +61,8 @@ async def process_article(
         article_body: The article text to summarize.
         article_id: The article identifier for logging.
         logger: Logger instance.
+        database_engine: Optional engine (sync or async); when given, per-call
+                         token, latency and cost rows are stored in summarization_usage.
 
     Returns:
         The summarized article, or None if failed.
@@ -93,7 +70,21 @@ async def process_article(
     # to check how much time model takes to summarize 1 article
     summarization_start_time = time.perf_counter()
 
-    summarized_article_body = await model_handler.summarize_article(article_body)
+    # group every API call (chunks, synthesis) under this article
+    with get_accountant().track_article(article_id) as usage:
+        # drop boilerplate and redundant sentences before paying for them
+        reducer = get_token_reducer()
+        if reducer is not None:
+            reduction = reducer.reduce(article_body)
+            article_body = reduction.text
+            usage.tokens_saved = reduction.tokens_saved
+
+            logger.info(
+                f"Article: {article_id} input reduced {reduction.original_tokens} -> "
+                f"{reduction.reduced_tokens} tokens ({reduction.tokens_saved} saved)"
+            )
+
+        summarized_article_body = await model_handler.summarize_article(article_body)
 
     summarization_end_time = time.perf_counter()
 
@@ -103,115 +94,457 @@ async def process_article(
         f"Article: {article_id}\nTime taken to summarize: {time_taken:.4f}s"
     )
 
+    if database_engine is not None and usage.calls:
+        if isinstance(database_engine, AsyncEngine):
+            await SummarizationUsageRepository.insert_all_async(
+                database_engine, usage_rows(usage)
+            )
+        else:
+            await asyncio.to_thread(
+                SummarizationUsageRepository.insert_all, database_engine, usage_rows(usage)
+            )
+
     return summarized_article_body
 
 
-def main():
+class SummarizationService:
     """
-    Accepts data from scraper_to_llm queue
-    calls model to summarize body
-    store summarized article body into database
+    All-async summarization pipeline on a single event loop.
+
+    Three stages run in one task group, connected by bounded queues so a
+    slow stage pushes back on the one before it:
+
+        consumer  --scheduler-->  summarize workers  --outbox-->  enrichment writer
+
+    The inbox is a FreshnessScheduler over a larger prefetch window, so the
+    newest articles are summarized first and stale ones are dropped or
+    deferred. Workers store summaries through a SummaryWriteBuffer, which
+    coalesces concurrent writes into one UPDATE per batch. The writer then,
+    when configured, assigns categories and adds embeddings to the
+    related-articles index for a whole batch at once (the index is persisted
+    every RELATED_FLUSH_ARTICLES articles or RELATED_FLUSH_SECONDS, and on
+    shutdown). With an async engine every database call is awaited on the
+    loop; otherwise the sync engine is used from a worker thread.
+
+    A message is acknowledged only after its summary is stored. On shutdown
+    the consumer is cancelled first (buffered deliveries are requeued), the
+    queues are drained so in-flight articles finish, then the workers stop.
     """
 
-    service_name = service_names["summarization_service"]
-
-    logger = logging.getLogger(f"LLM service: {service_name} ")
+    # Articles summarized concurrently
+    WORKERS = 8
+
+    # Items buffered between two stages
+    STAGE_QUEUE_SIZE = 16
+
+    # Per-article summarization timeout in seconds
+    SUMMARY_TIMEOUT = 60
+
+    # Stored summaries categorized and indexed per round
+    WRITE_BATCH_SIZE = 32
+
+    # Category predictions below this probability are left unset
+    CATEGORY_MIN_CONFIDENCE = 0.5
+
+    # Related-articles index is persisted after this many new articles ...
+    RELATED_FLUSH_ARTICLES = 256
+
+    # ... or once the oldest unpersisted article is this many seconds old
+    RELATED_FLUSH_SECONDS = 30.0
+
+    def __init__(
+        self,
+        model_handler,
+        database_engine,
+        logger: logging.Logger,
+        workers: Optional[int] = None,
+        stage_queue_size: Optional[int] = None,
+        scheduler: Optional[FreshnessScheduler] = None,
+        async_engine: Optional[AsyncEngine] = None,
+        summary_buffer: Optional[SummaryWriteBuffer] = None,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            model_handler: The summarizer instance.
+            database_engine: SQLAlchemy engine used for summaries and usage rows.
+            logger: Logger instance.
+            workers: Override for WORKERS.
+            stage_queue_size: Override for STAGE_QUEUE_SIZE.
+            scheduler: Inbox scheduler (default: configured from the environment).
+            async_engine: Async engine; when given, database I/O does not use threads.
+            summary_buffer: Write-behind buffer for summaries (default: on the engine).
+        """
+        self._model_handler = model_handler
+        self._database_engine = database_engine
+        self._async_engine = async_engine
+        self._logger = logger
+        self._workers = workers or self.WORKERS
+        self._stage_queue_size = stage_queue_size or self.STAGE_QUEUE_SIZE
+
+        self._stopping = asyncio.Event()
+        self._inbox: FreshnessScheduler = scheduler or create_scheduler()
+
+        # the broker may deliver enough to fill the scheduling window and
+        # keep every stage busy, no more
+        self._channel_name = queue_names["scraping_to_summmarisation"]
+        self._queue = create_async_queue_handler(
+            self._channel_name,
+            prefetch_count=self._inbox.maxsize + self._workers + self._stage_queue_size,
+        )
 
-    try:
-        # model instance - uses factory to create appropriate summarizer
-        # Uses SUMMARIZER_BACKEND env var or defaults to "openrouter"
-        model_handler = create_summarizer()
+        self._summary_buffer = summary_buffer or SummaryWriteBuffer(
+            async_engine or database_engine
+        )
 
-        logger.info(
-            f"Summarizer initialized: {model_handler.get_model_name()}"
+        # stored (article id, summary, body) waiting for categories / related index
+        self._outbox: asyncio.Queue[Tuple[Any, str, str]] = asyncio.Queue(
+            maxsize=self._stage_queue_size
         )
 
-        # queue from scraping service
-        channel_name = queue_names["scraping_to_summmarisation"]
-        scraping_to_summ_queue = QueueHandler(channel_name)
+        # optional local category model (CATEGORY_MODEL_PATH)
+        self._category_classifier = get_category_classifier()
+        self._category_ids: Optional[Dict[str, int]] = None
 
-        database_engine = DBConnection().get_engine()
+        # optional related-articles index (RELATED_INDEX_DIR)
+        self._related_index = get_related_index()
+        self._related_unflushed = 0
+        self._related_unflushed_since = 0.0
 
-        def handle_queue_body(body):
-            """
-            Gets queue and passes it to model for summarization.
-            Bridges synchronous queue callback with async summarization.
-            """
+    def stop(self) -> None:
+        """Request a graceful shutdown (safe to call from a signal handler)."""
+        if not self._stopping.is_set():
+            self._logger.info("Shutdown requested, draining in-flight articles")
+            self._stopping.set()
 
-            # parse string to json / dict
-            unsummarized_artile_data = json.loads(body)
+    async def run(self) -> None:
+        """Consume, summarize and store until `stop` is called."""
+        await self._queue.connect()
 
-            if unsummarized_artile_data is None:
-                return
+        try:
+            async with asyncio.TaskGroup() as group:
+                consumer = group.create_task(self._consume(), name="consumer")
+                stages = [
+                    group.create_task(self._summarize_worker(), name=f"summarizer-{i}")
+                    for i in range(self._workers)
+                ]
+                stages.append(group.create_task(self._write_summaries(), name="writer"))
 
-            article_id = unsummarized_artile_data["id"]
-            raw_article_id = unsummarized_artile_data["raw_article_id"]
-            article_body = unsummarized_artile_data["body"]
+                await self._stopping.wait()
 
-            logger.info(f"Article {article_id} recieved")
+                # 1. stop taking new work
+                consumer.cancel()
 
-            if article_body is None or article_id is None:
-                logger.error(f"{channel_name} data is corrupted, missed some fields")
-                return
+                # 2. let everything already accepted finish
+                await self._inbox.join()
+                await self._outbox.join()
 
-            if raw_article_id is None:
-                logger.warning(
-                    f"{channel_name} raw_article_id is missing for {article_id}"
-                )
+                # 3. stop the idle stages
+                for task in stages:
+                    task.cancel()
 
-            logger.info(f"Article {article_id} transfered to LLM for summarization")
+        finally:
+            try:
+                await asyncio.to_thread(self._flush_related)
+            except Exception as e:
+                self._logger.error(f"Failed to persist the related-articles index: {str(e)}")
+            await self._summary_buffer.close()
+            await self._queue.close_queue()
 
-            # Run async summarization in the persistent event loop
-            loop = get_event_loop()
-            future = asyncio.run_coroutine_threadsafe(
-                process_article(model_handler, article_body, article_id, logger),
-                loop,
+    async def _consume(self) -> None:
+        async for message in self._queue.messages():
+            # parse string to json / dict
+            try:
+                unsummarized_artile_data: Optional[Dict[str, Any]] = json.loads(message.body)
+            except ValueError:
+                self._logger.error(f"{self._channel_name} sent a message that is not json")
+                await message.reject()
+                continue
+
+            if not isinstance(unsummarized_artile_data, dict):
+                await message.reject()
+                continue
+
+            await self._inbox.put(
+                self._inbox.schedule(
+                    (message, unsummarized_artile_data),
+                    # a revision (revisit service) is fresh as of its revision time
+                    published_date=unsummarized_artile_data.get("revised_at")
+                    or unsummarized_artile_data.get("published_date"),
+                    source=unsummarized_artile_data.get("source"),
+                )
             )
 
-            # Block until the coroutine completes (with timeout)
+    async def _summarize_worker(self) -> None:
+        while True:
+            item = await self._inbox.get()
+            message, unsummarized_artile_data = item.payload
             try:
-                summarized_article_body = future.result(timeout=60)
-            except asyncio.TimeoutError:
-                logger.error(f"Summarization timeout for article: {article_id}")
-                future.cancel()
-                return
+                if item.stale and self._inbox.drops_stale:
+                    self._logger.info(
+                        f"Article {unsummarized_artile_data.get('id')} is stale "
+                        f"(published {unsummarized_artile_data.get('published_date')}), dropped"
+                    )
+                    await message.reject()
+                    continue
+
+                await self._summarize_message(message, unsummarized_artile_data)
             except Exception as e:
-                logger.error(
-                    f"Summarization failed for article {article_id}: {str(e)}",
-                    exc_info=True,
+                self._logger.error(f"Error processing message: {str(e)}", exc_info=True)
+                await message.nack(requeue=True)
+            finally:
+                self._inbox.task_done()
+
+    async def _summarize_message(
+        self, message: AbstractIncomingMessage, unsummarized_artile_data: Dict[str, Any]
+    ) -> None:
+        article_id = unsummarized_artile_data.get("id")
+        raw_article_id = unsummarized_artile_data.get("raw_article_id")
+        article_body = unsummarized_artile_data.get("body")
+
+        logger = self._logger
+        logger.info(f"Article {article_id} recieved")
+
+        if article_body is None or article_id is None:
+            logger.error(f"{self._channel_name} data is corrupted, missed some fields")
+            await message.reject()
+            return
+
+        if raw_article_id is None:
+            logger.warning(f"{self._channel_name} raw_article_id is missing for {article_id}")
+
+        logger.info(f"Article {article_id} transfered to LLM for summarization")
+
+        try:
+            async with asyncio.timeout(self.SUMMARY_TIMEOUT):
+                summarized_article_body = await process_article(
+                    self._model_handler,
+                    article_body,
+                    article_id,
+                    logger,
+                    self._async_engine or self._database_engine,
                 )
-                return
+        except TimeoutError:
+            logger.error(f"Summarization timeout for article: {article_id}")
+            await message.reject()
+            return
+
+        if summarized_article_body is None:
+            logger.warning(f"Summarization failed for ariticle: {article_id}")
+            await message.reject()
+            return
+
+        # coalesced with other workers' summaries into one UPDATE; only
+        # stored while the article is still at the summarized version
+        result = await self._summary_buffer.write(
+            article_id, summarized_article_body, version=unsummarized_artile_data.get("version")
+        )
+        if result == SummaryWriteBuffer.MISSING:
+            await message.reject()
+            return
 
-            if summarized_article_body is None:
-                logger.warning(f"Summarization failed for ariticle: {article_id}")
-                return
+        await message.ack()
 
-            # insert summary into database
-            PresummarizedArticleRepository().update_summary(
-                id=article_id,
-                engine=database_engine,
-                summary=summarized_article_body,
-            )
+        if result == SummaryWriteBuffer.SUPERSEDED:
+            logger.info(f"Article {article_id} was revised meanwhile, summary discarded")
+            return
 
-        scraping_to_summ_queue.consume(call_back=handle_queue_body)
+        await self._outbox.put((article_id, summarized_article_body, article_body))
 
-    except Exception as e:
-        logger.error(f"Main function error: {str(e)}", exc_info=True)
-        raise
-    finally:
-        # Clean up resources
-        if "model_handler" in locals() and hasattr(model_handler, "close"):
-            loop = get_event_loop()
-            if loop and not loop.is_closed():
-                future = asyncio.run_coroutine_threadsafe(
-                    model_handler.close(), loop
+    async def _write_summaries(self) -> None:
+        while True:
+            # while articles are indexed but not persisted, wake up in time
+            # to flush them even if no more summaries arrive
+            try:
+                first = await asyncio.wait_for(
+                    self._outbox.get(), timeout=self._related_flush_timeout()
                 )
+            except asyncio.TimeoutError:
                 try:
-                    future.result(timeout=5)
+                    await asyncio.to_thread(self._flush_related)
                 except Exception as e:
-                    logger.warning(f"Error closing model_handler: {e}")
+                    self._logger.error(f"Failed to persist the related-articles index: {str(e)}")
+                continue
+
+            # take everything already waiting so categories are scored and
+            # written as one batch
+            batch = [first]
+            while len(batch) < self.WRITE_BATCH_SIZE and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+
+            try:
+                if self._related_index is None and self._category_classifier is None:
+                    continue
+                if self._async_engine is not None:
+                    await self._enrich_batch_async(batch)
+                else:
+                    await asyncio.to_thread(self._enrich_batch, batch)
+            except Exception as e:
+                # summaries are stored and acked; only the extras are missing
+                self._logger.error(f"Failed to categorize/index {len(batch)} articles: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
+    def _enrich_batch(self, batch: List[Tuple[Any, str, str]]) -> None:
+        """Index and categorize stored summaries (runs in a worker thread)."""
+        if self._related_index is not None:
+            self._index_related(batch)
+
+        classifier = self._category_classifier
+        if classifier is None:
+            return
+
+        if self._category_ids is None:
+            self._category_ids = ArticleCategoryRepository.get_or_create_ids(
+                self._database_engine, classifier.labels
+            )
+
+        PresummarizedArticleRepository.update_categories(
+            self._database_engine, self._predict_categories(batch)
+        )
+
+    async def _enrich_batch_async(self, batch: List[Tuple[Any, str, str]]) -> None:
+        """Index and categorize stored summaries on the loop (async engine)."""
+        # embedding and classification are CPU work, keep them off the loop
+        if self._related_index is not None:
+            await asyncio.to_thread(self._index_related, batch)
+
+        classifier = self._category_classifier
+        if classifier is None:
+            return
+
+        if self._category_ids is None:
+            self._category_ids = await ArticleCategoryRepository.get_or_create_ids_async(
+                self._async_engine, classifier.labels
+            )
+
+        categories = await asyncio.to_thread(self._predict_categories, batch)
+        await PresummarizedArticleRepository.update_categories_async(
+            self._async_engine, categories
+        )
+
+    def _index_related(self, batch: List[Tuple[Any, str, str]]) -> None:
+        self._related_index.add_articles(
+            [article_id for article_id, _, _ in batch],
+            [related_text(summary, body) for _, summary, body in batch],
+        )
+        if not self._related_unflushed:
+            self._related_unflushed_since = time.monotonic()
+        self._related_unflushed += len(batch)
+
+        # flushing rewrites the embedder state, too costly after every batch
+        if (
+            self._related_unflushed >= self.RELATED_FLUSH_ARTICLES
+            or self._related_flush_timeout() == 0.0
+        ):
+            self._flush_related()
+
+    def _related_flush_timeout(self) -> Optional[float]:
+        """Seconds until unpersisted index entries are due (None if there are none)."""
+        if not self._related_unflushed:
+            return None
+        return max(
+            0.0, self._related_unflushed_since + self.RELATED_FLUSH_SECONDS - time.monotonic()
+        )
 
-        # Stop the background event loop
-        stop_event_loop()
-        logger.info("Event loop stopped and resources cleaned up.")
+    def _flush_related(self) -> None:
+        """Persist the related-articles index if articles were added since the last flush."""
+        if self._related_index is None or not self._related_unflushed:
+            return
+
+        self._related_index.flush()
+        self._related_unflushed = 0
+
+    def _predict_categories(self, batch: List[Tuple[Any, str, str]]) -> Dict[Any, int]:
+        # summary first: it is short and dense, the body lead adds context
+        labels = self._category_classifier.predict(
+            [f"{summary}\n{body}" for _, summary, body in batch],
+            min_confidence=self.CATEGORY_MIN_CONFIDENCE,
+        )
 
+        return {
+            article_id: self._category_ids[label]
+            for (article_id, _, _), label in zip(batch, labels)
+            if label is not None and label in self._category_ids
+        }
+
+
+async def main():
+    """
+    Accepts data from scraper_to_llm queue
+    calls model to summarize body
+    store summarized article body into database
+
+    Environment Variables:
+        SUMMARIZER_CONCURRENCY:      Articles summarized concurrently (default: 8).
+        SUMMARIZER_STAGE_QUEUE:      Items buffered between stages (default: 16).
+        SUMMARY_WRITE_BATCH_SIZE:    Summaries per UPDATE statement (default: 64).
+        SUMMARY_WRITE_MAX_DELAY_MS:  Max wait for a batch to fill (default: 50).
+    """
+
+    service_name = service_names["summarization_service"]
+
+    logger = logging.getLogger(f"LLM service: {service_name} ")
+
+    # model instance - uses factory to create appropriate summarizer
+    # Uses SUMMARIZER_BACKEND env var or defaults to "openrouter"
+    model_handler = create_summarizer()
+
+    logger.info(f"Summarizer initialized: {model_handler.get_model_name()}")
+
+    workers = get_env("SUMMARIZER_CONCURRENCY")
+    stage_queue_size = get_env("SUMMARIZER_STAGE_QUEUE")
+
+    # async engine (asyncpg) when available, sync engine in threads otherwise
+    async_engine = get_async_engine()
+
+    write_batch = get_env("SUMMARY_WRITE_BATCH_SIZE")
+    write_delay = get_env("SUMMARY_WRITE_MAX_DELAY_MS")
+    summary_buffer = SummaryWriteBuffer(
+        async_engine or DBConnection().get_engine(),
+        max_batch=int(write_batch) if write_batch else None,
+        max_delay=float(write_delay) / 1000 if write_delay else None,
+    )
+
+    service = SummarizationService(
+        model_handler,
+        DBConnection().get_engine(),
+        logger,
+        workers=int(workers) if workers else None,
+        stage_queue_size=int(stage_queue_size) if stage_queue_size else None,
+        async_engine=async_engine,
+        summary_buffer=summary_buffer,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, service.stop)
+        except NotImplementedError:
+            # signal handlers are not available on every platform
+            pass
+
+    try:
+        await service.run()
+
+    except Exception as e:
+        logger.error(f"Main function error: {str(e)}", exc_info=True)
+        raise
+
+    finally:
+        # Clean up resources once in-flight work has drained
+        if hasattr(model_handler, "close"):
+            try:
+                await model_handler.close()
+            except Exception as e:
+                logger.warning(f"Error closing model_handler: {e}")
+
+        logger.info(f"Summary writes: {summary_buffer.stats}")
+        if async_engine is not None:
+            logger.info(f"Database pool: {AsyncDBConnection.pool_stats()}")
+            await AsyncDBConnection.dispose()
+        else:
+            logger.info(f"Database pool: {DBConnection.pool_stats()}")
+        logger.info("Summarization service stopped and resources cleaned up.")
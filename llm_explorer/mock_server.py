@@ -0,0 +1,385 @@
+"""
+Local mock of the OpenRouter chat completions API.
+
+Serves `/api/v1/chat/completions` with both regular JSON and server-sent
+event (SSE) streaming responses, so the summarizer can be load-tested
+without network access or API spend. Behaviour is configurable:
+
+- latency: time-to-first-token drawn from a distribution (fixed, uniform,
+  normal, lognormal or exponential) plus a per-token delay
+- errors: a share of requests fail with a 5xx status
+- rate limits: a server-side requests-per-minute bucket that answers
+  429 with Retry-After and X-RateLimit-* headers, like OpenRouter
+
+The reply is built from the sentences of the article in the prompt and is
+deliberately longer than the 50-70 word target, which makes early stream
+termination observable.
+
+Run:
+    python -m llm_explorer.mock_server --port 8089 --latency lognormal:0.8:0.5 --rpm 120
+
+Then point the summarizer at it:
+    OPENROUTER_API_URL=http://127.0.0.1:8089/api/v1/chat/completions
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+
+COMPLETIONS_PATH = "/api/v1/chat/completions"
+
+# Words in a generated reply (more than the summary target on purpose)
+REPLY_WORDS = 120
+
+# Delay between streamed deltas in seconds
+TOKEN_DELAY = 0.01
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Latency distribution in seconds.
+
+    Spec format (used on the command line): "kind:param1[:param2]"
+        fixed:0.5            always 0.5s
+        uniform:0.2:1.5      uniform between 0.2s and 1.5s
+        normal:0.8:0.2       mean 0.8s, stddev 0.2s (clipped at 0)
+        lognormal:0.8:0.5    median 0.8s, sigma 0.5 (long tail)
+        exponential:0.8      mean 0.8s
+    """
+
+    kind: str = "fixed"
+    params: List[float] = field(default_factory=lambda: [0.0])
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, *raw = spec.split(":")
+        if kind not in cls.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}. Expected one of {cls.KINDS}")
+        params = [float(p) for p in raw] or [0.0]
+        return cls(kind=kind, params=params)
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        second = p[1] if len(p) > 1 else None
+
+        if self.kind == "uniform":
+            value = rng.uniform(p[0], second if second is not None else p[0])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], second or 0.0)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(max(p[0], 1e-6)), second or 0.5)
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        else:
+            value = p[0]
+
+        return max(0.0, value)
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour of the mock server."""
+
+    # Time to first token (or to the full JSON response)
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+
+    # Delay between streamed deltas (also paid per word by JSON responses)
+    token_delay: float = TOKEN_DELAY
+
+    # Share of requests answered with a 5xx error (0.0 - 1.0)
+    error_rate: float = 0.0
+    error_status: int = 502
+
+    # Server-side requests-per-minute limit (0 disables rate limiting)
+    requests_per_minute: int = 0
+
+    # Advertised tokens-per-minute limit (headers only)
+    tokens_per_minute: int = 0
+
+    # Seed for reproducible runs
+    seed: Optional[int] = None
+
+
+class _RequestBucket:
+    """Token bucket enforcing the mock's requests-per-minute limit."""
+
+    def __init__(self, requests_per_minute: int) -> None:
+        self.capacity = float(requests_per_minute)
+        self.level = float(requests_per_minute)
+        self.refill_per_second = requests_per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """Take one request; return 0.0 on success, else seconds until one is free."""
+        now = time.monotonic()
+        self.level = min(
+            self.capacity, self.level + (now - self.updated_at) * self.refill_per_second
+        )
+        self.updated_at = now
+        if self.level >= 1.0:
+            self.level -= 1.0
+            return 0.0
+        return (1.0 - self.level) / self.refill_per_second
+
+
+def _build_reply(messages: List[Dict[str, Any]], max_words: int = REPLY_WORDS) -> str:
+    """Build a deterministic reply from the last user message."""
+    content = ""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content", "")
+            break
+
+    # Use the article part of the prompt if present
+    parts = re.split(r"^(?:Article|Segment|Segment summaries):\s*$", content, flags=re.M)
+    sentences = re.split(r"(?<=[.!?])\s+", parts[-1].strip())
+
+    words: List[str] = []
+    for sentence in sentences:
+        words.extend(sentence.split())
+        if len(words) >= max_words:
+            break
+
+    if not words:
+        words = ["Summary", "unavailable."]
+
+    return " ".join(words[:max_words])
+
+
+def _usage(messages: List[Dict[str, Any]], reply: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    completion_tokens = max(1, len(reply) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _rate_limit_headers(app: web.Application) -> Dict[str, str]:
+    config: MockServerConfig = app["config"]
+    bucket: Optional[_RequestBucket] = app["bucket"]
+
+    headers: Dict[str, str] = {}
+    if bucket is not None:
+        missing = max(0.0, bucket.capacity - bucket.level)
+        reset_ms = int((time.time() + missing / bucket.refill_per_second) * 1000)
+        headers.update(
+            {
+                "X-RateLimit-Limit": str(config.requests_per_minute),
+                "X-RateLimit-Remaining": str(int(bucket.level)),
+                "X-RateLimit-Reset": str(reset_ms),
+            }
+        )
+    if config.tokens_per_minute:
+        headers["x-ratelimit-limit-tokens"] = str(config.tokens_per_minute)
+    return headers
+
+
+async def _stream_reply(
+    request: web.Request, completion_id: str, model: str, reply: str, usage: Dict[str, int]
+) -> web.StreamResponse:
+    config: MockServerConfig = request.app["config"]
+
+    response = web.StreamResponse(
+        headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            **_rate_limit_headers(request.app),
+        }
+    )
+    await response.prepare(request)
+
+    # OpenRouter sends keep-alive comments while the model warms up
+    await response.write(b": OPENROUTER PROCESSING\n\n")
+
+    words = reply.split(" ")
+    try:
+        for i, word in enumerate(words):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": word if i == 0 else f" {word}"},
+                        "finish_reason": None,
+                    }
+                ],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(config.token_delay)
+
+        final = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+        await response.write(f"data: {json.dumps(final)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        request.app["stats"]["completed"] += 1
+
+    except ConnectionResetError:
+        # Client hung up early (e.g. early stop) - stop "generating"
+        request.app["stats"]["cancelled"] += 1
+        logging.getLogger("MockOpenRouter").debug(f"Stream {completion_id} closed by client")
+
+    return response
+
+
+async def chat_completions(request: web.Request) -> web.StreamResponse:
+    """Handle POST /api/v1/chat/completions."""
+    app = request.app
+    config: MockServerConfig = app["config"]
+    rng: random.Random = app["rng"]
+    stats: Dict[str, int] = app["stats"]
+
+    stats["requests"] += 1
+
+    bucket: Optional[_RequestBucket] = app["bucket"]
+    if bucket is not None:
+        retry_after = bucket.take()
+        if retry_after > 0:
+            stats["rate_limited"] += 1
+            return web.json_response(
+                {"error": {"code": 429, "message": "Rate limit exceeded"}},
+                status=429,
+                headers={
+                    **_rate_limit_headers(app),
+                    "X-RateLimit-Remaining": "0",
+                    "Retry-After": f"{retry_after:.2f}",
+                },
+            )
+
+    payload = await request.json()
+
+    messages = payload.get("messages") or []
+    model = payload.get("model") or "mock/model"
+    max_tokens = int(payload.get("max_tokens") or REPLY_WORDS * 2)
+
+    # Time to first token
+    await asyncio.sleep(config.latency.sample(rng))
+
+    if config.error_rate and rng.random() < config.error_rate:
+        stats["errors"] += 1
+        return web.json_response(
+            {"error": {"code": config.error_status, "message": "Mock upstream error"}},
+            status=config.error_status,
+        )
+
+    reply = _build_reply(messages, max_words=min(REPLY_WORDS, max_tokens))
+    usage = _usage(messages, reply)
+    completion_id = f"gen-{uuid.uuid4().hex[:24]}"
+
+    if payload.get("stream"):
+        return await _stream_reply(request, completion_id, model, reply, usage)
+
+    # Non-streaming responses still pay for generating every token
+    await asyncio.sleep(config.token_delay * len(reply.split()))
+    stats["completed"] += 1
+
+    return web.json_response(
+        {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": usage,
+        },
+        headers=_rate_limit_headers(app),
+    )
+
+
+async def server_stats(request: web.Request) -> web.Response:
+    """Handle GET /stats - request counters for load-test reports."""
+    return web.json_response(request.app["stats"])
+
+
+def create_app(config: Optional[MockServerConfig] = None) -> web.Application:
+    """
+    Create the mock server application.
+
+    Args:
+        config: Behaviour of the server (default: no latency, errors or limits).
+    """
+    config = config or MockServerConfig()
+
+    app = web.Application()
+    app["config"] = config
+    app["rng"] = random.Random(config.seed)
+    app["bucket"] = (
+        _RequestBucket(config.requests_per_minute) if config.requests_per_minute else None
+    )
+    app["stats"] = {
+        "requests": 0,
+        "completed": 0,
+        "cancelled": 0,
+        "errors": 0,
+        "rate_limited": 0,
+    }
+
+    app.router.add_post(COMPLETIONS_PATH, chat_completions)
+    app.router.add_get("/stats", server_stats)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock OpenRouter chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Time-to-first-token distribution, e.g. lognormal:0.8:0.5",
+    )
+    parser.add_argument("--token-delay", type=float, default=TOKEN_DELAY)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=502)
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="Advertised tokens per minute")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockServerConfig(
+        latency=LatencyDistribution.parse(args.latency),
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        seed=args.seed,
+    )
+
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
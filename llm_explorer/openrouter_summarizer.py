@@ -6,19 +6,23 @@ Cost-effective approach using quality open-source models.
 """
 
 import asyncio
+import json
 import logging
 import re
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
 from tenacity import (
-    retry,
+    AsyncRetrying,
     retry_if_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
 
+from llm_explorer.accounting import CallUsage, UsageAccountant, get_accountant
 from llm_explorer.base_summarizer import BaseSummarizer, SummarizationError
+from llm_explorer.rate_limiter import RateLimiter, estimate_tokens, get_rate_limiter
 from config.env import get_env
 
 
@@ -51,13 +55,32 @@ class OpenRouterSummarizer(BaseSummarizer):
     # Maximum retries for failed requests (with exponential backoff)
     MAX_RETRIES = 3
 
-    def __init__(self, model: Optional[str] = None) -> None:
+    # Lower end of the 50-70 word target; streamed summaries stop at the
+    # first sentence boundary once this many words have arrived
+    SUMMARY_MIN_WORDS = 50
+
+    # Sentence end followed by whitespace (so "3." in "3.5" is not a boundary)
+    SENTENCE_BOUNDARY = re.compile(r"[.!?][\"')\]]?(?=\s)")
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        api_url: Optional[str] = None,
+        accountant: Optional[UsageAccountant] = None,
+    ) -> None:
         """
         Initialize OpenRouter summarizer.
 
         Args:
             model: Optional model identifier. Defaults to Llama 3.1 70B.
                    See https://openrouter.ai/models for available models.
+            rate_limiter: Optional rate limiter. Defaults to the process-wide
+                          limiter shared by every OpenRouter summarizer.
+            api_url: Optional chat completions endpoint. Defaults to the
+                     OPENROUTER_API_URL env var or API_URL (e.g. point it at
+                     llm_explorer.mock_server for load tests).
+            accountant: Optional usage accountant. Defaults to the process-wide one.
         """
         super().__init__()
 
@@ -73,10 +96,21 @@ class OpenRouterSummarizer(BaseSummarizer):
         self._model = model or get_env("OPENROUTER_MODEL", default=self.DEFAULT_MODEL)
         self._model_name = self._model
 
+        self._api_url = api_url or get_env("OPENROUTER_API_URL", default=self.API_URL)
+
+        # Stream completions over SSE (enables TTFT measurement and early stop)
+        self._stream = get_env("OPENROUTER_STREAM", default="false").lower() in ("1", "true", "yes")
+
         self._logger.info(
-            f"OpenRouter summarizer initialized with model: {self._model}"
+            f"OpenRouter summarizer initialized with model: {self._model} ({self._api_url})"
         )
 
+        # Client-side limiter, shared across summarizers (and processes if configured)
+        self._rate_limiter = rate_limiter or get_rate_limiter()
+
+        # Token, latency and cost accounting for every call
+        self._accountant = accountant or get_accountant()
+
         # Create aiohttp session (will be created on first use)
         self._session: Optional[aiohttp.ClientSession] = None
 
@@ -144,11 +178,13 @@ class OpenRouterSummarizer(BaseSummarizer):
                     "content": "You are a professional news editor specializing in concise, factual summaries.",
                 },
                 {"role": "user", "content": prompt},
-            ]
+            ],
+            word_limit=self.SUMMARY_MIN_WORDS,
+            kind="summary",
         )
 
         if response:
-            print(response)
+            self._logger.debug(f"API response: {response}")
             summary = self._extract_summary(response)
             self._logger.info(
                 f"Summary generated: {len(summary.split())} words from {len(article.split())} words"
@@ -203,7 +239,8 @@ class OpenRouterSummarizer(BaseSummarizer):
                     "content": "Extract key information from this article segment in 2-3 sentences.",
                 },
                 {"role": "user", "content": prompt},
-            ]
+            ],
+            kind="chunk",
         )
 
         return self._extract_summary(response) if response else None
@@ -224,20 +261,77 @@ Segment summaries:
                     "content": "You are a news editor creating a final summary from partial summaries.",
                 },
                 {"role": "user", "content": prompt},
-            ]
+            ],
+            word_limit=self.SUMMARY_MIN_WORDS,
+            kind="synthesis",
         )
 
         return self._extract_summary(response) if response else None
 
-    @retry(
-        retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     async def _call_api(
-        self, messages: List[Dict[str, str]]
+        self,
+        messages: List[Dict[str, str]],
+        word_limit: Optional[int] = None,
+        kind: str = "summary",
     ) -> Optional[Dict[str, Any]]:
-        """Call OpenRouter API with retry logic and exponential backoff."""
+        """
+        Call OpenRouter API with retry logic and exponential backoff.
+
+        Records tokens, latency, retries and cost of the call with the
+        usage accountant.
+
+        Args:
+            messages: Chat messages to send.
+            word_limit: When streaming, stop generation at the first sentence
+                        boundary after this many words. Ignored otherwise.
+            kind: Call type for accounting ("summary", "chunk" or "synthesis").
+
+        Returns:
+            The completion in the (non-streaming) chat completion format.
+        """
+        start = time.perf_counter()
+        attempts = 0
+        data: Optional[Dict[str, Any]] = None
+
+        try:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
+                stop=stop_after_attempt(self.MAX_RETRIES),
+                wait=wait_exponential(multiplier=1, min=2, max=10),
+            ):
+                with attempt:
+                    attempts = attempt.retry_state.attempt_number
+                    data = await self._send_request(messages, word_limit)
+        finally:
+            self._record_usage(kind, data, time.perf_counter() - start, attempts)
+
+        return data
+
+    def _record_usage(
+        self, kind: str, data: Optional[Dict[str, Any]], latency: float, attempts: int
+    ) -> None:
+        """Record a finished (or failed) call with the usage accountant."""
+        usage = (data or {}).get("usage") or {}
+
+        self._accountant.record_call(
+            CallUsage(
+                model=(data or {}).get("model") or self._model,
+                kind=kind,
+                prompt_tokens=int(usage.get("prompt_tokens") or 0),
+                completion_tokens=int(usage.get("completion_tokens") or 0),
+                latency=latency,
+                retries=max(0, attempts - 1),
+                cost=usage.get("cost"),
+                succeeded=data is not None,
+                streamed=bool((data or {}).get("streamed")),
+                time_to_first_token=(data or {}).get("time_to_first_token"),
+            )
+        )
+
+    async def _send_request(
+        self, messages: List[Dict[str, str]], word_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Send a single completion request (one retry attempt)."""
         session = await self._get_session()
 
         headers = {
@@ -251,27 +345,188 @@ Segment summaries:
             "messages": messages,
             "max_tokens": self.MAX_SUMMARY_TOKENS,
             "temperature": 0.3,  # Lower temperature for more factual output
-            "disable_reasoning": True
+            "disable_reasoning": True,
+            "usage": {"include": True},  # Return token counts and cost
         }
 
+        # Wait for capacity instead of sending a request that is certain to be rejected
+        estimated_tokens = estimate_tokens(messages, self.MAX_SUMMARY_TOKENS)
+        await self._rate_limiter.acquire(estimated_tokens)
 
         try:
-            async with session.post(self.API_URL, headers=headers, json=payload) as response:
-                response.raise_for_status()
-                return await response.json()
+            if self._stream:
+                data = await self._stream_completion(session, headers, payload, word_limit)
+            else:
+                async with session.post(self._api_url, headers=headers, json=payload) as response:
+                    await self._rate_limiter.observe(response.status, response.headers)
+                    response.raise_for_status()
+                    data = await response.json()
+
+            usage = data.get("usage") or {}
+            await self._rate_limiter.refund(estimated_tokens, usage.get("total_tokens"))
+
+            return data
 
         except aiohttp.ClientResponseError as e:
+            # nothing was generated: give the reservation back before the retry takes another
+            await self._rate_limiter.refund(estimated_tokens)
             if e.status == 429:  # Rate limit
-                self._logger.warning(f"Rate limited, will retry with backoff")
+                self._logger.warning("Rate limited, will retry once the limiter allows")
                 raise  # Let tenacity handle retry with backoff
             else:
                 self._logger.error(f"HTTP error: {e.status}")
                 raise
 
         except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            await self._rate_limiter.refund(estimated_tokens)
             self._logger.warning(f"Request failed: {str(e)}, will retry with backoff")
             raise  # Let tenacity handle retry with backoff
 
+    async def _stream_completion(
+        self,
+        session: aiohttp.ClientSession,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        word_limit: Optional[int],
+    ) -> Dict[str, Any]:
+        """
+        Request a streamed completion and assemble the SSE deltas.
+
+        Closes the connection as soon as the text reaches a sentence boundary
+        past `word_limit`, which makes the provider stop generating.
+
+        Returns:
+            A dict shaped like a non-streaming completion, plus `streamed`,
+            `stopped_early` and `time_to_first_token` keys.
+        """
+        start = time.perf_counter()
+        time_to_first_token: Optional[float] = None
+
+        parts: List[str] = []
+        usage: Optional[Dict[str, Any]] = None
+        model = payload["model"]
+        finish_reason: Optional[str] = None
+        stopped_early = False
+
+        async with session.post(
+            self._api_url, headers=headers, json={**payload, "stream": True}
+        ) as response:
+            await self._rate_limiter.observe(response.status, response.headers)
+            response.raise_for_status()
+
+            async for data in self._iter_sse_data(response.content):
+                if data == "[DONE]":
+                    break
+
+                chunk = json.loads(data)
+
+                if "error" in chunk:
+                    raise aiohttp.ClientPayloadError(f"Stream error: {chunk['error']}")
+
+                model = chunk.get("model", model)
+                usage = chunk.get("usage") or usage
+
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+
+                delta = (choices[0].get("delta") or {}).get("content") or ""
+                finish_reason = choices[0].get("finish_reason") or finish_reason
+
+                if not delta:
+                    continue
+
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - start
+                    self._logger.debug(f"Time to first token: {time_to_first_token:.3f}s")
+
+                parts.append(delta)
+
+                if word_limit:
+                    cut = self._early_stop_point("".join(parts), word_limit)
+                    if cut is not None:
+                        parts = ["".join(parts)[:cut]]
+                        finish_reason = "early_stop"
+                        stopped_early = True
+                        # Drop the connection so the provider stops generating
+                        response.close()
+                        break
+
+        content = "".join(parts)
+
+        if usage is None:
+            # Early stop means the provider never sent its usage block
+            prompt_tokens = estimate_tokens(payload["messages"])
+            completion_tokens = max(1, len(content) // 4)
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "estimated": True,
+            }
+
+        self._logger.info(
+            f"Streamed {len(content.split())} words in {time.perf_counter() - start:.2f}s "
+            f"(ttft: {time_to_first_token or 0:.2f}s, early stop: {stopped_early})"
+        )
+
+        return {
+            "model": model,
+            "choices": [
+                {
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": usage,
+            "streamed": True,
+            "stopped_early": stopped_early,
+            "time_to_first_token": time_to_first_token,
+        }
+
+    @staticmethod
+    async def _iter_sse_data(stream: aiohttp.StreamReader) -> AsyncIterator[str]:
+        """Yield the `data` payload of each server-sent event."""
+        data_lines: List[str] = []
+
+        async for raw_line in stream:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+
+            if not line:
+                # Blank line terminates an event
+                if data_lines:
+                    yield "\n".join(data_lines)
+                    data_lines = []
+                continue
+
+            if line.startswith(":"):
+                # Comment / keep-alive (e.g. ": OPENROUTER PROCESSING")
+                continue
+
+            field, _, value = line.partition(":")
+            if field == "data":
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+
+        if data_lines:
+            yield "\n".join(data_lines)
+
+    def _early_stop_point(self, text: str, min_words: int) -> Optional[int]:
+        """
+        Find where a streamed summary can be cut.
+
+        Returns:
+            Index just past the first sentence boundary after `min_words`
+            words, or None if the text should keep streaming.
+        """
+        if len(text.split()) < min_words:
+            return None
+
+        for match in self.SENTENCE_BOUNDARY.finditer(text):
+            if len(text[: match.end()].split()) >= min_words:
+                return match.end()
+
+        return None
+
     def _extract_summary(self, response: Dict[str, Any]) -> Optional[str]:
         """Extract summary text from API response."""
         try:
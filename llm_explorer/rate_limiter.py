@@ -0,0 +1,510 @@
+"""
+Client-side rate limiting for OpenRouter API calls.
+
+Keeps two token buckets - requests per minute and tokens per minute - whose
+limits are learned from the rate-limit headers returned by the API and from
+Retry-After on 429 responses. The bucket state can be kept in a local SQLite
+file so that every worker process on the host draws from the same budget
+instead of each one backing off on its own.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Any, Mapping, Optional
+
+from config.env import get_env
+
+
+@dataclass
+class TokenBucket:
+    """
+    A refilling token bucket.
+
+    A capacity of 0 means the limit is unknown and the bucket never blocks.
+    """
+
+    capacity: float = 0.0
+    refill_per_second: float = 0.0
+    level: float = 0.0
+    updated_at: float = 0.0
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        if self.capacity <= 0:
+            return
+        elapsed = max(0.0, now - self.updated_at)
+        self.level = min(self.capacity, self.level + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0.0 if available now)."""
+        if self.capacity <= 0:
+            return 0.0
+        # Never ask for more than a full bucket, or we would wait forever
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return (amount - self.level) / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        """Remove tokens from the bucket (level may go negative for large requests)."""
+        if self.capacity > 0:
+            self.level -= amount
+
+    def set_limit(self, limit: float, window_seconds: float, now: float) -> None:
+        """Apply a (possibly new) limit per window, keeping the current level."""
+        self.refill(now)
+        if self.capacity <= 0:
+            self.level = limit
+        self.capacity = limit
+        self.refill_per_second = limit / window_seconds
+        self.level = min(self.level, limit)
+        self.updated_at = now
+
+
+@dataclass
+class RateLimitState:
+    """Complete limiter state; this is what gets shared between processes."""
+
+    requests: TokenBucket = field(default_factory=TokenBucket)
+    tokens: TokenBucket = field(default_factory=TokenBucket)
+    blocked_until: float = 0.0
+
+    def reserve(self, tokens: int, now: float) -> float:
+        """
+        Reserve one request and `tokens` tokens.
+
+        Returns:
+            0.0 if the reservation was made, otherwise the seconds to wait
+            before trying again.
+        """
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+        wait = max(
+            self.blocked_until - now,
+            self.requests.wait_time(1),
+            self.tokens.wait_time(tokens),
+        )
+        if wait > 0:
+            return wait
+
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        return 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RateLimitState":
+        data = json.loads(raw)
+        return cls(
+            requests=TokenBucket(**data["requests"]),
+            tokens=TokenBucket(**data["tokens"]),
+            blocked_until=data["blocked_until"],
+        )
+
+
+@dataclass
+class RateLimitUpdate:
+    """Limits parsed from a single API response."""
+
+    requests_limit: Optional[float] = None
+    requests_remaining: Optional[float] = None
+    tokens_limit: Optional[float] = None
+    tokens_remaining: Optional[float] = None
+    blocked_until: Optional[float] = None
+
+    def apply(self, state: RateLimitState, window_seconds: float, now: float) -> None:
+        """Fold the parsed limits into `state`."""
+        if self.requests_limit:
+            state.requests.set_limit(self.requests_limit, window_seconds, now)
+        if self.requests_remaining is not None and state.requests.capacity > 0:
+            state.requests.refill(now)
+            state.requests.level = min(state.requests.level, self.requests_remaining)
+
+        if self.tokens_limit:
+            state.tokens.set_limit(self.tokens_limit, window_seconds, now)
+        if self.tokens_remaining is not None and state.tokens.capacity > 0:
+            state.tokens.refill(now)
+            state.tokens.level = min(state.tokens.level, self.tokens_remaining)
+
+        if self.blocked_until:
+            state.blocked_until = max(state.blocked_until, self.blocked_until)
+
+
+class RateLimitStore(ABC):
+    """Storage for `RateLimitState` with atomic read-modify-write."""
+
+    @abstractmethod
+    def reserve(self, tokens: int, now: float) -> float:
+        """Atomically reserve capacity, returning seconds to wait (0.0 on success)."""
+        pass
+
+    @abstractmethod
+    def update(self, update: RateLimitUpdate, window_seconds: float, now: float) -> None:
+        """Atomically apply limits learned from a response."""
+        pass
+
+    @abstractmethod
+    def refund_tokens(self, tokens: float, now: float) -> None:
+        """Return over-estimated tokens to the token bucket."""
+        pass
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Per-process store; used when no shared store path is configured."""
+
+    def __init__(self) -> None:
+        self._state = RateLimitState()
+        self._lock = Lock()
+
+    def reserve(self, tokens: int, now: float) -> float:
+        with self._lock:
+            return self._state.reserve(tokens, now)
+
+    def update(self, update: RateLimitUpdate, window_seconds: float, now: float) -> None:
+        with self._lock:
+            update.apply(self._state, window_seconds, now)
+
+    def refund_tokens(self, tokens: float, now: float) -> None:
+        with self._lock:
+            bucket = self._state.tokens
+            bucket.refill(now)
+            bucket.level = min(bucket.capacity, bucket.level + tokens)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Store shared by all processes on the host through a SQLite file.
+
+    Each operation runs in a `BEGIN IMMEDIATE` transaction, which takes the
+    database write lock, so concurrent workers never double-spend a bucket.
+    """
+
+    def __init__(self, path: str, key: str = "openrouter") -> None:
+        self._path = path
+        self._key = key
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_state (key TEXT PRIMARY KEY, state TEXT NOT NULL)"
+        )
+
+    def _transaction(self, mutate) -> Any:
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                row = cursor.execute(
+                    "SELECT state FROM rate_limit_state WHERE key = ?", (self._key,)
+                ).fetchone()
+                state = RateLimitState.from_json(row[0]) if row else RateLimitState()
+
+                result = mutate(state)
+
+                cursor.execute(
+                    "INSERT OR REPLACE INTO rate_limit_state (key, state) VALUES (?, ?)",
+                    (self._key, state.to_json()),
+                )
+                cursor.execute("COMMIT")
+                return result
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def reserve(self, tokens: int, now: float) -> float:
+        return self._transaction(lambda state: state.reserve(tokens, now))
+
+    def update(self, update: RateLimitUpdate, window_seconds: float, now: float) -> None:
+        self._transaction(lambda state: update.apply(state, window_seconds, now))
+
+    def refund_tokens(self, tokens: float, now: float) -> None:
+        def refund(state: RateLimitState) -> None:
+            state.tokens.refill(now)
+            state.tokens.level = min(state.tokens.capacity, state.tokens.level + tokens)
+
+        self._transaction(refund)
+
+
+class RateLimiter:
+    """
+    Async rate limiter for API calls.
+
+    Usage:
+        await limiter.acquire(estimated_tokens)
+        ... send request ...
+        await limiter.observe(response.status, response.headers)
+        await limiter.refund(estimated_tokens, actual_tokens)
+
+    Store operations run in a worker thread: the shared SQLite store may
+    wait up to its busy timeout for the file lock, which must not stall the
+    event loop.
+    """
+
+    # Default window the learned limits apply to (OpenRouter limits are per minute)
+    WINDOW_SECONDS = 60.0
+
+    # Upper bound for a single sleep so that newly learned limits are picked up quickly
+    MAX_SLEEP_SECONDS = 5.0
+
+    def __init__(
+        self,
+        store: Optional[RateLimitStore] = None,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        window_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the rate limiter.
+
+        Args:
+            store: Where bucket state lives. Defaults to an in-process store.
+            requests_per_minute: Initial RPM limit; 0 means learn it from headers.
+            tokens_per_minute: Initial TPM limit; 0 means learn it from headers.
+            window_seconds: Window the limits apply to (default 60s).
+        """
+        self._logger = logging.getLogger("RateLimiter")
+        self._store = store or InMemoryRateLimitStore()
+        self._window = window_seconds or self.WINDOW_SECONDS
+
+        if requests_per_minute or tokens_per_minute:
+            self._store.update(
+                RateLimitUpdate(
+                    requests_limit=requests_per_minute or None,
+                    tokens_limit=tokens_per_minute or None,
+                ),
+                self._window,
+                time.time(),
+            )
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request and `tokens` tokens can be sent.
+
+        Returns:
+            Total seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._store.reserve, tokens, time.time())
+            if wait <= 0:
+                if waited > 0:
+                    self._logger.debug(f"Rate limiter delayed request by {waited:.2f}s")
+                return waited
+
+            sleep_for = min(wait, self.MAX_SLEEP_SECONDS)
+            waited += sleep_for
+            await asyncio.sleep(sleep_for)
+
+    async def observe(self, status: int, headers: Mapping[str, str]) -> RateLimitUpdate:
+        """
+        Learn limits from a response.
+
+        Args:
+            status: HTTP status code of the response.
+            headers: Response headers.
+
+        Returns:
+            The parsed update (mostly useful for logging and tests).
+        """
+        now = time.time()
+        update = parse_rate_limit_headers(headers, now)
+
+        if status == 429 and update.blocked_until is None:
+            # Rejected without any hint - pause briefly rather than hammering the API
+            update.blocked_until = now + 1.0
+
+        if status == 429:
+            self._logger.warning(
+                f"Rate limited, pausing all workers for "
+                f"{max(0.0, (update.blocked_until or now) - now):.1f}s"
+            )
+
+        await asyncio.to_thread(self._store.update, update, self._window, now)
+        return update
+
+    async def refund(self, estimated_tokens: int, actual_tokens: Optional[int] = None) -> None:
+        """
+        Return reserved tokens that were not used.
+
+        Args:
+            estimated_tokens: Tokens reserved with `acquire`.
+            actual_tokens: Tokens the API reported. None (a 429, a transport
+                           error, a response without usage) returns the
+                           whole reservation, so failed attempts and their
+                           retries do not use up the TPM budget.
+        """
+        unused = estimated_tokens if actual_tokens is None else estimated_tokens - actual_tokens
+        if unused <= 0:
+            return
+        await asyncio.to_thread(self._store.refund_tokens, unused, time.time())
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[str]:
+    lowered = {k.lower(): v for k, v in headers.items()}
+    for name in names:
+        value = lowered.get(name.lower())
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse durations such as "20ms", "1.5s" or "6m0s" into seconds."""
+    total = 0.0
+    number = ""
+    i = 0
+    units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    while i < len(value):
+        ch = value[i]
+        if ch.isdigit() or ch == ".":
+            number += ch
+            i += 1
+            continue
+        unit = "ms" if value[i : i + 2] == "ms" else ch
+        if unit not in units or not number:
+            return None
+        total += float(number) * units[unit]
+        number = ""
+        i += len(unit)
+    if number:
+        total += float(number)
+    return total
+
+
+def _parse_reset(value: Optional[str], now: float) -> Optional[float]:
+    """Parse a reset header into an absolute epoch timestamp."""
+    if value is None:
+        return None
+
+    number = _to_float(value)
+    if number is not None:
+        # OpenRouter sends an epoch in milliseconds; fall back to epoch seconds
+        # and finally to a relative number of seconds.
+        if number > 1e12:
+            return number / 1000.0
+        if number > 1e9:
+            return number
+        return now + number
+
+    duration = _parse_duration(value)
+    return now + duration if duration is not None else None
+
+
+def _parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """Parse Retry-After (delta seconds or HTTP date) into an absolute timestamp."""
+    if value is None:
+        return None
+
+    seconds = _to_float(value)
+    if seconds is not None:
+        return now + seconds
+
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str], now: Optional[float] = None) -> RateLimitUpdate:
+    """
+    Extract rate-limit information from response headers.
+
+    Understands OpenRouter's `X-RateLimit-Limit/Remaining/Reset`, the
+    OpenAI-style `x-ratelimit-*-requests` / `x-ratelimit-*-tokens` variants
+    and `Retry-After`.
+    """
+    now = now if now is not None else time.time()
+
+    update = RateLimitUpdate(
+        requests_limit=_to_float(
+            _header(headers, "x-ratelimit-limit-requests", "x-ratelimit-limit")
+        ),
+        requests_remaining=_to_float(
+            _header(headers, "x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+        ),
+        tokens_limit=_to_float(_header(headers, "x-ratelimit-limit-tokens")),
+        tokens_remaining=_to_float(_header(headers, "x-ratelimit-remaining-tokens")),
+    )
+
+    blocked_until = _parse_retry_after(_header(headers, "retry-after"), now)
+
+    # An exhausted bucket is blocked until its reset time
+    if update.requests_remaining is not None and update.requests_remaining <= 0:
+        reset = _parse_reset(
+            _header(headers, "x-ratelimit-reset-requests", "x-ratelimit-reset"), now
+        )
+        blocked_until = max(filter(None, [blocked_until, reset]), default=None)
+    if update.tokens_remaining is not None and update.tokens_remaining <= 0:
+        reset = _parse_reset(_header(headers, "x-ratelimit-reset-tokens"), now)
+        blocked_until = max(filter(None, [blocked_until, reset]), default=None)
+
+    if blocked_until is not None and blocked_until > now:
+        update.blocked_until = blocked_until
+
+    return update
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide rate limiter for OpenRouter.
+
+    Environment Variables:
+        OPENROUTER_RATE_LIMIT_STORE: Path to a SQLite file shared by all workers
+                                     on the host (optional, in-process if unset).
+        OPENROUTER_RPM_LIMIT:        Initial requests-per-minute limit (optional).
+        OPENROUTER_TPM_LIMIT:        Initial tokens-per-minute limit (optional).
+    """
+    global _shared_limiter
+
+    if _shared_limiter is not None:
+        return _shared_limiter
+
+    with _shared_lock:
+        if _shared_limiter is None:
+            store_path = get_env("OPENROUTER_RATE_LIMIT_STORE")
+            store: RateLimitStore = (
+                SQLiteRateLimitStore(store_path) if store_path else InMemoryRateLimitStore()
+            )
+
+            _shared_limiter = RateLimiter(
+                store=store,
+                requests_per_minute=float(get_env("OPENROUTER_RPM_LIMIT", default="0")),
+                tokens_per_minute=float(get_env("OPENROUTER_TPM_LIMIT", default="0")),
+            )
+
+    return _shared_limiter
+
+
+def estimate_tokens(messages: Any, max_output_tokens: int = 0) -> int:
+    """Rough token estimate (~4 characters per token) for TPM accounting."""
+    if isinstance(messages, list):
+        chars = sum(len(m.get("content", "")) for m in messages if isinstance(m, dict))
+    else:
+        chars = len(str(messages))
+    return chars // 4 + max_output_tokens
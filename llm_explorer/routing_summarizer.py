@@ -0,0 +1,275 @@
+"""
+Model routing for OpenRouter summarization.
+
+Routes each article to the cheapest model that can handle it and protects
+tail latency with hedged requests:
+
+1. Cascade: short articles go to a cheap, fast model first. If that call
+   fails or the summary looks low quality, the article escalates to the
+   primary model.
+2. Hedging: once a primary call runs longer than a latency percentile of
+   recent primary calls, a duplicate request is fired at a secondary model.
+   Whichever finishes first with an acceptable summary wins and the other
+   request is cancelled.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+from config.env import get_env
+from llm_explorer.base_summarizer import BaseSummarizer, SummarizationError
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedging delay."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the `pct` percentile of recorded latencies, or None if empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class RoutingSummarizer(BaseSummarizer):
+    """
+    Summarizer that cascades between models and hedges slow requests.
+
+    Wraps other `BaseSummarizer` instances, so any backend can take part in
+    the cascade.
+    """
+
+    # Articles shorter than this (in characters) try the fast model first
+    SHORT_ARTICLE_CHARS = 4000
+
+    # Articles this short are returned as-is by the summarizers, skip routing
+    PASSTHROUGH_CHARS = 500
+
+    # Acceptable summary length in words (target is 50-70)
+    MIN_SUMMARY_WORDS = 25
+    MAX_SUMMARY_WORDS = 120
+
+    # Phrases that indicate the model refused or misunderstood the task
+    REJECT_PHRASES = ("i'm sorry", "i cannot", "as an ai", "i can't")
+
+    # Hedge once the primary call is slower than this percentile of recent calls
+    HEDGE_PERCENTILE = 95.0
+
+    # Samples required before the percentile is trusted
+    HEDGE_MIN_SAMPLES = 20
+
+    # Hedging delay used until enough samples have been collected
+    HEDGE_DEFAULT_DELAY = 10.0
+
+    def __init__(
+        self,
+        primary: BaseSummarizer,
+        fast: Optional[BaseSummarizer] = None,
+        hedge: Optional[BaseSummarizer] = None,
+        short_article_chars: Optional[int] = None,
+        hedge_percentile: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the routing summarizer.
+
+        Args:
+            primary: Summarizer used for long articles and escalations.
+            fast: Optional cheap summarizer tried first for short articles.
+            hedge: Optional secondary summarizer used for hedged requests.
+            short_article_chars: Override for SHORT_ARTICLE_CHARS.
+            hedge_percentile: Override for HEDGE_PERCENTILE.
+        """
+        super().__init__()
+
+        self._logger = logging.getLogger("RoutingSummarizer")
+
+        self._primary = primary
+        self._fast = fast
+        self._hedge = hedge
+
+        self._short_article_chars = short_article_chars or self.SHORT_ARTICLE_CHARS
+        self._hedge_percentile = hedge_percentile or self.HEDGE_PERCENTILE
+
+        self._primary_latency = LatencyTracker()
+
+        names = [f"fast={fast.get_model_name()}"] if fast else []
+        names.append(f"primary={primary.get_model_name()}")
+        if hedge:
+            names.append(f"hedge={hedge.get_model_name()}")
+        self._model_name = f"routing({', '.join(names)})"
+
+    async def close(self) -> None:
+        """Close every underlying summarizer."""
+        for summarizer in self._summarizers():
+            if hasattr(summarizer, "close"):
+                await summarizer.close()
+
+    def _summarizers(self) -> List[BaseSummarizer]:
+        unique: List[BaseSummarizer] = []
+        for summarizer in (self._fast, self._primary, self._hedge):
+            if summarizer is not None and summarizer not in unique:
+                unique.append(summarizer)
+        return unique
+
+    async def summarize_article(self, article: str) -> Optional[str]:
+        """
+        Summarize an article, routing between the configured models.
+
+        Args:
+            article: The article text to summarize.
+
+        Returns:
+            Summarized article, or None if every route failed.
+
+        Raises:
+            SummarizationError: If the primary (and hedge) request failed critically.
+        """
+        article = self._ensure_string(article)
+        if not article:
+            self._logger.warning("Empty article provided for summarization")
+            return None
+
+        if len(article) < self.PASSTHROUGH_CHARS:
+            return await self._primary.summarize_article(article)
+
+        # Cascade: try the cheap model first for short articles
+        if self._fast is not None and len(article) < self._short_article_chars:
+            try:
+                summary = await self._fast.summarize_article(article)
+                if self._is_acceptable(summary):
+                    return summary
+                self._logger.info("Fast model output rejected, escalating to primary model")
+            except SummarizationError as e:
+                self._logger.warning(f"Fast model failed, escalating to primary model: {e}")
+
+        return await self._summarize_hedged(article)
+
+    def _is_acceptable(self, summary: Optional[str]) -> bool:
+        """Cheap quality gate for summaries from the fast model."""
+        if not summary:
+            return False
+
+        words = len(summary.split())
+        if words < self.MIN_SUMMARY_WORDS or words > self.MAX_SUMMARY_WORDS:
+            return False
+
+        lowered = summary.lower()
+        return not any(phrase in lowered for phrase in self.REJECT_PHRASES)
+
+    def _hedge_delay(self) -> float:
+        """Seconds to wait on the primary before firing the hedged request."""
+        if len(self._primary_latency) < self.HEDGE_MIN_SAMPLES:
+            return self.HEDGE_DEFAULT_DELAY
+        return self._primary_latency.percentile(self._hedge_percentile) or self.HEDGE_DEFAULT_DELAY
+
+    async def _timed_primary(self, article: str, hedge_delay: float) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            summary = await self._primary.summarize_article(article)
+        except asyncio.CancelledError:
+            # A hedged primary that lost took at least this long. Record it as
+            # a censored sample: leaving the slow calls out would pull the
+            # percentile down and hedge more and more requests.
+            elapsed = time.perf_counter() - start
+            if elapsed >= hedge_delay:
+                self._primary_latency.record(elapsed)
+            raise
+
+        if summary:
+            self._primary_latency.record(time.perf_counter() - start)
+        return summary
+
+    async def _summarize_hedged(self, article: str) -> Optional[str]:
+        """Run the primary request, hedging to the secondary model if it is slow."""
+        hedge_delay = self._hedge_delay()
+        primary_task = asyncio.create_task(self._timed_primary(article, hedge_delay))
+
+        if self._hedge is None:
+            return await primary_task
+
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+        except asyncio.CancelledError:
+            primary_task.cancel()
+            raise
+
+        if done and not primary_task.exception() and primary_task.result():
+            return primary_task.result()
+
+        if not done:
+            self._logger.info(
+                f"Primary model slower than p{self._hedge_percentile:g}, sending hedged request"
+            )
+
+        hedge_task = asyncio.create_task(self._hedge.summarize_article(article))
+        pending = {hedge_task} if done else {primary_task, hedge_task}
+        last_error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+
+                    if task.result():
+                        winner = "hedge" if task is hedge_task else "primary"
+                        self._logger.info(f"Hedged request won by {winner} model")
+                        return task.result()
+        finally:
+            # Cancel whichever request lost
+            for task in pending:
+                task.cancel()
+
+        if last_error is None and primary_task.done() and not primary_task.cancelled():
+            last_error = primary_task.exception()
+
+        if last_error is not None:
+            raise SummarizationError(f"All routed requests failed: {last_error}")
+
+        return None
+
+
+def create_routing_summarizer(model: Optional[str] = None) -> RoutingSummarizer:
+    """
+    Build a routing summarizer over OpenRouter models from the environment.
+
+    Environment Variables:
+        OPENROUTER_MODEL:        Primary model (optional, summarizer default otherwise).
+        OPENROUTER_FAST_MODEL:   Cheap model tried first for short articles (optional).
+        OPENROUTER_HEDGE_MODEL:  Secondary model for hedged requests (optional).
+        ROUTING_SHORT_ARTICLE_CHARS: Length below which the fast model is used.
+        ROUTING_HEDGE_PERCENTILE:    Primary latency percentile that triggers hedging.
+
+    Args:
+        model: Optional primary model identifier.
+    """
+    from llm_explorer.openrouter_summarizer import OpenRouterSummarizer
+
+    primary = OpenRouterSummarizer(model=model)
+
+    fast_model = get_env("OPENROUTER_FAST_MODEL")
+    hedge_model = get_env("OPENROUTER_HEDGE_MODEL")
+
+    return RoutingSummarizer(
+        primary=primary,
+        fast=OpenRouterSummarizer(model=fast_model) if fast_model else None,
+        hedge=OpenRouterSummarizer(model=hedge_model) if hedge_model else None,
+        short_article_chars=int(get_env("ROUTING_SHORT_ARTICLE_CHARS", default="0")) or None,
+        hedge_percentile=float(get_env("ROUTING_HEDGE_PERCENTILE", default="0")) or None,
+    )
@@ -1,7 +1,12 @@
 """
 Factory module for creating summarizer instances.
 
-Provides a simple interface for instantiating OpenRouter-based summarizers.
+Provides a simple interface for instantiating summarizers. The backend is
+selected with the SUMMARIZER_BACKEND env var:
+    - openrouter: single OpenRouter model (default)
+    - routing:    OpenRouter model cascade with hedged requests
+    - textrank:   offline extractive summarizer (NumPy, no API calls)
+    - local:      local seq2seq model (e.g. BART) from LOCAL_MODEL_PATH
 """
 
 import logging
@@ -11,9 +16,15 @@ from llm_explorer.base_summarizer import BaseSummarizer, SummarizationError
 from config.env import get_env
 
 
-def create_summarizer(model: Optional[str] = None) -> BaseSummarizer:
+# Supported values for SUMMARIZER_BACKEND
+SUMMARIZER_BACKENDS = ("openrouter", "routing", "textrank", "local")
+
+
+def create_summarizer(
+    model: Optional[str] = None, backend: Optional[str] = None
+) -> BaseSummarizer:
     """
-    Create an OpenRouter summarizer instance.
+    Create a summarizer instance.
 
     Note: The returned summarizer uses async methods. Use 'await' when calling
     summarize_article().
@@ -21,9 +32,11 @@ def create_summarizer(model: Optional[str] = None) -> BaseSummarizer:
     Args:
         model: Optional model identifier (e.g., "meta-llama/llama-3.1-70b-instruct").
                If None, uses OPENROUTER_MODEL env var or default.
+        backend: Optional backend name (see SUMMARIZER_BACKENDS).
+                 If None, uses SUMMARIZER_BACKEND env var or "openrouter".
 
     Returns:
-        Configured OpenRouterSummarizer instance.
+        Configured summarizer instance.
 
     Raises:
         SummarizationError: If initialization fails.
@@ -37,6 +50,16 @@ def create_summarizer(model: Optional[str] = None) -> BaseSummarizer:
         summarizer = create_summarizer(model="google/gemini-flash-1.5")
         summary = await summarizer.summarize_article(article_text)
 
+        # Cascade/hedge between OPENROUTER_FAST_MODEL, the primary model
+        # and OPENROUTER_HEDGE_MODEL
+        summarizer = create_summarizer(backend="routing")
+
+        # Offline extractive summaries (no network, no API key)
+        summarizer = create_summarizer(backend="textrank")
+
+        # Local BART-style model, no egress (needs the `local` extra)
+        summarizer = create_summarizer(backend="local")
+
         # Clean up when done
         await summarizer.close()
     """
@@ -46,6 +69,42 @@ def create_summarizer(model: Optional[str] = None) -> BaseSummarizer:
     if model is None:
         model = get_env("OPENROUTER_MODEL", default=None)
 
+    backend = (backend or get_env("SUMMARIZER_BACKEND", default="openrouter")).lower()
+
+    if backend not in SUMMARIZER_BACKENDS:
+        raise SummarizationError(
+            f"Unknown summarizer backend: {backend}. Expected one of {SUMMARIZER_BACKENDS}"
+        )
+
+    if backend == "textrank":
+        logger.info("Creating offline TextRank summarizer")
+
+        from llm_explorer.textrank_summarizer import TextRankSummarizer
+
+        return TextRankSummarizer()
+
+    if backend == "local":
+        logger.info("Creating local seq2seq summarizer")
+
+        from llm_explorer.local_summarizer import LocalSeq2SeqSummarizer
+
+        try:
+            return LocalSeq2SeqSummarizer()
+        except SummarizationError:
+            raise
+        except Exception as e:
+            raise SummarizationError(f"Failed to load local model: {e}")
+
+    if backend == "routing":
+        logger.info(f"Creating routing summarizer with primary model: {model or 'default'}")
+
+        try:
+            from llm_explorer.routing_summarizer import create_routing_summarizer
+
+            return create_routing_summarizer(model=model)
+        except Exception as e:
+            raise SummarizationError(f"Failed to initialize routing summarizer: {e}")
+
     logger.info(f"Creating OpenRouter summarizer with model: {model or 'default'}")
 
     try:
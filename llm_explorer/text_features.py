@@ -0,0 +1,117 @@
+"""
+Lightweight text features built on NumPy.
+
+Sentence splitting, tokenization, TF-IDF vectors and hashed n-gram
+features shared by the local (non-LLM) text processing in this package.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+# Common English function words that carry no topical signal
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down during each
+    few for from further had has have having he her here hers herself him himself his how
+    i if in into is it its itself just me more most my myself no nor not now of off on
+    once only or other our ours ourselves out over own said same says she should so some
+    such than that the their theirs them themselves then there these they this those
+    through to too under until up very was we were what when where which while who whom
+    why will with would you your yours yourself yourselves
+    """.split()
+)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|(?<=[.!?][\"')\]])\s+|\n+")
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+# Mixing constants for combining token hashes into n-gram hashes
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+_HASH_MASK = np.uint64(0xFFFFFFFFFFFF)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation and line breaks."""
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s and s.strip()]
+
+
+def tokenize(text: str, drop_stopwords: bool = True) -> List[str]:
+    """Lowercase word tokens, optionally without stopwords."""
+    tokens = _TOKEN.findall(text.lower())
+    if drop_stopwords:
+        return [t for t in tokens if t not in STOPWORDS]
+    return tokens
+
+
+def tfidf_matrix(documents: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    Build an L2-normalized TF-IDF matrix for tokenized documents.
+
+    Args:
+        documents: One token list per document (e.g. per sentence).
+
+    Returns:
+        Array of shape (n_documents, vocabulary_size). Rows for empty
+        documents are all zeros.
+    """
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    counts = np.zeros((len(documents), max(1, len(vocabulary))), dtype=np.float32)
+    if rows:
+        np.add.at(counts, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1.0 + len(documents)) / (1.0 + document_frequency)) + 1.0
+
+    weights = counts * idf.astype(np.float32)
+    return l2_normalize(weights)
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows untouched."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def hash_ngrams(
+    tokens: Sequence[str], n_features: int, ngram_max: int = 2
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash word n-grams into a fixed number of buckets.
+
+    Tokens are hashed with crc32 (stable across processes, unlike `hash`);
+    longer n-grams combine token hashes arithmetically instead of hashing
+    joined strings.
+
+    Args:
+        tokens: Word tokens.
+        n_features: Number of buckets.
+        ngram_max: Longest n-gram (1 = unigrams only).
+
+    Returns:
+        (bucket indices, counts), indices sorted and unique.
+    """
+    if not tokens:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    token_hashes = np.array([zlib.crc32(t.encode()) for t in tokens], dtype=np.uint64)
+    grams = [token_hashes]
+    combined = token_hashes
+    for n in range(2, ngram_max + 1):
+        combined = (combined[:-1] * _HASH_MULTIPLIER + token_hashes[n - 1 :]) & _HASH_MASK
+        grams.append(combined)
+
+    buckets = (np.concatenate(grams) % np.uint64(n_features)).astype(np.int64)
+    return np.unique(buckets, return_counts=True)
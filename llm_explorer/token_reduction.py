@@ -0,0 +1,254 @@
+"""
+Input-token reduction before summarization.
+
+Scraped article bodies carry tokens that add nothing to a summary but are
+still paid for: "Also read" blocks, bylines, app/newsletter plugs and
+paragraphs repeated by the print page. `TokenReducer` removes them before
+the body reaches the LLM:
+
+1. Drop boilerplate sentences matched by patterns
+2. Drop exact duplicates (after normalization) and near-duplicates
+   (TF-IDF cosine similarity above a threshold)
+3. If the body is still over the token budget, keep the most informative
+   sentences (TF-IDF centrality with a lead bias) in their original order
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from threading import Lock
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config.env import get_env
+from llm_explorer.text_features import split_sentences, tfidf_matrix, tokenize
+
+
+# Sentences that are navigation, promotion or attribution rather than news
+BOILERPLATE_PATTERNS = [
+    r"^(also read|read also|read more|must read|don'?t miss|recommended stories)\b",
+    r"^(click|tap) here\b",
+    r"^(follow|join) us\b",
+    r"^(download|get) the .{0,40}\bapp\b",
+    r"^(subscribe|sign up)\b",
+    r"^\(?with inputs from\b",
+    r"^\(?this (story|article) (has|was) (not been )?(edited|published)\b",
+    r"^(updated|published|last updated)\s*:",
+    r"^(advertisement|sponsored|ad)\s*$",
+    # a short caption only: "Photos: flooding in Mumbai left thousands stranded." is news
+    r"^(watch|listen|video|photos?)\s*:(\s*\S+){0,4}\s*$",
+    r"^(representative|file)\s+(image|photo|picture)\b",
+    r"^(©|copyright\b|all rights reserved\b)",
+    r"^(trending|visual stories|top stories|latest news|more from)\b",
+    r"^(for more news|catch all the|stay updated|get the latest)\b",
+    r"^(share|share this|print|comments?)\s*$",
+]
+
+# Bylines: a capitalised name and nothing else on the line (or before a "|").
+# Case-sensitive, so "By Monday, police had..." is not a byline.
+BYLINE_PATTERN = r"^(?i:by|written by|edited by|reported by)\s+[A-Z][\w.'-]*(\s+[A-Z][\w.'-]*){0,3}\s*(\||$)"
+
+_BOILERPLATE = re.compile("|".join(f"(?:{p})" for p in BOILERPLATE_PATTERNS), re.IGNORECASE)
+_BYLINE = re.compile(BYLINE_PATTERN)
+_NORMALIZE = re.compile(r"[^a-z0-9]+")
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n|\n")
+
+
+def is_boilerplate(sentence: str) -> bool:
+    """True for navigation, promotion or attribution sentences."""
+    sentence = sentence.strip()
+    return bool(_BOILERPLATE.search(sentence) or _BYLINE.search(sentence))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4
+
+
+@dataclass
+class ReductionResult:
+    """Outcome of reducing one article body."""
+
+    text: str
+    original_tokens: int
+    reduced_tokens: int
+    boilerplate_dropped: int = 0
+    duplicates_dropped: int = 0
+    trimmed: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.reduced_tokens)
+
+
+class TokenReducer:
+    """Removes boilerplate and redundancy from article bodies."""
+
+    # Cosine similarity above which two sentences count as duplicates
+    NEAR_DUPLICATE_THRESHOLD = 0.85
+
+    # Input budget in tokens; 0 disables trimming
+    TOKEN_BUDGET = 2000
+
+    # Weight of the lead-position prior when trimming to the budget
+    LEAD_BIAS = 0.3
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        near_duplicate_threshold: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the reducer.
+
+        Args:
+            token_budget: Override for TOKEN_BUDGET (0 disables trimming).
+            near_duplicate_threshold: Override for NEAR_DUPLICATE_THRESHOLD.
+        """
+        self._logger = logging.getLogger("TokenReducer")
+        self._token_budget = self.TOKEN_BUDGET if token_budget is None else token_budget
+        self._threshold = near_duplicate_threshold or self.NEAR_DUPLICATE_THRESHOLD
+
+    def reduce(self, text: str) -> ReductionResult:
+        """
+        Reduce an article body.
+
+        Args:
+            text: Scraped article body.
+
+        Returns:
+            The reduced text with token counts before and after.
+        """
+        original_tokens = estimate_tokens(text)
+
+        # (paragraph index, sentence) pairs so paragraph breaks survive
+        sentences: List[Tuple[int, str]] = [
+            (p, sentence)
+            for p, paragraph in enumerate(_PARAGRAPH_SPLIT.split(text))
+            for sentence in split_sentences(paragraph)
+        ]
+        if not sentences:
+            return ReductionResult(text, original_tokens, original_tokens)
+
+        # 1. boilerplate
+        kept = [(p, s) for p, s in sentences if not is_boilerplate(s)]
+        boilerplate_dropped = len(sentences) - len(kept)
+
+        # 2. exact and near duplicates
+        before_dedup = len(kept)
+        kept = self._drop_duplicates(kept)
+        duplicates_dropped = before_dedup - len(kept)
+
+        # 3. token budget
+        before_trim = len(kept)
+        if self._token_budget and sum(estimate_tokens(s) for _, s in kept) > self._token_budget:
+            kept = self._trim_to_budget(kept)
+        trimmed = before_trim - len(kept)
+
+        reduced = self._join(kept) if kept else text
+        result = ReductionResult(
+            text=reduced,
+            original_tokens=original_tokens,
+            reduced_tokens=estimate_tokens(reduced),
+            boilerplate_dropped=boilerplate_dropped,
+            duplicates_dropped=duplicates_dropped,
+            trimmed=trimmed,
+        )
+
+        self._logger.debug(
+            f"Reduced {original_tokens} -> {result.reduced_tokens} tokens "
+            f"(boilerplate: {boilerplate_dropped}, duplicates: {duplicates_dropped}, "
+            f"trimmed: {trimmed})"
+        )
+        return result
+
+    def _drop_duplicates(self, sentences: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        # Exact duplicates after normalization
+        seen = set()
+        unique: List[Tuple[int, str]] = []
+        for p, sentence in sentences:
+            key = _NORMALIZE.sub(" ", sentence.lower()).strip()
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append((p, sentence))
+
+        if len(unique) < 2:
+            return unique
+
+        # Near duplicates: keep the first occurrence of each similar group
+        vectors = tfidf_matrix([tokenize(s) for _, s in unique])
+        similarity = np.triu(vectors @ vectors.T, k=1) > self._threshold
+
+        keep = np.ones(len(unique), dtype=bool)
+        for i in range(len(unique)):
+            if keep[i]:
+                keep[similarity[i]] = False
+
+        return [item for item, k in zip(unique, keep) if k]
+
+    def _trim_to_budget(self, sentences: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Keep the highest scoring sentences that fit the budget, in order."""
+        n = len(sentences)
+        vectors = tfidf_matrix([tokenize(s) for _, s in sentences])
+
+        # Centrality: how much a sentence overlaps with the rest of the article
+        centrality = (vectors @ vectors.T).sum(axis=1) - 1.0
+        if centrality.max() > 0:
+            centrality = centrality / centrality.max()
+
+        lead = 1.0 / np.sqrt(np.arange(n) + 1.0)
+        scores = (1.0 - self.LEAD_BIAS) * centrality + self.LEAD_BIAS * lead
+
+        lengths = np.array([estimate_tokens(s) for _, s in sentences])
+
+        chosen = np.zeros(n, dtype=bool)
+        chosen[0] = True  # the lead always stays
+        used = lengths[0]
+        for index in np.argsort(-scores, kind="stable"):
+            if chosen[index]:
+                continue
+            if used + lengths[index] > self._token_budget:
+                continue
+            chosen[index] = True
+            used += lengths[index]
+
+        return [item for item, c in zip(sentences, chosen) if c]
+
+    @staticmethod
+    def _join(sentences: List[Tuple[int, str]]) -> str:
+        paragraphs: List[List[str]] = []
+        last_paragraph = None
+        for p, sentence in sentences:
+            if p != last_paragraph:
+                paragraphs.append([])
+                last_paragraph = p
+            paragraphs[-1].append(sentence)
+        return "\n\n".join(" ".join(paragraph) for paragraph in paragraphs)
+
+
+_reducer: Optional[TokenReducer] = None
+_reducer_lock = Lock()
+
+
+def get_token_reducer() -> Optional[TokenReducer]:
+    """
+    Get the process-wide token reducer, or None if disabled.
+
+    Environment Variables:
+        SUMMARIZER_TOKEN_REDUCTION:   Set to "false" to disable (default: enabled).
+        SUMMARIZER_INPUT_TOKEN_BUDGET: Token budget per article (0 = no trimming).
+    """
+    global _reducer
+
+    if get_env("SUMMARIZER_TOKEN_REDUCTION", default="true").lower() in ("0", "false", "no"):
+        return None
+
+    if _reducer is None:
+        with _reducer_lock:
+            if _reducer is None:
+                budget = get_env("SUMMARIZER_INPUT_TOKEN_BUDGET")
+                _reducer = TokenReducer(token_budget=int(budget) if budget else None)
+
+    return _reducer
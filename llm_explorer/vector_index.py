@@ -0,0 +1,549 @@
+"""
+In-process vector index for related articles.
+
+No external vector database: embeddings live in an append-only float16
+memmap (`EmbeddingStore`, 512 bytes per article at 256 dimensions, so a few
+million articles fit in a couple of GB of page cache) and an inverted-file
+index (`IVFIndex`) narrows each query to the few clusters nearest to it.
+
+- Below TRAIN_MIN vectors the index searches exactly (brute force).
+- Once trained, new vectors are assigned to their nearest centroid as they
+  are added, so updates are incremental. The centroids are retrained when
+  the store has grown RETRAIN_GROWTH times since the last training.
+- A query scores the centroids, probes the N_PROBE best lists and ranks
+  their members with one matrix-vector product.
+
+`RelatedArticlesIndex` ties the embedder, the store and the index together
+and is what the summarization service and the CLI use. It is single-writer:
+run it in one process (the summarization service) and query that process
+or a read-only copy.
+
+CLI:
+    python -m llm_explorer.vector_index backfill
+    python -m llm_explorer.vector_index related 1234 --k 5
+    python -m llm_explorer.vector_index search "Goa nightclub fire extradition"
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.env import get_env
+from llm_explorer.embeddings import HashedEmbedder
+
+
+# Characters of the article body added to the summary for embedding
+BODY_LEAD_CHARS = 1000
+
+
+def related_text(summary: Optional[str], body: Optional[str]) -> str:
+    """Text embedded for an article: the summary plus the body lead."""
+    return f"{summary or ''}\n{(body or '')[:BODY_LEAD_CHARS]}"
+
+
+class _GrowableArray:
+    """Append-only int64 array with amortized O(1) appends."""
+
+    def __init__(self, capacity: int = 16) -> None:
+        self._data = np.empty(capacity, dtype=np.int64)
+        self._size = 0
+
+    def extend(self, values: np.ndarray) -> None:
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=np.int64)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : needed] = values
+        self._size = needed
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[: self._size]
+
+
+class EmbeddingStore:
+    """Append-only float16 memmap of unit vectors plus their article ids."""
+
+    # Rows allocated when the store is created (grows by doubling)
+    INITIAL_CAPACITY = 4096
+
+    def __init__(self, directory: str, dim: int) -> None:
+        """
+        Open or create a store.
+
+        Args:
+            directory: Directory holding vectors.f16, ids.i64 and store.json.
+            dim: Vector dimensions (must match an existing store).
+        """
+        self._logger = logging.getLogger("EmbeddingStore")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._meta_path = self.directory / "store.json"
+        self._vectors_path = self.directory / "vectors.f16"
+        self._ids_path = self.directory / "ids.i64"
+
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            if meta["dim"] != dim:
+                raise ValueError(f"Store has {meta['dim']} dimensions, expected {dim}")
+            self.count = int(meta["count"])
+            self.capacity = int(meta["capacity"])
+        else:
+            self.count = 0
+            self.capacity = self.INITIAL_CAPACITY
+
+        self.dim = dim
+        self._open()
+
+    def _open(self) -> None:
+        for path, itemsize in ((self._vectors_path, 2 * self.dim), (self._ids_path, 8)):
+            size = self.capacity * itemsize
+            with open(path, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float16, mode="r+", shape=(self.capacity, self.dim)
+        )
+        self._ids = np.memmap(self._ids_path, dtype=np.int64, mode="r+", shape=(self.capacity,))
+
+    def _grow(self, needed: int) -> None:
+        self._vectors.flush()
+        self._ids.flush()
+        del self._vectors, self._ids
+
+        while self.capacity < needed:
+            self.capacity *= 2
+        self._open()
+
+        self._logger.info(f"Embedding store grown to {self.capacity} rows")
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[: self.count]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[: self.count]
+
+    def append(self, ids: Sequence[int], vectors: np.ndarray) -> np.ndarray:
+        """Append vectors; returns their row numbers."""
+        needed = self.count + len(ids)
+        if needed > self.capacity:
+            self._grow(needed)
+
+        rows = np.arange(self.count, needed)
+        self._vectors[rows] = vectors.astype(np.float16)
+        self._ids[rows] = np.asarray(ids, dtype=np.int64)
+        self.count = needed
+        return rows
+
+    def flush(self) -> None:
+        """Persist vectors first, then the row count (so a crash never exposes junk rows)."""
+        self._vectors.flush()
+        self._ids.flush()
+
+        tmp = self._meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"dim": self.dim, "count": self.count, "capacity": self.capacity}))
+        os.replace(tmp, self._meta_path)
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest neighbour index over an EmbeddingStore."""
+
+    # Maximum number of clusters (inverted lists)
+    N_LISTS = 1024
+
+    # Lists scanned per query
+    N_PROBE = 16
+
+    # Exact search below this many vectors
+    TRAIN_MIN = 10_000
+
+    # Retrain centroids when the store has grown by this factor
+    RETRAIN_GROWTH = 4.0
+
+    # k-means settings
+    KMEANS_ITERATIONS = 10
+    TRAIN_SAMPLES_PER_LIST = 32
+
+    # Rows scored per chunk during brute-force search / reassignment
+    CHUNK_ROWS = 65536
+
+    def __init__(self, store: EmbeddingStore, n_probe: Optional[int] = None) -> None:
+        self._logger = logging.getLogger("IVFIndex")
+        self.store = store
+        self.n_probe = n_probe or self.N_PROBE
+
+        self._centroids_path = store.directory / "centroids.npy"
+        self._assignments_path = store.directory / "assignments.i32"
+
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._lists: List[_GrowableArray] = []
+        self._pending: List[np.ndarray] = []
+        self._meta_path = store.directory / "index.json"
+
+        if self._centroids_path.exists():
+            self._load()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    # persistence
+
+    def _load(self) -> None:
+        self.centroids = np.load(self._centroids_path)
+        self.trained_size = json.loads(self._meta_path.read_text())["trained_size"]
+
+        assignments = np.fromfile(self._assignments_path, dtype=np.int32)
+        if len(assignments) > len(self.store):
+            # assignments for rows the store never persisted
+            assignments = assignments[: len(self.store)]
+            os.truncate(self._assignments_path, assignments.nbytes)
+        self._build_lists(assignments)
+
+        # rows stored after the last assignment flush
+        missing = np.arange(len(assignments), len(self.store))
+        if len(missing):
+            labels = self._assign(missing, np.asarray(self.store.vectors[missing], dtype=np.float32))
+            self._pending.append(labels)
+
+    def flush(self) -> None:
+        """Append assignments made since the last flush (rows are added in order)."""
+        if not self.is_trained or not self._pending:
+            return
+
+        labels = np.concatenate(self._pending)
+        with open(self._assignments_path, "ab") as f:
+            labels.tofile(f)
+        self._pending = []
+
+    def _build_lists(self, assignments: np.ndarray) -> None:
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+
+        self._lists = []
+        for list_id in range(len(self.centroids)):
+            members = _GrowableArray(max(16, int(bounds[list_id + 1] - bounds[list_id])))
+            members.extend(order[bounds[list_id] : bounds[list_id + 1]])
+            self._lists.append(members)
+
+    # training
+
+    def train(self) -> None:
+        """(Re)train the centroids with spherical k-means and reassign every vector."""
+        started = time.perf_counter()
+        n = len(self.store)
+        n_lists = int(min(self.N_LISTS, max(1, 4 * np.sqrt(n))))
+
+        rng = np.random.default_rng(n)
+        sample_size = min(n, n_lists * self.TRAIN_SAMPLES_PER_LIST)
+        sample_rows = np.sort(rng.choice(n, size=sample_size, replace=False))
+        sample = np.asarray(self.store.vectors[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(self.KMEANS_ITERATIONS):
+            labels = (sample @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # empty clusters keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        self.centroids = centroids.astype(np.float32)
+        self._lists = [_GrowableArray() for _ in range(n_lists)]
+        labels = [
+            self._assign(rows, np.asarray(self.store.vectors[rows], dtype=np.float32))
+            for rows in (
+                np.arange(start, min(n, start + self.CHUNK_ROWS))
+                for start in range(0, n, self.CHUNK_ROWS)
+            )
+        ]
+
+        self.trained_size = n
+
+        # full rewrite; the store must be flushed up to n rows as well
+        self.store.flush()
+        np.save(self._centroids_path, self.centroids)
+        np.concatenate(labels).tofile(self._assignments_path)
+        self._meta_path.write_text(json.dumps({"trained_size": n}))
+        self._pending = []
+
+        self._logger.info(
+            f"Trained {n_lists} lists on {len(sample)} of {n} vectors "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def _assign(self, rows: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """Add rows to their nearest lists; returns the list id per row."""
+        labels = (vectors @ self.centroids.T).argmax(axis=1).astype(np.int32)
+
+        # group rows by list to extend each list once
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        for chunk in np.split(order, boundaries):
+            if len(chunk):
+                self._lists[labels[chunk[0]]].extend(rows[chunk])
+
+        return labels
+
+    # updates and queries
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Index rows already appended to the store."""
+        n = len(self.store)
+
+        if not self.is_trained:
+            if n >= self.TRAIN_MIN:
+                self.train()
+            return
+
+        if n >= self.trained_size * self.RETRAIN_GROWTH:
+            self.train()
+            return
+
+        self._pending.append(self._assign(rows, vectors))
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k rows most similar to a unit query vector.
+
+        Returns:
+            (rows, cosine scores), best first.
+        """
+        query = query.astype(np.float32)
+
+        if not self.is_trained:
+            # exact search, chunked so float16 rows are widened a slice at a time
+            candidates = None
+            chunks = [
+                np.asarray(self.store.vectors[start : start + self.CHUNK_ROWS], dtype=np.float32)
+                @ query
+                for start in range(0, len(self.store), self.CHUNK_ROWS)
+            ]
+            scores = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32)
+        else:
+            probe = np.argsort(-(self.centroids @ query))[: self.n_probe]
+            # sorted rows read the memmap sequentially
+            candidates = np.sort(np.concatenate([self._lists[p].values for p in probe]))
+            scores = np.asarray(self.store.vectors[candidates], dtype=np.float32) @ query
+
+        if not len(scores):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        rows = top if candidates is None else candidates[top]
+        return rows, scores[top]
+
+
+class RelatedArticlesIndex:
+    """Embeds articles and answers related-article queries."""
+
+    def __init__(self, directory: str, n_probe: Optional[int] = None) -> None:
+        """
+        Open or create an index.
+
+        Args:
+            directory: Where the embedder state, vectors and index are stored.
+            n_probe: Lists scanned per query (default IVFIndex.N_PROBE).
+        """
+        self._logger = logging.getLogger("RelatedArticlesIndex")
+        self._lock = Lock()
+        self.directory = Path(directory)
+
+        self._embedder_path = self.directory / "embedder.npz"
+        self.embedder = (
+            HashedEmbedder.load_state(str(self._embedder_path))
+            if self._embedder_path.exists()
+            else HashedEmbedder()
+        )
+        self.store = EmbeddingStore(str(self.directory), self.embedder.dim)
+        self.index = IVFIndex(self.store, n_probe=n_probe)
+
+        self._row_of_id: Dict[int, int] = {
+            int(article_id): row for row, article_id in enumerate(self.store.ids)
+        }
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def add_articles(self, article_ids: Sequence[int], texts: Sequence[str]) -> int:
+        """
+        Embed and index articles; ids already in the index are skipped.
+
+        Returns:
+            Number of articles added.
+        """
+        with self._lock:
+            new = [
+                (int(article_id), text)
+                for article_id, text in zip(article_ids, texts)
+                if int(article_id) not in self._row_of_id
+            ]
+            if not new:
+                return 0
+
+            ids = [article_id for article_id, _ in new]
+            new_texts = [text for _, text in new]
+
+            self.embedder.fit_partial(new_texts)
+            vectors = self.embedder.embed(new_texts)
+
+            rows = self.store.append(ids, vectors)
+            self.index.add(rows, vectors)
+            self._row_of_id.update(zip(ids, rows.tolist()))
+
+            return len(new)
+
+    def _results(self, rows: np.ndarray, scores: np.ndarray, exclude: Optional[int], k: int):
+        ids = self.store.ids[rows]
+        return [
+            (int(article_id), float(score))
+            for article_id, score in zip(ids, scores)
+            if article_id != exclude
+        ][:k]
+
+    def related(self, article_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Articles most similar to an indexed article.
+
+        Returns:
+            (article id, cosine similarity) pairs, best first; empty if the
+            article is not indexed.
+        """
+        with self._lock:
+            row = self._row_of_id.get(int(article_id))
+            if row is None:
+                return []
+
+            query = np.asarray(self.store.vectors[row], dtype=np.float32)
+            rows, scores = self.index.search(query, k + 1)
+            return self._results(rows, scores, int(article_id), k)
+
+    def search_text(self, text: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Articles most similar to free text."""
+        with self._lock:
+            query = self.embedder.embed([text])[0]
+            rows, scores = self.index.search(query, k)
+            return self._results(rows, scores, None, k)
+
+    def flush(self) -> None:
+        """Persist vectors, index assignments and embedder state."""
+        with self._lock:
+            self.store.flush()
+            self.index.flush()
+            self.embedder.save_state(str(self._embedder_path))
+
+
+_related_index: Optional[RelatedArticlesIndex] = None
+_related_index_lock = Lock()
+
+
+def get_related_index() -> Optional[RelatedArticlesIndex]:
+    """
+    Get the process-wide related-articles index, or None if not configured.
+
+    Environment Variables:
+        RELATED_INDEX_DIR:     Directory of the index (enables the stage).
+        RELATED_INDEX_NPROBE:  Lists scanned per query (default: 16).
+    """
+    global _related_index
+
+    directory = get_env("RELATED_INDEX_DIR")
+    if not directory:
+        return None
+
+    if _related_index is None:
+        with _related_index_lock:
+            if _related_index is None:
+                n_probe = get_env("RELATED_INDEX_NPROBE")
+                _related_index = RelatedArticlesIndex(
+                    directory, n_probe=int(n_probe) if n_probe else None
+                )
+
+    return _related_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Related-articles vector index")
+    parser.add_argument("--dir", default=None, help="Index directory (default RELATED_INDEX_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = commands.add_parser(
+        "backfill", help="Index summarized articles from the database"
+    )
+    backfill_parser.add_argument("--batch-size", type=int, default=1000)
+
+    related_parser = commands.add_parser("related", help="Articles related to an article id")
+    related_parser.add_argument("article_id", type=int)
+    related_parser.add_argument("--k", type=int, default=10)
+
+    search_parser = commands.add_parser("search", help="Articles related to free text")
+    search_parser.add_argument("text")
+    search_parser.add_argument("--k", type=int, default=10)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    directory = args.dir or get_env("RELATED_INDEX_DIR", default="data/related_index")
+    index = RelatedArticlesIndex(directory)
+
+    if args.command == "backfill":
+        from dotenv import load_dotenv
+
+        from database.connection import DBConnection
+        from database.repository.summarized_articles import PresummarizedArticleRepository
+
+        load_dotenv()
+        database_instance = DBConnection()
+        database_instance.init(get_env("DATABASE_URL"))
+        engine = database_instance.get_engine()
+
+        after_id = 0
+        while True:
+            rows = PresummarizedArticleRepository.get_summaries_after(
+                engine, after_id=after_id, limit=args.batch_size, body_chars=BODY_LEAD_CHARS
+            )
+            if not rows:
+                break
+
+            added = index.add_articles(
+                [row[0] for row in rows], [related_text(row[1], row[2]) for row in rows]
+            )
+            after_id = rows[-1][0]
+            logging.info(f"Indexed {added} articles up to id {after_id} ({len(index)} total)")
+
+        index.flush()
+        return
+
+    started = time.perf_counter()
+    if args.command == "related":
+        results = index.related(args.article_id, k=args.k)
+    else:
+        results = index.search_text(args.text, k=args.k)
+    elapsed = time.perf_counter() - started
+
+    for article_id, score in results:
+        print(f"{article_id}\t{score:.3f}")
+    print(f"{len(results)} results in {elapsed * 1000:.1f}ms ({len(index)} articles indexed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -52,8 +52,22 @@ async def main(service: str):
             logger.info(f"Service {service} started")
             from llm_explorer.main import main
 
+            await main()
+
+        # revisit (change detection) service exec
+        elif service == service_names["revisit_service"]:
+            logger.info(f"Service {service} started")
+            from scraper.revisit import main
+
             main()
 
+        # outbox relay (transactional outbox -> RabbitMQ) exec
+        elif service == service_names["outbox_relay_service"]:
+            logger.info(f"Service {service} started")
+            from msg_queue.outbox_relay import main
+
+            await main()
+
         elif service == service_names["all_service"]:
             logger.info("All services is to be started")
             # try to multi thread
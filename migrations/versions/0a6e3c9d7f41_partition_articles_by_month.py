@@ -0,0 +1,196 @@
+"""partition articles by month
+
+Revision ID: 0a6e3c9d7f41
+Revises: f1c4a9e6b253
+Create Date: 2026-02-12 10:04:51.207715
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6e3c9d7f41"
+down_revision: Union[str, Sequence[str], None] = "f1c4a9e6b253"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# monthly partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+
+# partition helpers, copied from database.partitions as of this revision so
+# later changes to that module do not change what this migration does
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partition_sql(table_name: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table_name}_p{month:%Y%m} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+# indexes of the partitioned tables: (name, columns, partial index predicate)
+INDEXES = {
+    "raw_articles": [
+        ("ix_raw_articles_id", ["id"], None),
+        ("ix_raw_articles_canonical_url", ["canonical_url"], None),
+        ("ix_raw_articles_duplicate_of_id", ["duplicate_of_id"], None),
+        ("ix_raw_articles_unprocessed", ["id"], "processed = false"),
+        ("ix_raw_articles_source_published_at", ["source", "published_at"], None),
+    ],
+    "summarized_articles": [
+        ("ix_summarized_articles_id", ["id"], None),
+        ("ix_summarized_articles_raw_article_id", ["raw_article_id"], None),
+        ("ix_summarized_articles_summary_status", ["summary_status"], None),
+        ("ix_summarized_articles_published_at", ["published_at"], None),
+        ("ix_summarized_articles_next_check_at", ["next_check_at"], None),
+        ("ix_summarized_articles_source_createdAt", ["source", "createdAt"], None),
+        ("ix_summarized_articles_category_id_createdAt", ["category_id", "createdAt"], None),
+        ("ix_summarized_articles_source_published_at", ["source", "published_at"], None),
+    ],
+}
+
+# foreign keys of summarized_articles that stay enforced (to unpartitioned tables):
+# (name, column, referenced table, referenced column)
+SUMMARIZED_FOREIGN_KEYS = [
+    ("summarized_articles_category_id_fkey", "category_id", "article_category", "id"),
+    ("summarized_articles_body_hash_fkey", "body_hash", "article_bodies", "hash"),
+]
+
+# foreign keys into the partitioned tables: (name, table, column, referenced table)
+# PostgreSQL can only reference a partitioned table through a unique key that
+# includes the partition column, so these are dropped
+INBOUND_FOREIGN_KEYS = [
+    ("raw_articles_duplicate_of_id_fkey", "raw_articles", "duplicate_of_id", "raw_articles"),
+    ("summarized_articles_raw_article_id_fkey", "summarized_articles", "raw_article_id", "raw_articles"),
+    (
+        "summarized_article_versions_article_id_fkey",
+        "summarized_article_versions",
+        "article_id",
+        "summarized_articles",
+    ),
+    ("summarization_usage_article_id_fkey", "summarization_usage", "article_id", "summarized_articles"),
+]
+
+
+def _create_indexes(table_name: str) -> None:
+    for name, columns, where in INDEXES[table_name]:
+        op.create_index(
+            name,
+            table_name,
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # global uniqueness of canonical URLs moves to a registry table
+    op.create_table(
+        "article_urls",
+        sa.Column("canonical_url", sa.String(), nullable=False),
+        sa.Column("raw_article_id", sa.Integer(), nullable=False),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("canonical_url"),
+    )
+    op.execute(
+        'INSERT INTO article_urls (canonical_url, raw_article_id, "createdAt") '
+        'SELECT canonical_url, id, "createdAt" FROM raw_articles WHERE canonical_url IS NOT NULL'
+    )
+
+    for name, table_name, _, _ in INBOUND_FOREIGN_KEYS:
+        op.drop_constraint(name, table_name, type_="foreignkey")
+    # A unique constraint on the partitioned table would have to include
+    # "createdAt"; PresummarizedArticleRepository.upsert_by_raw_article_id
+    # keeps one row per raw article by locking the raw article's row instead.
+    op.drop_constraint("summarized_articles_raw_article_id_key", "summarized_articles", type_="unique")
+    op.drop_index("ix_raw_articles_canonical_url", table_name="raw_articles")
+    op.create_index("ix_raw_articles_canonical_url", "raw_articles", ["canonical_url"])
+    op.create_index(
+        "ix_summarized_articles_raw_article_id", "summarized_articles", ["raw_article_id"]
+    )
+
+    # Existing rows are not copied: each table becomes the first partition
+    # (everything before next month) of a new partitioned parent. Its indexes
+    # are renamed so the parent can take the original names; creating the
+    # parent's indexes then attaches them instead of building new ones.
+    legacy_until = _add_months(_month_start(date.today()), 1)
+
+    for table_name in ("raw_articles", "summarized_articles"):
+        legacy = f"{table_name}_legacy"
+
+        op.rename_table(table_name, legacy)
+        op.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {table_name}_pkey")
+        op.execute(
+            f'ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_pkey PRIMARY KEY (id, "createdAt")'
+        )
+        for name, _, _ in INDEXES[table_name]:
+            op.execute(f'ALTER INDEX "{name}" RENAME TO "{name}_legacy"')
+
+        op.execute(
+            f'CREATE TABLE {table_name} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ("createdAt")'
+        )
+        op.execute(
+            f'ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY (id, "createdAt")'
+        )
+        # the id sequence must outlive the legacy partition
+        op.execute(f"ALTER SEQUENCE {table_name}_id_seq OWNED BY {table_name}.id")
+        op.execute(
+            f"ALTER TABLE {table_name} ATTACH PARTITION {legacy} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{legacy_until:%Y-%m-%d}')"
+        )
+        _create_indexes(table_name)
+
+        for month in range(MONTHS_AHEAD + 1):
+            op.execute(_create_partition_sql(table_name, _add_months(legacy_until, month)))
+
+    for name, column, referenced, key in SUMMARIZED_FOREIGN_KEYS:
+        op.create_foreign_key(name, "summarized_articles", referenced, [column], [key])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rows are copied back into plain tables. Partitions already detached
+    # to the archive schema are not restored; rows referencing them (versions,
+    # usage) must be removed before the foreign keys can be recreated.
+    for table_name in ("summarized_articles", "raw_articles"):
+        partitioned = f"{table_name}_partitioned"
+
+        op.rename_table(table_name, partitioned)
+        op.execute(f"CREATE TABLE {table_name} (LIKE {partitioned} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table_name} SELECT * FROM {partitioned}")
+        op.execute(f"ALTER SEQUENCE {table_name}_id_seq OWNED BY {table_name}.id")
+        op.execute(f"DROP TABLE {partitioned} CASCADE")
+
+        op.create_primary_key(f"{table_name}_pkey", table_name, ["id"])
+        _create_indexes(table_name)
+
+    for name, column, referenced, key in SUMMARIZED_FOREIGN_KEYS:
+        op.create_foreign_key(name, "summarized_articles", referenced, [column], [key])
+
+    op.drop_index("ix_summarized_articles_raw_article_id", table_name="summarized_articles")
+    op.create_unique_constraint(
+        "summarized_articles_raw_article_id_key", "summarized_articles", ["raw_article_id"]
+    )
+    op.drop_index("ix_raw_articles_canonical_url", table_name="raw_articles")
+    op.create_index(
+        "ix_raw_articles_canonical_url", "raw_articles", ["canonical_url"], unique=True
+    )
+    for name, table_name, column, referenced in INBOUND_FOREIGN_KEYS:
+        op.create_foreign_key(name, table_name, referenced, [column], ["id"])
+
+    op.drop_table("article_urls")
@@ -0,0 +1,62 @@
+"""add summarization usage
+
+Revision ID: 5c1e2a7d9b30
+Revises: f8425ce388ed
+Create Date: 2026-01-20 11:42:08.517204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e2a7d9b30"
+down_revision: Union[str, Sequence[str], None] = "f8425ce388ed"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "summarization_usage",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=True),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("latency_ms", sa.Integer(), nullable=False),
+        sa.Column("retries", sa.Integer(), nullable=False),
+        sa.Column("cost", sa.Float(), nullable=True),
+        sa.Column("succeeded", sa.Boolean(), nullable=False),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["summarized_articles.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_summarization_usage_id"), "summarization_usage", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_summarization_usage_article_id"),
+        "summarization_usage",
+        ["article_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_summarization_usage_model"), "summarization_usage", ["model"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_summarization_usage_model"), table_name="summarization_usage")
+    op.drop_index(op.f("ix_summarization_usage_article_id"), table_name="summarization_usage")
+    op.drop_index(op.f("ix_summarization_usage_id"), table_name="summarization_usage")
+    op.drop_table("summarization_usage")
@@ -0,0 +1,41 @@
+"""add raw article duplicate_of
+
+Revision ID: 7a3d9e1f4b62
+Revises: 5c1e2a7d9b30
+Create Date: 2026-01-24 09:15:37.204118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3d9e1f4b62"
+down_revision: Union[str, Sequence[str], None] = "5c1e2a7d9b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("raw_articles", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+    op.create_index(
+        op.f("ix_raw_articles_duplicate_of_id"), "raw_articles", ["duplicate_of_id"], unique=False
+    )
+    op.create_foreign_key(
+        "raw_articles_duplicate_of_id_fkey",
+        "raw_articles",
+        "raw_articles",
+        ["duplicate_of_id"],
+        ["id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("raw_articles_duplicate_of_id_fkey", "raw_articles", type_="foreignkey")
+    op.drop_index(op.f("ix_raw_articles_duplicate_of_id"), table_name="raw_articles")
+    op.drop_column("raw_articles", "duplicate_of_id")
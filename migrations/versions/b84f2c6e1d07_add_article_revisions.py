@@ -0,0 +1,86 @@
+"""add article revisions
+
+Revision ID: b84f2c6e1d07
+Revises: 7a3d9e1f4b62
+Create Date: 2026-01-27 18:03:52.640911
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b84f2c6e1d07"
+down_revision: Union[str, Sequence[str], None] = "7a3d9e1f4b62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "summarized_articles", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.add_column("summarized_articles", sa.Column("simhash", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "summarized_articles",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column("summarized_articles", sa.Column("last_checked_at", sa.DateTime(), nullable=True))
+    op.add_column("summarized_articles", sa.Column("next_check_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        op.f("ix_summarized_articles_next_check_at"),
+        "summarized_articles",
+        ["next_check_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "summarized_article_versions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("body", sa.String(), nullable=True),
+        sa.Column("summary", sa.String(), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("simhash", sa.BigInteger(), nullable=True),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["summarized_articles.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_summarized_article_versions_id"),
+        "summarized_article_versions",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_summarized_article_versions_article_id"),
+        "summarized_article_versions",
+        ["article_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_summarized_article_versions_article_id"),
+        table_name="summarized_article_versions",
+    )
+    op.drop_index(
+        op.f("ix_summarized_article_versions_id"), table_name="summarized_article_versions"
+    )
+    op.drop_table("summarized_article_versions")
+    op.drop_index(op.f("ix_summarized_articles_next_check_at"), table_name="summarized_articles")
+    op.drop_column("summarized_articles", "next_check_at")
+    op.drop_column("summarized_articles", "last_checked_at")
+    op.drop_column("summarized_articles", "version")
+    op.drop_column("summarized_articles", "simhash")
+    op.drop_column("summarized_articles", "content_hash")
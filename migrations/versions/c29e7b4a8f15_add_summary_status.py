@@ -0,0 +1,43 @@
+"""add summary status
+
+Revision ID: c29e7b4a8f15
+Revises: b84f2c6e1d07
+Create Date: 2026-01-30 12:26:09.871342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c29e7b4a8f15"
+down_revision: Union[str, Sequence[str], None] = "b84f2c6e1d07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "summarized_articles",
+        sa.Column("summary_status", sa.String(), server_default="pending", nullable=False),
+    )
+    # every summary stored so far came from the summarization service
+    op.execute(
+        "UPDATE summarized_articles SET summary_status = 'final' WHERE summary IS NOT NULL"
+    )
+    op.create_index(
+        op.f("ix_summarized_articles_summary_status"),
+        "summarized_articles",
+        ["summary_status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_summarized_articles_summary_status"), table_name="summarized_articles")
+    op.drop_column("summarized_articles", "summary_status")
@@ -0,0 +1,83 @@
+"""add lookup indexes
+
+Revision ID: d5a1f08c3e94
+Revises: c29e7b4a8f15
+Create Date: 2026-02-03 10:48:21.305876
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a1f08c3e94"
+down_revision: Union[str, Sequence[str], None] = "c29e7b4a8f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nullable without a default: no table rewrite. Rows stored before this
+    # migration keep NULL (NULLs do not collide in the unique index).
+    op.add_column("raw_articles", sa.Column("canonical_url", sa.String(), nullable=True))
+
+    # CREATE INDEX CONCURRENTLY does not block writes but cannot run inside a
+    # transaction; if it fails it leaves an INVALID index that must be dropped
+    # before re-running
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_raw_articles_canonical_url"),
+            "raw_articles",
+            ["canonical_url"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_raw_articles_unprocessed",
+            "raw_articles",
+            ["id"],
+            postgresql_where=sa.text("processed = false"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_summarized_articles_source_createdAt",
+            "summarized_articles",
+            ["source", "createdAt"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_summarized_articles_category_id_createdAt",
+            "summarized_articles",
+            ["category_id", "createdAt"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_summarized_articles_category_id_createdAt",
+            table_name="summarized_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_summarized_articles_source_createdAt",
+            table_name="summarized_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_raw_articles_unprocessed",
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_raw_articles_canonical_url"),
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("raw_articles", "canonical_url")
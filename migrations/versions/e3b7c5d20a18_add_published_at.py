@@ -0,0 +1,80 @@
+"""add published_at
+
+Revision ID: e3b7c5d20a18
+Revises: d5a1f08c3e94
+Create Date: 2026-02-06 15:12:44.918263
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b7c5d20a18"
+down_revision: Union[str, Sequence[str], None] = "d5a1f08c3e94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "raw_articles", sa.Column("published_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "summarized_articles",
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    with op.get_context().autocommit_block():
+        # fill the new columns chunk by chunk, one short transaction each
+        # (re-run later with `python -m database.backfill published-at`)
+        if not op.get_context().as_sql:
+            from database.backfill import backfill_published_at
+
+            for table_name in ("raw_articles", "summarized_articles"):
+                backfill_published_at(op.get_bind(), table_name)
+
+        op.create_index(
+            "ix_raw_articles_source_published_at",
+            "raw_articles",
+            ["source", "published_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_summarized_articles_published_at"),
+            "summarized_articles",
+            ["published_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_summarized_articles_source_published_at",
+            "summarized_articles",
+            ["source", "published_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_summarized_articles_source_published_at",
+            table_name="summarized_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_summarized_articles_published_at"),
+            table_name="summarized_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_raw_articles_source_published_at",
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("summarized_articles", "published_at")
+    op.drop_column("raw_articles", "published_at")
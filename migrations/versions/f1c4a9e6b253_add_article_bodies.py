@@ -0,0 +1,67 @@
+"""add article_bodies
+
+Revision ID: f1c4a9e6b253
+Revises: e3b7c5d20a18
+Create Date: 2026-02-09 11:27:03.552190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c4a9e6b253"
+down_revision: Union[str, Sequence[str], None] = "e3b7c5d20a18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_bodies",
+        sa.Column("hash", sa.String(length=64), nullable=False),
+        sa.Column("codec", sa.String(length=8), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    for table_name in ("summarized_articles", "summarized_article_versions"):
+        op.add_column(table_name, sa.Column("body_hash", sa.String(length=64), nullable=True))
+        op.create_foreign_key(
+            f"{table_name}_body_hash_fkey",
+            table_name,
+            "article_bodies",
+            ["body_hash"],
+            ["hash"],
+        )
+
+    # Move the inline bodies chunk by chunk (one short transaction each).
+    # The emptied body columns are kept until every service writes to
+    # article_bodies; rows written by older services in the meantime are
+    # moved with `python -m database.backfill article-bodies`.
+    if not op.get_context().as_sql:
+        from database.backfill import BODY_TABLES, backfill_article_bodies
+
+        with op.get_context().autocommit_block():
+            for table_name in BODY_TABLES:
+                backfill_article_bodies(op.get_bind(), table_name)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not op.get_context().as_sql:
+        from database.backfill import BODY_TABLES, restore_inline_bodies
+
+        with op.get_context().autocommit_block():
+            for table_name in BODY_TABLES:
+                restore_inline_bodies(op.get_bind(), table_name)
+
+    for table_name in ("summarized_article_versions", "summarized_articles"):
+        op.drop_constraint(f"{table_name}_body_hash_fkey", table_name, type_="foreignkey")
+        op.drop_column(table_name, "body_hash")
+    op.drop_table("article_bodies")
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+import aio_pika
+from aio_pika.abc import (
+    AbstractIncomingMessage,
+    AbstractQueue,
+    AbstractRobustChannel,
+    AbstractRobustConnection,
+)
+
+from config.env import get_env
+
+
+class AsyncQueueHandler:
+    """
+    asyncio counterpart of QueueHandler (aio-pika).
+
+    Same queue names, credentials and message format as QueueHandler, so
+    async services can consume from and publish to queues fed by the
+    blocking services. Messages are not acknowledged automatically - the
+    consumer calls `message.ack()` / `message.nack()` once the work is done.
+    """
+
+    def __init__(self, channel_name: str, prefetch_count: int = 1) -> None:
+        """
+        Args:
+            channel_name: Queue name (see config.config.queue_names).
+            prefetch_count: Unacknowledged messages the broker may deliver
+                            ahead of processing.
+        """
+        self.logger = logging.getLogger("AsyncMsgQueue")
+
+        self.channel_name = channel_name
+        self.prefetch_count = prefetch_count
+        self.encode_type = "utf-8"
+
+        self.connection: Optional[AbstractRobustConnection] = None
+        self.channel: Optional[AbstractRobustChannel] = None
+        self.queue: Optional[AbstractQueue] = None
+
+    async def connect(self) -> None:
+        """Open the connection and declare the (durable) queue."""
+        try:
+            self.connection = await aio_pika.connect_robust(
+                host=get_env("MSG_QUEUE"),
+                port=int(get_env("MSG_QUEUE_PORT", default="5672")),
+                login=get_env("MSG_QUEUE_USERNAME"),
+                password=get_env("MSG_QUEUE_PASSWORD"),
+            )
+            self.channel = await self.connection.channel()
+            await self.channel.set_qos(prefetch_count=self.prefetch_count)
+            self.queue = await self.channel.declare_queue(self.channel_name, durable=True)
+
+            self.logger.info("Queue connection establisted.")
+
+        except Exception as e:
+            self.logger.error(f"Queue init failed: {str(e)}")
+            raise e
+
+    def encode(self, msg: Dict[str, Any]) -> bytes:
+        """to encode json / dict in sendable format"""
+        return json.dumps(msg).encode(self.encode_type)
+
+    async def publisher(self, data: Dict[str, Any]):
+        try:
+            if self.channel is None:
+                self.logger.warning("Msg queue is not initialized")
+                raise Exception("Msg queue is not initialized")
+
+            await self.channel.default_exchange.publish(
+                aio_pika.Message(
+                    body=self.encode(data),
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                ),
+                routing_key=self.channel_name,
+            )
+
+            self.logger.info(f" Data added to queue: {self.channel_name}")
+
+        except Exception as e:
+            self.logger.error(f"Error publishing {str(e)}")
+
+    async def publish_batch(self, bodies: Sequence[bytes]) -> None:
+        """
+        Publish already encoded messages and wait for the broker to confirm
+        all of them (the channel has publisher confirms on, so each publish
+        resolves once the broker has taken the persistent message).
+
+        Unlike `publisher`, failures are raised: a caller that must not lose
+        messages (the outbox relay) keeps them and retries.
+        """
+        if self.channel is None:
+            raise Exception("Msg queue is not initialized")
+
+        exchange = self.channel.default_exchange
+        await asyncio.gather(
+            *(
+                exchange.publish(
+                    aio_pika.Message(body=body, delivery_mode=aio_pika.DeliveryMode.PERSISTENT),
+                    routing_key=self.channel_name,
+                )
+                for body in bodies
+            )
+        )
+
+        self.logger.info(f" {len(bodies)} messages confirmed on queue: {self.channel_name}")
+
+    async def messages(self) -> AsyncIterator[AbstractIncomingMessage]:
+        """
+        Iterate over incoming messages.
+
+        Backpressure comes from the prefetch count: the broker stops
+        delivering once `prefetch_count` messages are unacknowledged.
+        Cancelling the consuming task cancels the consumer and requeues
+        messages buffered but not yet yielded.
+        """
+        if self.queue is None:
+            raise Exception("Msg queue is not initialized")
+
+        async with self.queue.iterator() as iterator:
+            async for message in iterator:
+                yield message
+
+    async def close_queue(self) -> None:
+        """Close the connection (unacknowledged messages are requeued by the broker)."""
+        if self.connection is not None and not self.connection.is_closed:
+            await self.connection.close()
+
+
+def create_async_queue_handler(channel_name: str, prefetch_count: int = 1):
+    """AsyncQueueHandler, or AsyncPgQueueHandler with QUEUE_BACKEND=postgres."""
+    from msg_queue.queue_handler import queue_backend
+
+    if queue_backend() == "postgres":
+        from msg_queue.pg_queue_handler import create_pg_queue_handler
+
+        return create_pg_queue_handler(channel_name, asynchronous=True, prefetch_count=prefetch_count)
+
+    return AsyncQueueHandler(channel_name, prefetch_count=prefetch_count)
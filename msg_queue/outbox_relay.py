@@ -0,0 +1,182 @@
+"""
+Relay of the transactional outbox to RabbitMQ.
+
+With OUTBOX_ENABLED=true the RSS and scraping services do not publish
+directly: each queue message is written to outbox_messages in the same
+transaction as the article it announces, so a crash can no longer store an
+article without its message (or the reverse). This service moves the
+messages to the broker:
+
+1. claim the oldest BATCH_SIZE messages with FOR UPDATE SKIP LOCKED (relays
+   running side by side take disjoint batches)
+2. publish them per queue and wait for the broker's publisher confirms
+3. delete them and commit
+
+A failed publish rolls the transaction back and the batch is retried.
+Delivery to the broker is at least once: if the relay dies after the
+confirms but before the commit, the batch is published again, which the
+consumers tolerate (the scraper upserts by raw_article_id, summaries are
+written by article id).
+
+    python main.py rameshwaram
+"""
+
+import asyncio
+import logging
+import signal
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config.config import service_names
+from config.env import get_env
+from database.async_connection import AsyncDBConnection, async_session_scope, get_async_engine
+from database.repository.outbox import OutboxRepository
+from msg_queue.async_queue_handler import AsyncQueueHandler
+
+
+class OutboxRelay:
+    """Publishes outbox messages in confirmed batches."""
+
+    # Messages claimed and published per transaction
+    BATCH_SIZE = 500
+
+    # Seconds to sleep when the outbox is empty
+    POLL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        batch_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the relay.
+
+        Args:
+            engine: Async database engine (the claim's row locks are held
+                    while the broker confirms).
+            batch_size: Override for BATCH_SIZE.
+            poll_seconds: Override for POLL_SECONDS.
+        """
+        self._logger = logging.getLogger("OutboxRelay")
+        self.engine = engine
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.poll_seconds = self.POLL_SECONDS if poll_seconds is None else poll_seconds
+
+        self._queues: Dict[str, AsyncQueueHandler] = {}
+        self._stopping = asyncio.Event()
+
+        self.stats = {"published": 0, "batches": 0, "failed_batches": 0}
+
+    async def _queue(self, name: str) -> AsyncQueueHandler:
+        queue = self._queues.get(name)
+        if queue is None:
+            queue = AsyncQueueHandler(name)
+            await queue.connect()
+            self._queues[name] = queue
+        return queue
+
+    def stop(self) -> None:
+        """Request a graceful shutdown (safe to call from a signal handler)."""
+        self._stopping.set()
+
+    async def run_once(self) -> int:
+        """
+        Claim, publish and delete one batch.
+
+        Returns:
+            Number of messages published (0 when the outbox is empty).
+
+        Raises:
+            Exception: Publishing failed; the batch stays in the outbox.
+        """
+        async with async_session_scope(self.engine) as session:
+            messages = await OutboxRepository.claim_async(session, self.batch_size)
+            if not messages:
+                return 0
+
+            by_queue: Dict[str, List[bytes]] = defaultdict(list)
+            for message in messages:
+                by_queue[message.queue].append(message.payload.encode("utf-8"))
+
+            for name, bodies in by_queue.items():
+                queue = await self._queue(name)
+                await queue.publish_batch(bodies)
+
+            await OutboxRepository.delete_async(session, [message.id for message in messages])
+
+        self.stats["published"] += len(messages)
+        self.stats["batches"] += 1
+        return len(messages)
+
+    async def run(self) -> None:
+        """Relay until `stop` is called; a full batch is followed immediately by the next."""
+        try:
+            while not self._stopping.is_set():
+                try:
+                    published = await self.run_once()
+                except Exception as e:
+                    self.stats["failed_batches"] += 1
+                    self._logger.error(f"Outbox batch failed, retrying: {str(e)}")
+                    published = 0
+
+                if published < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+
+        finally:
+            for queue in self._queues.values():
+                await queue.close_queue()
+            self._logger.info(f"Outbox relay stopped: {self.stats}")
+
+
+def create_outbox_relay(engine: AsyncEngine) -> OutboxRelay:
+    """
+    Create a relay configured from the environment.
+
+    Environment Variables:
+        OUTBOX_BATCH_SIZE:    Messages published per transaction (default: 500).
+        OUTBOX_POLL_SECONDS:  Sleep when the outbox is empty (default: 1).
+    """
+    batch_size = get_env("OUTBOX_BATCH_SIZE")
+    poll_seconds = get_env("OUTBOX_POLL_SECONDS")
+
+    return OutboxRelay(
+        engine,
+        batch_size=int(batch_size) if batch_size else None,
+        poll_seconds=float(poll_seconds) if poll_seconds else None,
+    )
+
+
+async def main():
+    service_name = service_names["outbox_relay_service"]
+
+    logger = logging.getLogger(f"Outbox relay: {service_name} ")
+
+    engine = get_async_engine()
+    if engine is None:
+        raise Exception("The outbox relay needs the async database driver (asyncpg)")
+
+    relay = create_outbox_relay(engine)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, relay.stop)
+        except NotImplementedError:
+            # signal handlers are not available on every platform
+            pass
+
+    try:
+        await relay.run()
+
+    except Exception as e:
+        logger.error(f"Main function error: {str(e)}", exc_info=True)
+        raise
+
+    finally:
+        await AsyncDBConnection.dispose()
@@ -0,0 +1,348 @@
+"""
+PostgreSQL queue backend (QUEUE_BACKEND=postgres).
+
+Small deployments can connect the services through the job_queue table
+instead of RabbitMQ. `PgQueueHandler` has QueueHandler's interface
+(publisher / consume / close_queue) and `AsyncPgQueueHandler` has
+AsyncQueueHandler's (connect / publisher / messages / close_queue), so the
+services pick a backend with `create_queue_handler` /
+`create_async_queue_handler` and stay unchanged otherwise.
+
+- consumers claim up to BATCH_SIZE jobs at once with FOR UPDATE SKIP LOCKED,
+  so any number of them can run side by side
+- a claimed job is leased for LEASE_SECONDS and the lease is renewed while
+  the consumer holds the job; a job whose consumer died is delivered again
+  once the lease runs out
+- a failed job (NACK) is delivered again after a backoff that doubles with
+  every attempt; after MAX_ATTEMPTS it is parked instead of retried
+- publishing sends a NOTIFY, which wakes idle consumers LISTENing on the
+  queue's channel; POLL_SECONDS bounds the wait when a notification is missed
+
+With OUTBOX_ENABLED=true the jobs are written in the transaction that stores
+the article (see database.repository.outbox), so no relay is needed.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine
+
+from config.env import get_env
+from database.repository.job_queue import JobQueueRepository, notify_channel
+
+
+class PgQueueHandler:
+    """Work queue on PostgreSQL with QueueHandler's interface."""
+
+    # Jobs claimed per query
+    BATCH_SIZE = 10
+
+    # Seconds a consumer has to finish a claimed job (the whole batch)
+    LEASE_SECONDS = 600.0
+
+    # Longest wait for a NOTIFY before looking for jobs again
+    POLL_SECONDS = 5.0
+
+    # Deliveries of a failing job before it is parked
+    MAX_ATTEMPTS = 5
+
+    # Wait before a failed job is delivered again (doubles per attempt, capped)
+    RETRY_BASE_SECONDS = 5.0
+    RETRY_MAX_SECONDS = 300.0
+
+    def __init__(
+        self,
+        channel_name: str,
+        engine: Optional[Engine] = None,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            channel_name: Queue name (see config.config.queue_names).
+            engine: SQLAlchemy engine (default: the one set up by `DBConnection.init`).
+            batch_size: Override for BATCH_SIZE.
+            lease_seconds: Override for LEASE_SECONDS.
+            poll_seconds: Override for POLL_SECONDS.
+            max_attempts: Override for MAX_ATTEMPTS.
+        """
+        from database.connection import DBConnection
+
+        self.logger = logging.getLogger("PgMsgQueue")
+
+        self.channel_name = channel_name
+        self.engine = engine or DBConnection.get_engine()
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.lease_seconds = lease_seconds or self.LEASE_SECONDS
+        self.poll_seconds = self.POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.max_attempts = max_attempts or self.MAX_ATTEMPTS
+
+        self.encode_type = "utf-8"
+
+        self._listener = None
+        self._stopping = False
+
+    def encode(self, msg: Dict[str, Any]) -> bytes:
+        """to encode json / dict in sendable format"""
+        return json.dumps(msg).encode(self.encode_type)
+
+    def publisher(self, data: Dict[str, Any]):
+        if JobQueueRepository.publish(self.engine, self.channel_name, data):
+            self.logger.info(f" Data added to queue: {self.channel_name}")
+        else:
+            self.logger.error(f"Error publishing to {self.channel_name}")
+
+    def listen(self) -> None:
+        """Open the dedicated LISTEN connection (done by `consume`)."""
+        if self._listener is not None:
+            return
+
+        try:
+            # a connection of its own: pooled ones are reset when returned
+            dialect = self.engine.dialect
+            cargs, cparams = dialect.create_connect_args(self.engine.url)
+            listener = dialect.connect(*cargs, **cparams)
+            listener.autocommit = True
+
+            cursor = listener.cursor()
+            cursor.execute(f'LISTEN "{notify_channel(self.channel_name)}"')
+            cursor.close()
+
+            self._listener = listener
+            self.logger.info(f"Listening for jobs on {self.channel_name}")
+
+        except Exception as e:
+            # still works, only wakes up every POLL_SECONDS
+            self.logger.warning(f"LISTEN failed, polling instead: {str(e)}")
+
+    def wait(self, timeout: float) -> None:
+        """Block until a job is announced or the timeout passes."""
+        listener = self._listener
+        if listener is None or not hasattr(listener, "poll"):
+            time.sleep(timeout)
+            return
+
+        try:
+            if select.select([listener], [], [], timeout)[0]:
+                listener.poll()
+                listener.notifies.clear()
+        except Exception as e:
+            # closed by close_queue, or the connection dropped
+            if not self._stopping:
+                self.logger.warning(f"LISTEN connection lost, polling instead: {str(e)}")
+                self._listener = None
+
+    def claim(self, limit: Optional[int] = None) -> List[Tuple[int, str, int]]:
+        """Lease up to `limit` (default BATCH_SIZE) jobs: (id, payload, attempts)."""
+        return JobQueueRepository.claim(
+            self.engine, self.channel_name, limit or self.batch_size, self.lease_seconds
+        )
+
+    def extend(self, claims: List[Tuple[int, int]]) -> None:
+        """Renew the lease of held jobs: (id, attempts) as claimed."""
+        JobQueueRepository.extend(self.engine, claims, self.lease_seconds)
+
+    def fail(self, ids: List[int]) -> None:
+        """Deliver failed jobs again after a backoff, or park them after MAX_ATTEMPTS."""
+        JobQueueRepository.retry(
+            self.engine, ids, self.max_attempts, self.RETRY_BASE_SECONDS, self.RETRY_MAX_SECONDS
+        )
+
+    def consume(self, call_back: Callable):
+        """
+        Consume jobs until `close_queue` is called.
+
+        A job is deleted after call_back returns (ACK). If call_back raises,
+        the job is delivered again after a backoff (NACK with requeue).
+        """
+        self.listen()
+
+        try:
+            while not self._stopping:
+                jobs = self.claim()
+                if not jobs:
+                    self.wait(self.poll_seconds)
+                    continue
+
+                leased_at = time.monotonic()
+                for index, (id, payload, attempts) in enumerate(jobs):
+                    # the rest of a slow batch must not be handed to another consumer
+                    if time.monotonic() - leased_at > self.lease_seconds / 2:
+                        self.extend([(id, attempts) for id, _, attempts in jobs[index:]])
+                        leased_at = time.monotonic()
+
+                    try:
+                        call_back(payload.encode(self.encode_type))
+
+                        JobQueueRepository.complete(self.engine, [id])
+                        self.logger.debug(f"Job ACKed: {id}")
+
+                    except Exception as e:
+                        self.logger.error(f"Error processing job {id} (attempt {attempts}): {str(e)}")
+                        self.fail([id])
+
+        except Exception as e:
+            self.logger.error(f"Error consuming {str(e)}")
+
+    def close_queue(self):
+        self._stopping = True
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+
+class PgQueueMessage:
+    """A claimed job with aio-pika's acknowledgement methods."""
+
+    def __init__(self, queue: "AsyncPgQueueHandler", id: int, body: bytes, attempts: int) -> None:
+        self._queue = queue
+        self.id = id
+        self.body = body
+        self.attempts = attempts
+
+    async def ack(self) -> None:
+        await self._queue._settle(self.id, requeue=False)
+
+    async def nack(self, requeue: bool = True) -> None:
+        await self._queue._settle(self.id, requeue=requeue)
+
+    async def reject(self, requeue: bool = False) -> None:
+        await self._queue._settle(self.id, requeue=requeue)
+
+
+class AsyncPgQueueHandler:
+    """
+    asyncio counterpart of PgQueueHandler with AsyncQueueHandler's interface.
+
+    Database calls run in worker threads on the sync engine. At most
+    `prefetch_count` jobs are claimed and not yet settled, like the broker's
+    prefetch window. Held jobs may wait (e.g. in a scheduling window) longer
+    than the lease, so their leases are renewed every third of the lease
+    until they are settled.
+    """
+
+    def __init__(self, channel_name: str, prefetch_count: int = 1, **options: Any) -> None:
+        """
+        Args:
+            channel_name: Queue name (see config.config.queue_names).
+            prefetch_count: Jobs held (claimed, not settled) at most.
+            options: PgQueueHandler settings (lease_seconds, poll_seconds,
+                     max_attempts, engine).
+        """
+        self.logger = logging.getLogger("AsyncPgMsgQueue")
+
+        self.channel_name = channel_name
+        self.prefetch_count = prefetch_count
+
+        self._handler = PgQueueHandler(channel_name, batch_size=prefetch_count, **options)
+        self._outstanding = 0
+        self._settled = asyncio.Event()
+
+        # delivered, unsettled jobs: id -> attempts of the claim
+        self._held: Dict[int, int] = {}
+
+    async def connect(self) -> None:
+        await asyncio.to_thread(self._handler.listen)
+
+    def encode(self, msg: Dict[str, Any]) -> bytes:
+        """to encode json / dict in sendable format"""
+        return self._handler.encode(msg)
+
+    async def publisher(self, data: Dict[str, Any]):
+        await asyncio.to_thread(self._handler.publisher, data)
+
+    async def _settle(self, id: int, requeue: bool) -> None:
+        self._held.pop(id, None)
+        if requeue:
+            await asyncio.to_thread(self._handler.fail, [id])
+        else:
+            await asyncio.to_thread(JobQueueRepository.complete, self._handler.engine, [id])
+
+        self._outstanding -= 1
+        self._settled.set()
+
+    async def _renew_leases(self) -> None:
+        while True:
+            await asyncio.sleep(self._handler.lease_seconds / 3)
+            if self._held:
+                await asyncio.to_thread(self._handler.extend, list(self._held.items()))
+
+    async def messages(self) -> AsyncIterator[PgQueueMessage]:
+        """
+        Iterate over claimed jobs.
+
+        Claims stop while `prefetch_count` jobs are unsettled. Cancelling the
+        consuming task releases jobs claimed but not yet yielded.
+        """
+        handler = self._handler
+        renewer = asyncio.create_task(self._renew_leases())
+
+        try:
+            while not handler._stopping:
+                free = self.prefetch_count - self._outstanding
+                if free <= 0:
+                    self._settled.clear()
+                    await self._settled.wait()
+                    continue
+
+                jobs = await asyncio.to_thread(handler.claim, free)
+                if not jobs:
+                    await asyncio.to_thread(handler.wait, handler.poll_seconds)
+                    continue
+
+                pending = [id for id, _, _ in jobs]
+                try:
+                    for id, payload, attempts in jobs:
+                        pending.remove(id)
+                        self._outstanding += 1
+                        self._held[id] = attempts
+                        yield PgQueueMessage(self, id, payload.encode(handler.encode_type), attempts)
+                finally:
+                    if pending:
+                        await asyncio.to_thread(JobQueueRepository.release, handler.engine, pending)
+        finally:
+            renewer.cancel()
+
+    async def close_queue(self) -> None:
+        """Stop claiming (unsettled jobs are delivered again once their lease ends)."""
+        await asyncio.to_thread(self._handler.close_queue)
+
+
+def create_pg_queue_handler(channel_name: str, asynchronous: bool = False, prefetch_count: int = 1):
+    """
+    Create a PostgreSQL queue handler configured from the environment.
+
+    Args:
+        channel_name: Queue name.
+        asynchronous: Return an AsyncPgQueueHandler (prefetch_count is its batch size).
+        prefetch_count: Jobs held at most by the async handler.
+
+    Environment Variables:
+        PG_QUEUE_BATCH_SIZE:     Jobs claimed per query by blocking consumers (default: 10).
+        PG_QUEUE_LEASE_SECONDS:  Time to finish claimed jobs before redelivery (default: 600).
+        PG_QUEUE_POLL_SECONDS:   Longest wait for a NOTIFY (default: 5).
+        PG_QUEUE_MAX_ATTEMPTS:   Deliveries of a failing job before it is parked (default: 5).
+    """
+    batch_size = get_env("PG_QUEUE_BATCH_SIZE")
+    lease_seconds = get_env("PG_QUEUE_LEASE_SECONDS")
+    poll_seconds = get_env("PG_QUEUE_POLL_SECONDS")
+    max_attempts = get_env("PG_QUEUE_MAX_ATTEMPTS")
+
+    options: Dict[str, Any] = {
+        "lease_seconds": float(lease_seconds) if lease_seconds else None,
+        "poll_seconds": float(poll_seconds) if poll_seconds else None,
+        "max_attempts": int(max_attempts) if max_attempts else None,
+    }
+
+    if asynchronous:
+        return AsyncPgQueueHandler(channel_name, prefetch_count=prefetch_count, **options)
+
+    return PgQueueHandler(
+        channel_name, batch_size=int(batch_size) if batch_size else None, **options
+    )
@@ -108,6 +108,25 @@ class QueueHandler:
         self.connection.close()
 
 
+def queue_backend() -> str:
+    """
+    Environment Variables:
+        QUEUE_BACKEND: "rabbitmq" or "postgres" (job_queue table, see
+                       msg_queue.pg_queue_handler) (default: rabbitmq).
+    """
+    return get_env("QUEUE_BACKEND", default="rabbitmq").lower()
+
+
+def create_queue_handler(channel_name: str):
+    """QueueHandler, or PgQueueHandler with QUEUE_BACKEND=postgres."""
+    if queue_backend() == "postgres":
+        from msg_queue.pg_queue_handler import create_pg_queue_handler
+
+        return create_pg_queue_handler(channel_name)
+
+    return QueueHandler(channel_name)
+
+
 if __name__ == "__main__":
     print("Queue in action")
 
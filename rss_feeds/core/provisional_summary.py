@@ -0,0 +1,88 @@
+"""
+Provisional summaries from feed descriptions.
+
+Scraping and LLM summarization take from seconds to minutes per article. So
+that readers see breaking news right away, the RSS service stores the feed
+description (already cleaned and truncated by `BaseNewsFeedParser`) as a
+provisional summary. The summarization service later replaces it with the
+full summary and marks it final (`summarized_articles.summary_status`).
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+from article_extractors.utils.dates import parse_published_at
+from config.env import get_env
+from database.models.models import SUMMARY_STATUS_PROVISIONAL, SummarizedArticles
+
+
+# Descriptions shorter than this (in characters) are not worth showing
+MIN_PROVISIONAL_CHARS = 40
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+
+def provisional_summary(article: Dict[str, Any]) -> Optional[str]:
+    """
+    Build a provisional summary from a feed article's description.
+
+    The parser cuts long descriptions mid-word and appends "..."; the text is
+    trimmed back to the last complete sentence when there is one.
+
+    Returns:
+        The summary text, or None when the description is missing, too short
+        or only repeats the title.
+    """
+    description = (article.get("description") or "").strip()
+    if not description:
+        return None
+
+    if description.endswith("..."):
+        cut = description[:-3]
+        ends = [m.end() for m in _SENTENCE_END.finditer(cut)]
+        if ends and ends[-1] >= MIN_PROVISIONAL_CHARS:
+            description = cut[: ends[-1]]
+        else:
+            description = cut.rsplit(" ", 1)[0].rstrip(",;:") + "..."
+
+    title = (article.get("title") or "").strip()
+    if len(description) < MIN_PROVISIONAL_CHARS or description.lower() == title.lower():
+        return None
+
+    return description
+
+
+def provisional_article(article: Dict[str, Any]) -> Optional[SummarizedArticles]:
+    """
+    Summarized article row for a freshly stored feed article.
+
+    Args:
+        article: Feed article dict; without "raw_article_id" the caller sets
+                 it (see RawArticleRepository.insert).
+
+    Returns:
+        The row to insert, or None when there is nothing to show yet.
+    """
+    summary = provisional_summary(article)
+    if summary is None:
+        return None
+
+    return SummarizedArticles(
+        title=article.get("title") or "",
+        article_url=article.get("link") or "",
+        source=article.get("source") or "",
+        img_src=article.get("image_url") or None,
+        published_date=article.get("pub_date") or None,
+        published_at=parse_published_at(article.get("pub_date")),
+        raw_article_id=article.get("raw_article_id"),
+        summary=summary,
+        summary_status=SUMMARY_STATUS_PROVISIONAL,
+    )
+
+
+def provisional_summaries_enabled() -> bool:
+    """
+    Environment Variables:
+        PROVISIONAL_SUMMARIES_ENABLED: "false" disables the fast lane (default: true).
+    """
+    return get_env("PROVISIONAL_SUMMARIES_ENABLED", default="true").lower() != "false"
@@ -0,0 +1,224 @@
+"""
+Cross-source near-duplicate story clustering.
+
+The same event is carried by several feeds (TOI, The Hindu, India Today,
+BBC) under slightly different headlines. `StoryClusterer` groups aggregated
+items whose title + description are near-duplicates (MinHash estimate of the
+word-set Jaccard similarity, candidates from LSH) and were published within
+a time window of each other. Only one representative per cluster is sent on
+to scraping and summarization; the other items are stored linked to it.
+
+Raw articles already in the database do not keep their description, so
+items from earlier runs (`seed`) are matched on the title alone.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from article_extractors.utils.dates import parse_published_at
+from article_extractors.utils.fingerprints import MinHasher, MinHashLSH, shingles
+from config.env import get_env
+
+
+def _published_timestamp(value: Optional[str]) -> Optional[float]:
+    """POSIX timestamp of a feed's pub_date, or None if it is missing or unparseable."""
+    published_at = parse_published_at(value)
+    return published_at.timestamp() if published_at is not None else None
+
+
+@dataclass
+class StoryItem:
+    """An article as seen by the clusterer."""
+
+    key: Any
+    published_at: Optional[float]
+    title_signature: np.ndarray
+    full_signature: Optional[np.ndarray]
+    title_words: int
+    representative: Any = None
+    members: List[Any] = field(default_factory=list)
+
+
+class StoryClusterer:
+    """Greedy MinHash/LSH clustering of feed items into stories."""
+
+    # Estimated Jaccard similarity at which two items are the same story
+    THRESHOLD = 0.5
+
+    # Items further apart than this are never clustered together
+    WINDOW_HOURS = 36
+
+    # MinHash signature length
+    NUM_PERM = 128
+
+    # Titles shorter than this (after stopwords) are only matched with a description
+    MIN_TITLE_WORDS = 4
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        window_hours: Optional[float] = None,
+        num_perm: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the clusterer.
+
+        Args:
+            threshold: Override for THRESHOLD.
+            window_hours: Override for WINDOW_HOURS.
+            num_perm: Override for NUM_PERM.
+        """
+        self._logger = logging.getLogger("StoryClusterer")
+        self.threshold = self.THRESHOLD if threshold is None else threshold
+        self.window = (self.WINDOW_HOURS if window_hours is None else window_hours) * 3600.0
+
+        self._hasher = MinHasher(num_perm or self.NUM_PERM)
+        self._title_lsh = MinHashLSH(self._hasher.num_perm, self.threshold)
+        self._full_lsh = MinHashLSH(self._hasher.num_perm, self.threshold)
+        self._items: Dict[Any, StoryItem] = {}
+
+    def _item(
+        self, key: Any, title: str, description: Optional[str], published_at: Optional[float]
+    ) -> StoryItem:
+        title_shingles = shingles(title)
+        full_signature = None
+        if description:
+            full_signature = self._hasher.signature(title_shingles | shingles(description))
+
+        return StoryItem(
+            key=key,
+            published_at=published_at,
+            title_signature=self._hasher.signature(title_shingles),
+            full_signature=full_signature,
+            title_words=len(title_shingles),
+        )
+
+    def _add(self, item: StoryItem) -> None:
+        self._items[item.key] = item
+        if item.title_words >= self.MIN_TITLE_WORDS:
+            self._title_lsh.insert(item.key, item.title_signature)
+        if item.full_signature is not None:
+            self._full_lsh.insert(item.key, item.full_signature)
+
+    def _within_window(self, first: StoryItem, second: StoryItem) -> bool:
+        if first.published_at is None or second.published_at is None:
+            return True
+        return abs(first.published_at - second.published_at) <= self.window
+
+    def _similarity(self, item: StoryItem, other: StoryItem) -> float:
+        # title + description when both sides have one, else the titles alone
+        if item.full_signature is not None and other.full_signature is not None:
+            return MinHasher.jaccard(item.full_signature, other.full_signature)
+        if min(item.title_words, other.title_words) < self.MIN_TITLE_WORDS:
+            return 0.0
+        return MinHasher.jaccard(item.title_signature, other.title_signature)
+
+    def _match(self, item: StoryItem) -> Optional[StoryItem]:
+        candidates: Set[Any] = set()
+        if item.full_signature is not None:
+            candidates |= self._full_lsh.query(item.full_signature)
+        if item.title_words >= self.MIN_TITLE_WORDS:
+            candidates |= self._title_lsh.query(item.title_signature)
+
+        best, best_score = None, self.threshold
+        for key in candidates:
+            other = self._items[key]
+            if not self._within_window(item, other):
+                continue
+            score = self._similarity(item, other)
+            if score >= best_score:
+                best, best_score = other, score
+        return best
+
+    def seed(self, stories: Sequence[Dict[str, Any]]) -> None:
+        """
+        Register representatives from earlier runs.
+
+        Args:
+            stories: Dicts with "id", "title" and "published_at" (raw article rows).
+        """
+        for story in stories:
+            published_at = story.get("published_at")
+            item = self._item(
+                ("db", story["id"]),
+                story.get("title", ""),
+                None,
+                published_at.timestamp() if published_at else None,
+            )
+            item.representative = story["id"]
+            self._add(item)
+
+    def cluster(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cluster aggregated articles into stories.
+
+        Articles are visited oldest first so the first report of a story
+        becomes its representative. Each duplicate gets a "duplicate_of" key:
+        the representative's article dict, or the raw article id for a
+        representative stored by an earlier run.
+
+        Returns:
+            The representatives, in their original order.
+        """
+        order = sorted(
+            range(len(articles)),
+            key=lambda i: _published_timestamp(articles[i].get("pub_date")) or float("inf"),
+        )
+
+        representatives: Set[int] = set()
+        for index in order:
+            article = articles[index]
+            item = self._item(
+                ("new", index),
+                article.get("title", ""),
+                article.get("description"),
+                _published_timestamp(article.get("pub_date")),
+            )
+
+            match = self._match(item)
+            if match is None:
+                representatives.add(index)
+                self._add(item)
+                continue
+
+            root = self._items[match.key]
+            article["duplicate_of"] = (
+                root.representative if root.key[0] == "db" else articles[root.key[1]]
+            )
+            root.members.append(index)
+
+        duplicates = len(articles) - len(representatives)
+        if duplicates:
+            self._logger.info(
+                f"Clustered {len(articles)} articles into {len(representatives)} stories "
+                f"({duplicates} duplicates)"
+            )
+
+        return [article for i, article in enumerate(articles) if i in representatives]
+
+
+def create_story_clusterer() -> Optional[StoryClusterer]:
+    """
+    Create a clusterer configured from the environment.
+
+    Environment Variables:
+        STORY_DEDUP_ENABLED:       "false" disables clustering (default: true).
+        STORY_DEDUP_THRESHOLD:     Similarity at which items are one story (default: 0.5).
+        STORY_DEDUP_WINDOW_HOURS:  Max publish-time gap inside a story (default: 36).
+
+    Returns:
+        StoryClusterer, or None when disabled.
+    """
+    if get_env("STORY_DEDUP_ENABLED", default="true").lower() == "false":
+        return None
+
+    threshold = get_env("STORY_DEDUP_THRESHOLD")
+    window = get_env("STORY_DEDUP_WINDOW_HOURS")
+
+    return StoryClusterer(
+        threshold=float(threshold) if threshold else None,
+        window_hours=float(window) if window else None,
+    )
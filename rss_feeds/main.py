@@ -1,14 +1,35 @@
 from rss_feeds.core.base_parser import BaseNewsFeedParser
 from rss_feeds.core.aggregrator import FeedAggregator
 import logging
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
 from config.config import queue_names
 from rss_feeds.parsers.toi_parser import TimesOfIndiaParser
-from msg_queue.queue_handler import QueueHandler
+from msg_queue.queue_handler import create_queue_handler
 from config.env import get_env
+from article_extractors.utils.dates import parse_published_at
+from article_extractors.utils.urls import canonicalize_url
 from database.connection import DBConnection
 from database.repository.raw_articles import RawArticleRepository
 from database.models.models import RawArticles
+from database.repository.outbox import outbox_enabled
+from rss_feeds.core.provisional_summary import (
+    provisional_article,
+    provisional_summaries_enabled,
+)
+from rss_feeds.core.story_clustering import create_story_clusterer
+
+
+def to_raw_article(article: Dict[str, Any]) -> RawArticles:
+    return RawArticles(
+        title=article.get("title", "NA"),
+        article_url=article.get("link", "NA"),
+        canonical_url=article.get("canonical_url") or canonicalize_url(article.get("link")),
+        source=article.get("source", "NA"),
+        image_url=article.get("image_url", "NA"),
+        published_date=article.get("pub_date", "NA"),
+        published_at=parse_published_at(article.get("pub_date")),
+    )
 
 
 def main():
@@ -32,24 +53,55 @@ def main():
         # database
         database_engine = DBConnection().get_engine()
 
-        # sending articles to scraper queue
-        channel_name = queue_names["rss_to_scraping"]
-        rss_to_scraping_queue = QueueHandler(channel_name=channel_name)
-
-        logger.info(f"Articles count: {len(articles)}")
+        # skip articles stored by an earlier run (or linked twice in this one)
+        for article in articles:
+            article["canonical_url"] = canonicalize_url(article.get("link"))
 
+        seen_urls = RawArticleRepository.get_known_canonical_urls(
+            database_engine, [a["canonical_url"] for a in articles if a["canonical_url"]]
+        )
+        new_articles = []
         for article in articles:
-            # add to database
-            raw_article = RawArticles(
-                title=article.get("title", "NA"),
-                article_url=article.get("link", "NA"),
-                source=article.get("source", "NA"),
-                image_url=article.get("image_url", "NA"),
-                published_date=article.get("pub_date", "NA"),
+            url = article["canonical_url"]
+            if url is not None:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+            new_articles.append(article)
+
+        logger.info(f"Already stored: {len(articles) - len(new_articles)} of {len(articles)} articles")
+        articles = new_articles
+
+        # one representative per cross-source story goes on to scraping
+        stories = articles
+        clusterer = create_story_clusterer()
+        if clusterer is not None:
+            since = datetime.now(timezone.utc) - timedelta(seconds=clusterer.window)
+            clusterer.seed(
+                RawArticleRepository.get_story_representatives(database_engine, since)
             )
+            stories = clusterer.cluster(articles)
+
+        # sending articles to scraper queue (through the outbox: the message
+        # commits with the raw article and the relay publishes it)
+        channel_name = queue_names["rss_to_scraping"]
+        use_outbox = outbox_enabled()
+        outbox_queue = channel_name if use_outbox else None
+        rss_to_scraping_queue = None if use_outbox else create_queue_handler(channel_name)
+
+        logger.info(f"Articles count: {len(articles)}, stories count: {len(stories)}")
 
+        # fast lane: show the feed description until the LLM summary replaces it
+        write_provisional = provisional_summaries_enabled()
+
+        for article in stories:
+            # add to database, with the provisional summary in the same transaction
             raw_article_id = RawArticleRepository.insert(
-                engine=database_engine, data=raw_article
+                engine=database_engine,
+                data=to_raw_article(article),
+                summary=provisional_article(article) if write_provisional else None,
+                outbox_queue=outbox_queue,
+                message=article,
             )
 
             if raw_article_id is None:
@@ -59,9 +111,37 @@ def main():
             article["raw_article_id"] = raw_article_id
 
             # push to queue
-            rss_to_scraping_queue.publisher(article)
+            if rss_to_scraping_queue is not None:
+                rss_to_scraping_queue.publisher(article)
+
+        # duplicates are stored linked to their representative, not summarized
+        for article in articles:
+            if "duplicate_of" not in article:
+                continue
+
+            representative = article.pop("duplicate_of")
+            if isinstance(representative, dict):
+                representative = representative.get("raw_article_id")
+
+            raw_article = to_raw_article(article)
+            raw_article.duplicate_of_id = representative
+
+            # the representative could not be stored: summarize this copy instead
+            summarize_copy = representative is None
+            raw_article_id = RawArticleRepository.insert(
+                engine=database_engine,
+                data=raw_article,
+                outbox_queue=outbox_queue if summarize_copy else None,
+                message=article,
+            )
+
+            if summarize_copy and raw_article_id is not None and rss_to_scraping_queue is not None:
+                article["raw_article_id"] = raw_article_id
+                rss_to_scraping_queue.publisher(article)
 
-        logger.info(f"Articles are send to queue: {channel_name}")
+        logger.info(
+            f"Articles are send to {'the outbox for' if use_outbox else 'queue:'} {channel_name}"
+        )
 
     except Exception as e:
         logger.error(f"Main fun {str(e)}")
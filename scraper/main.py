@@ -1,11 +1,15 @@
 import logging
 from config.config import queue_names
-from msg_queue.queue_handler import QueueHandler
+from msg_queue.queue_handler import create_queue_handler
 from scraper.pre_processing.toi.toi_pre_processing import TOIPreprocessing
 from config.env import get_env
 import json
 from typing import List
 from database.models.models import SummarizedArticles
+from datetime import datetime, timezone
+from scraper.revisit import create_revisit_policy
+from article_extractors.utils.dates import parse_published_at
+from article_extractors.utils.fingerprints import fingerprint
 
 
 def main():
@@ -20,16 +24,25 @@ def main():
     try:
         # get data from rss queue
         queue_name_with_incomming_data = queue_names["rss_to_scraping"]
-        incomming_queue = QueueHandler(queue_name_with_incomming_data)
+        incomming_queue = create_queue_handler(queue_name_with_incomming_data)
+
+        # queue for summmarization service (through the outbox: the message
+        # commits with the scraped article and the relay publishes it)
+        from database.repository.outbox import outbox_enabled
 
-        # queue for summmarization service
         queue_name_summarization_service = queue_names["scraping_to_summmarisation"]
-        queue_to_summarization = QueueHandler(queue_name_summarization_service)
+        use_outbox = outbox_enabled()
+        outbox_queue = queue_name_summarization_service if use_outbox else None
+        queue_to_summarization = (
+            None if use_outbox else create_queue_handler(queue_name_summarization_service)
+        )
 
         from database.connection import DBConnection
 
         engine = DBConnection().get_engine()
 
+        revisit_policy = create_revisit_policy()
+
         def data_reciever(body):
             """
             Function to handle recieved data from rss service and
@@ -53,7 +66,15 @@ def main():
                     logger.warning(f"Article scraping failed")
                     return
 
-                # TODO: in later releases upload non-summarized body onto aws string in file
+                # fingerprints and first revisit for change detection
+                content_hash, body_simhash = fingerprint(scraped_article_with_body["body"])
+                now = datetime.now(timezone.utc)
+
+                published_date = article_in_json_format["pub_date"] or scraped_article_with_body.get(
+                    "published_date", None
+                )
+
+                # the body itself is stored compressed in article_bodies
                 parsed_article = SummarizedArticles(
                     title=scraped_article_with_body.get("title")
                     or article_in_json_format["title"]
@@ -61,11 +82,15 @@ def main():
                     article_url=article_in_json_format["link"] or None,
                     source=article_in_json_format["source"] or "Bhanu",
                     img_src=article_in_json_format["image_url"] or None,
-                    published_date=article_in_json_format["pub_date"]
-                    or scraped_article_with_body.get("published_date", None),
+                    published_date=published_date,
+                    published_at=parse_published_at(published_date),
                     raw_article_id=article_in_json_format["raw_article_id"] or None,
-                    body=scraped_article_with_body['body'] or None
-                    # TODO: call llm or check for category
+                    content_hash=content_hash,
+                    simhash=body_simhash,
+                    version=1,
+                    last_checked_at=now,
+                    next_check_at=revisit_policy.next_check_at(now, now),
+                    # category_id is assigned by the summarization service
                 )
 
                 # push articles meta data to database
@@ -73,8 +98,24 @@ def main():
                     PresummarizedArticleRepository,
                 )
 
-                article_id = PresummarizedArticleRepository.insert(
-                    engine=engine, data=parsed_article
+                # body for the summarization service ("id" is the stored article's)
+                message = {
+                    "body": scraped_article_with_body.get("body"),
+                    "raw_article_id": article_in_json_format["raw_article_id"],
+                    # used by the summarization service to schedule freshest first
+                    "published_date": parsed_article.published_date,
+                    "source": parsed_article.source,
+                    # a summary is only stored for the version it was made from
+                    "version": parsed_article.version,
+                }
+
+                # the RSS service may already have stored a provisional summary
+                article_id = PresummarizedArticleRepository.upsert_by_raw_article_id(
+                    engine=engine,
+                    data=parsed_article,
+                    body=scraped_article_with_body["body"],
+                    outbox_queue=outbox_queue,
+                    message=message,
                 )
 
                 if article_id is None:
@@ -82,13 +123,8 @@ def main():
                     return
 
                 # send id with body to summarization service
-                queue_to_summarization.publisher(
-                    {
-                        "id": article_id,
-                        "body": scraped_article_with_body.get("body"),
-                        "raw_article_id": article_in_json_format["raw_article_id"],
-                    }
-                )
+                if queue_to_summarization is not None:
+                    queue_to_summarization.publisher({"id": article_id, **message})
 
         incomming_queue.consume(call_back=data_reciever)
 
@@ -0,0 +1,309 @@
+"""
+Change detection for articles that are updated after publication.
+
+Breaking stories are edited for hours after they first appear (TOI marks
+them "Updated: ..."), but the scraper stores each URL once. The revisit job
+re-fetches recently scraped articles on a decaying schedule and compares
+body fingerprints:
+
+- content hash (sha256): identical bodies are skipped without further work
+- SimHash distance: small edits (typos, a reworded sentence) update the
+  stored body and fingerprints but keep the summary; a distance above
+  SIMHASH_DISTANCE is a significant change, so the previous body and summary
+  are kept in summarized_article_versions and the article is sent back to
+  the summarization service
+
+The revisit interval grows with the article's age (AGE_FACTOR of its age,
+between MIN_INTERVAL_MINUTES and MAX_INTERVAL_MINUTES) and revisits stop
+after MAX_AGE_HOURS.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from article_extractors.utils.fingerprints import fingerprint, hamming_distance
+from config.env import get_env
+from database.connection import DBConnection
+from database.repository.summarized_articles import PresummarizedArticleRepository
+
+
+class RevisitPolicy:
+    """Decaying revisit schedule and change significance."""
+
+    # Shortest time between two fetches of an article
+    MIN_INTERVAL_MINUTES = 30
+
+    # Longest time between two fetches of an article
+    MAX_INTERVAL_MINUTES = 12 * 60
+
+    # Next revisit after this fraction of the article's age
+    AGE_FACTOR = 0.5
+
+    # Articles older than this are no longer revisited
+    MAX_AGE_HOURS = 72
+
+    # SimHash bits that must differ for a change to be re-summarized
+    SIMHASH_DISTANCE = 6
+
+    def __init__(
+        self,
+        min_interval_minutes: Optional[float] = None,
+        max_interval_minutes: Optional[float] = None,
+        max_age_hours: Optional[float] = None,
+        simhash_distance: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the policy; every argument overrides the class default.
+        """
+        self.min_interval = (min_interval_minutes or self.MIN_INTERVAL_MINUTES) * 60
+        self.max_interval = (max_interval_minutes or self.MAX_INTERVAL_MINUTES) * 60
+        self.age_factor = self.AGE_FACTOR
+        self.max_age = (max_age_hours or self.MAX_AGE_HOURS) * 3600
+        self.simhash_distance = (
+            self.SIMHASH_DISTANCE if simhash_distance is None else simhash_distance
+        )
+
+    def next_check_at(self, first_seen: datetime, now: datetime) -> Optional[datetime]:
+        """
+        When to fetch the article next.
+
+        Args:
+            first_seen: When the article was first scraped.
+            now: Current time (same timezone convention as first_seen).
+
+        Returns:
+            Time of the next revisit, or None when the article is too old.
+        """
+        age = max((now - first_seen).total_seconds(), 0.0)
+        if age >= self.max_age:
+            return None
+
+        interval = min(max(age * self.age_factor, self.min_interval), self.max_interval)
+        return now + timedelta(seconds=interval)
+
+    def is_significant(self, old_simhash: Optional[int], new_simhash: Optional[int]) -> bool:
+        """Whether a changed body needs a new summary."""
+        if old_simhash is None or new_simhash is None:
+            return True
+        return hamming_distance(old_simhash, new_simhash) > self.simhash_distance
+
+
+def create_revisit_policy() -> RevisitPolicy:
+    """
+    Create a policy configured from the environment.
+
+    Environment Variables:
+        REVISIT_MIN_INTERVAL_MINUTES:  Shortest revisit interval (default: 30).
+        REVISIT_MAX_INTERVAL_MINUTES:  Longest revisit interval (default: 720).
+        REVISIT_MAX_AGE_HOURS:         Stop revisiting after this age (default: 72).
+        REVISIT_SIMHASH_DISTANCE:      Differing SimHash bits that trigger re-summarization (default: 6).
+    """
+    min_interval = get_env("REVISIT_MIN_INTERVAL_MINUTES")
+    max_interval = get_env("REVISIT_MAX_INTERVAL_MINUTES")
+    max_age = get_env("REVISIT_MAX_AGE_HOURS")
+    distance = get_env("REVISIT_SIMHASH_DISTANCE")
+
+    return RevisitPolicy(
+        min_interval_minutes=float(min_interval) if min_interval else None,
+        max_interval_minutes=float(max_interval) if max_interval else None,
+        max_age_hours=float(max_age) if max_age else None,
+        simhash_distance=int(distance) if distance else None,
+    )
+
+
+class RevisitJob:
+    """Fetches due articles again and hands significant changes to summarization."""
+
+    # Articles fetched per pass
+    BATCH_SIZE = 50
+
+    # Seconds to sleep when nothing is due
+    POLL_SECONDS = 60
+
+    def __init__(
+        self,
+        engine,
+        summarization_queue,
+        policy: Optional[RevisitPolicy] = None,
+        batch_size: Optional[int] = None,
+        outbox_queue: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the job.
+
+        Args:
+            engine: SQLAlchemy database engine.
+            summarization_queue: QueueHandler of the summarization service
+                                 (None when messages go through the outbox).
+            policy: Revisit schedule (default from the environment).
+            batch_size: Override for BATCH_SIZE.
+            outbox_queue: Summarization queue name when OUTBOX_ENABLED: the
+                          message commits with the revision.
+        """
+        self._logger = logging.getLogger("RevisitJob")
+        self.engine = engine
+        self.summarization_queue = summarization_queue
+        self.outbox_queue = outbox_queue
+        self.policy = policy or create_revisit_policy()
+        self.batch_size = batch_size or self.BATCH_SIZE
+
+        self.stats = {"checked": 0, "unchanged": 0, "minor": 0, "significant": 0, "failed": 0}
+
+    def _fetch_body(self, url: str) -> Optional[str]:
+        from scraper.pre_processing.toi.toi_pre_processing import TOIPreprocessing
+
+        scraped = TOIPreprocessing(url).get_article_data()
+        return scraped.get("body") if scraped else None
+
+    def check(self, article) -> str:
+        """
+        Revisit one article.
+
+        Args:
+            article: Row from `get_due_for_revisit`.
+
+        Returns:
+            "unchanged", "minor", "significant" or "failed".
+        """
+        now = datetime.now(timezone.utc)
+
+        # "createdAt" is a naive UTC timestamp
+        first_seen = article.createdAt
+        if first_seen.tzinfo is None:
+            first_seen = first_seen.replace(tzinfo=timezone.utc)
+        next_check_at = self.policy.next_check_at(first_seen, now)
+
+        body = self._fetch_body(article.article_url)
+        content_hash, new_simhash = fingerprint(body)
+
+        if content_hash is None:
+            outcome = "failed"
+            PresummarizedArticleRepository.schedule_revisit(
+                self.engine, article.id, checked_at=now, next_check_at=next_check_at
+            )
+
+        elif content_hash == article.content_hash:
+            outcome = "unchanged"
+            PresummarizedArticleRepository.schedule_revisit(
+                self.engine, article.id, checked_at=now, next_check_at=next_check_at
+            )
+
+        elif not self.policy.is_significant(article.simhash, new_simhash):
+            outcome = "minor"
+            PresummarizedArticleRepository.schedule_revisit(
+                self.engine,
+                article.id,
+                checked_at=now,
+                next_check_at=next_check_at,
+                body=body,
+                content_hash=content_hash,
+                simhash=new_simhash,
+            )
+
+        else:
+            outcome = "significant"
+            message = {
+                "body": body,
+                "raw_article_id": article.raw_article_id,
+                "published_date": article.published_date,
+                # the summarization service schedules revisions by revision
+                # time, not by the (possibly hours old) publish time
+                "revised_at": now.isoformat(),
+                "source": article.source,
+            }
+            version = PresummarizedArticleRepository.record_revision(
+                self.engine,
+                article.id,
+                body=body,
+                content_hash=content_hash,
+                simhash=new_simhash,
+                checked_at=now,
+                next_check_at=next_check_at,
+                outbox_queue=self.outbox_queue,
+                message=message,
+            )
+            if version is None:
+                outcome = "failed"
+            else:
+                self._logger.info(
+                    f"Article {article.id} changed significantly, re-summarizing version {version}"
+                )
+                if self.summarization_queue is not None:
+                    self.summarization_queue.publisher(
+                        {"id": article.id, **message, "version": version}
+                    )
+
+        self.stats["checked"] += 1
+        self.stats[outcome] += 1
+        return outcome
+
+    def run_once(self) -> int:
+        """
+        Revisit every article that is due, one batch.
+
+        Returns:
+            Number of articles checked.
+        """
+        now = datetime.now(timezone.utc)
+        due = PresummarizedArticleRepository.get_due_for_revisit(
+            self.engine,
+            now,
+            self.batch_size,
+            created_after=now - timedelta(seconds=self.policy.max_age),
+        )
+
+        for article in due:
+            try:
+                self.check(article)
+            except Exception as e:
+                self._logger.error(f"Revisit of article {article.id} failed: {str(e)}")
+
+        return len(due)
+
+    def run_forever(self) -> None:
+        while True:
+            checked = self.run_once()
+            if checked:
+                self._logger.info(
+                    f"Revisit pass: {checked} checked, totals {self.stats}, "
+                    f"database pool {DBConnection.pool_stats(self.engine)}"
+                )
+
+            # keep going while a full batch was due
+            if checked < self.batch_size:
+                time.sleep(self.POLL_SECONDS)
+
+
+def main():
+    from config.config import queue_names, service_names
+    from msg_queue.queue_handler import create_queue_handler
+
+    service_name = service_names["revisit_service"]
+
+    logger = logging.getLogger(f"Revisit service: {service_name}")
+
+    try:
+        engine = DBConnection().get_engine()
+
+        # through the outbox the re-summarization message commits with the revision
+        from database.repository.outbox import outbox_enabled
+
+        queue_name = queue_names["scraping_to_summmarisation"]
+        use_outbox = outbox_enabled()
+        summarization_queue = None if use_outbox else create_queue_handler(queue_name)
+
+        batch_size = get_env("REVISIT_BATCH_SIZE")
+
+        job = RevisitJob(
+            engine,
+            summarization_queue,
+            batch_size=int(batch_size) if batch_size else None,
+            outbox_queue=queue_name if use_outbox else None,
+        )
+        job.run_forever()
+
+    except Exception as e:
+        logger.error(f"Error in {service_name}: {str(e)}")
+        raise e
@@ -0,0 +1,130 @@
+"""
+Load test for the summarizer against the local OpenRouter mock.
+
+Starts llm_explorer.mock_server in-process (or uses --url), fires
+--articles summarizations with --concurrency in flight, then reports
+throughput, latency percentiles and the mock's request counters.
+
+Usage:
+    python scripts/load_test_summarizer.py --articles 500 --concurrency 32 \
+        --latency lognormal:0.8:0.5 --rpm 600 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llm_explorer.mock_server import (  # noqa: E402
+    COMPLETIONS_PATH,
+    LatencyDistribution,
+    MockServerConfig,
+    create_app,
+)
+from temp import article as SAMPLE_ARTICLE  # noqa: E402
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    runner: Optional[web.AppRunner] = None
+    url = args.url
+
+    if url is None:
+        config = MockServerConfig(
+            latency=LatencyDistribution.parse(args.latency),
+            token_delay=args.token_delay,
+            error_rate=args.error_rate,
+            requests_per_minute=args.rpm,
+            seed=args.seed,
+        )
+        runner = web.AppRunner(create_app(config))
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", args.port).start()
+        url = f"http://127.0.0.1:{args.port}{COMPLETIONS_PATH}"
+
+    os.environ["OPENROUTER_API_URL"] = url
+    os.environ.setdefault("OPENROUTER_API_KEY", "mock-key")
+
+    from llm_explorer.summarizer_factory import create_summarizer
+
+    summarizer = create_summarizer()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(i: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                summary = await summarizer.summarize_article(SAMPLE_ARTICLE)
+            except Exception:
+                summary = None
+            if summary:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(args.articles)])
+    elapsed = time.perf_counter() - started
+
+    if hasattr(summarizer, "close"):
+        await summarizer.close()
+
+    print(f"Backend:      {summarizer.get_model_name()}")
+    print(f"Articles:     {args.articles} (concurrency {args.concurrency})")
+    print(f"Succeeded:    {len(latencies)}  Failed: {failures}")
+    print(f"Wall clock:   {elapsed:.2f}s  Throughput: {len(latencies) / elapsed:.1f} articles/s")
+    print(
+        f"Latency:      p50 {percentile(latencies, 50):.3f}s  "
+        f"p95 {percentile(latencies, 95):.3f}s  p99 {percentile(latencies, 99):.3f}s"
+    )
+
+    stats_url = url.replace(COMPLETIONS_PATH, "/stats")
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(stats_url) as response:
+                print(f"Mock server:  {await response.json()}")
+    except aiohttp.ClientError:
+        pass
+
+    if runner is not None:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarizer load test against the mock API")
+    parser.add_argument("--url", default=None, help="Use an already running server")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", default="lognormal:0.5:0.5")
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
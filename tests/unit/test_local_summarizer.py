@@ -0,0 +1,217 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from llm_explorer.base_summarizer import SummarizationError
+from llm_explorer.local_summarizer import DynamicBatcher, LocalSeq2SeqSummarizer
+
+
+class RecordingModel:
+    """Stands in for the forward pass: records each batch, upper-cases the texts."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("out of memory")
+        return [text.upper() for text in texts]
+
+
+# --- DynamicBatcher ---------------------------------------------------------
+
+
+async def test_texts_are_batched_by_bucket():
+    model = RecordingModel()
+    batcher = DynamicBatcher(model, bucket_of=len, max_batch_size=8, max_wait=0.05)
+
+    outputs = await asyncio.gather(*(batcher.submit(text) for text in ["a", "bb", "c", "dd", "e"]))
+    await batcher.close()
+
+    assert outputs == ["A", "BB", "C", "DD", "E"]
+    assert sorted(sorted(batch) for batch in model.batches) == [["a", "c", "e"], ["bb", "dd"]]
+
+
+async def test_full_batch_runs_without_waiting():
+    model = RecordingModel()
+    batcher = DynamicBatcher(model, bucket_of=len, max_batch_size=2, max_wait=10.0)
+
+    outputs = await asyncio.wait_for(
+        asyncio.gather(batcher.submit("a"), batcher.submit("b")), timeout=1.0
+    )
+    await batcher.close()
+
+    assert outputs == ["A", "B"]
+    assert model.batches == [["a", "b"]]
+
+
+async def test_partial_batch_is_flushed_after_max_wait():
+    model = RecordingModel()
+    batcher = DynamicBatcher(model, bucket_of=len, max_batch_size=8, max_wait=0.05)
+
+    start = time.monotonic()
+    output = await asyncio.wait_for(batcher.submit("a"), timeout=1.0)
+    elapsed = time.monotonic() - start
+    await batcher.close()
+
+    assert output == "A"
+    assert elapsed >= 0.05
+    assert model.batches == [["a"]]
+
+
+async def test_cancelled_callers_are_skipped():
+    model = RecordingModel()
+    batcher = DynamicBatcher(model, bucket_of=len, max_batch_size=8, max_wait=0.05)
+
+    gone = asyncio.create_task(batcher.submit("a"))
+    waiting = asyncio.create_task(batcher.submit("b"))
+    await asyncio.sleep(0)
+    gone.cancel()
+
+    assert await waiting == "B"
+    await batcher.close()
+
+    assert gone.cancelled()
+    assert model.batches == [["b"]]
+
+
+async def test_batch_errors_reach_every_caller():
+    batcher = DynamicBatcher(RecordingModel(fail=True), bucket_of=len, max_wait=0.01)
+
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+    )
+    await batcher.close()
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+
+async def test_close_fails_pending_requests():
+    model = RecordingModel()
+    batcher = DynamicBatcher(model, bucket_of=len, max_batch_size=8, max_wait=10.0)
+
+    pending = asyncio.create_task(batcher.submit("a"))
+    await asyncio.sleep(0)
+    await batcher.close()
+
+    with pytest.raises(SummarizationError):
+        await pending
+    assert model.batches == []
+
+
+# --- LocalSeq2SeqSummarizer with a tiny random BART -------------------------
+
+
+def _byte_level_alphabet():
+    """The 256 symbols byte-level BPE maps bytes to (GPT-2 / BART)."""
+    printable = (
+        list(range(ord("!"), ord("~") + 1))
+        + list(range(ord("¡"), ord("¬") + 1))
+        + list(range(ord("®"), ord("ÿ") + 1))
+    )
+    codes = printable[:]
+    extra = 0
+    for byte in range(256):
+        if byte not in printable:
+            codes.append(256 + extra)
+            extra += 1
+    return [chr(code) for code in codes]
+
+
+@pytest.fixture(scope="module")
+def tiny_bart_path(tmp_path_factory):
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+
+    path = tmp_path_factory.mktemp("tiny-bart")
+
+    # one token per byte, no merges
+    tokens = ["<s>", "<pad>", "</s>", "<unk>"] + _byte_level_alphabet() + ["<mask>"]
+    (path / "vocab.json").write_text(json.dumps({token: id for id, token in enumerate(tokens)}))
+    (path / "merges.txt").write_text("#version: 0.2\n")
+    tokenizer = transformers.BartTokenizer(
+        vocab_file=str(path / "vocab.json"), merges_file=str(path / "merges.txt")
+    )
+
+    config = transformers.BartConfig(
+        vocab_size=len(tokens),
+        d_model=16,
+        encoder_layers=1,
+        decoder_layers=1,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=32,
+        decoder_ffn_dim=32,
+        max_position_embeddings=256,
+        pad_token_id=1,
+        bos_token_id=0,
+        eos_token_id=2,
+        decoder_start_token_id=2,
+    )
+    torch.manual_seed(0)
+    model = transformers.AutoModelForSeq2SeqLM.from_config(config)
+
+    model.save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return str(path)
+
+
+@pytest.fixture
+async def local_summarizer(tiny_bart_path):
+    summarizer = LocalSeq2SeqSummarizer(
+        model_path=tiny_bart_path, num_threads=1, max_batch_wait=0.01
+    )
+    yield summarizer
+    await summarizer.close()
+
+
+async def test_model_limits_come_from_the_checkpoint(local_summarizer, tiny_bart_path):
+    # input is capped at the model's position embeddings, below MAX_INPUT_TOKENS
+    assert local_summarizer._max_input_tokens == 256
+    assert local_summarizer.get_model_name() == f"local:{tiny_bart_path}"
+
+
+async def test_generate_batch_returns_one_text_per_input(local_summarizer):
+    outputs = local_summarizer._generate_batch(["first article " * 50, "second"])
+
+    assert len(outputs) == 2
+    assert all(isinstance(output, str) for output in outputs)
+
+
+async def test_concurrent_articles_share_a_batch(local_summarizer):
+    batches = []
+    run_batch = local_summarizer._batcher._run_batch
+
+    def recording(texts):
+        batches.append(len(texts))
+        return run_batch(texts)
+
+    local_summarizer._batcher._run_batch = recording
+
+    article = "The council approved the new budget on Tuesday. " * 15
+    summaries = await asyncio.gather(
+        local_summarizer.summarize_article(article),
+        local_summarizer.summarize_article(article + " More."),
+    )
+
+    assert batches == [2]
+    assert all(summary is None or isinstance(summary, str) for summary in summaries)
+
+
+async def test_short_articles_are_returned_as_is(local_summarizer):
+    assert await local_summarizer.summarize_article("Too short to summarize.") == (
+        "Too short to summarize."
+    )
+
+
+def test_missing_model_path_is_an_error(monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    monkeypatch.delenv("LOCAL_MODEL_PATH", raising=False)
+
+    with pytest.raises(SummarizationError):
+        LocalSeq2SeqSummarizer()
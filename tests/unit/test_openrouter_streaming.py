@@ -0,0 +1,166 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from llm_explorer.accounting import UsageAccountant
+from llm_explorer.mock_server import (
+    COMPLETIONS_PATH,
+    REPLY_WORDS,
+    MockServerConfig,
+    _build_reply,
+    create_app,
+)
+from llm_explorer.openrouter_summarizer import OpenRouterSummarizer
+from llm_explorer.rate_limiter import InMemoryRateLimitStore, RateLimiter, estimate_tokens
+
+ARTICLE = " ".join(
+    f"Sentence number {i} of the article describes the budget vote in some detail."
+    for i in range(1, 21)
+)
+
+MESSAGES = [
+    {"role": "system", "content": "You are a news editor."},
+    {"role": "user", "content": f"Summarize this.\n\nArticle:\n{ARTICLE}"},
+]
+
+
+@pytest.fixture
+async def mock_api():
+    server = TestServer(create_app(MockServerConfig(token_delay=0.0)))
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def summarizer(mock_api, monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("OPENROUTER_STREAM", "true")
+    summarizer = OpenRouterSummarizer(
+        model="mock/model",
+        api_url=str(mock_api.make_url(COMPLETIONS_PATH)),
+        rate_limiter=RateLimiter(store=InMemoryRateLimitStore(), tokens_per_minute=600),
+        accountant=UsageAccountant(),
+    )
+    yield summarizer
+    await summarizer.close()
+
+
+# --- SSE framing ------------------------------------------------------------
+
+
+async def sse_events(*writes: bytes):
+    """Serve `writes` as separate writes of one response and collect the events."""
+
+    async def handler(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for data in writes:
+            await response.write(data)
+            await asyncio.sleep(0.01)
+        return response
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(server.make_url("/")) as response:
+                events = OpenRouterSummarizer._iter_sse_data(response.content)
+                return [data async for data in events]
+    finally:
+        await server.close()
+
+
+async def test_frames_split_across_writes_are_reassembled():
+    events = await sse_events(b'data: {"a"', b': 1}\n', b"\n", b"data: [DO", b"NE]\n\n")
+
+    assert events == ['{"a": 1}', "[DONE]"]
+
+
+async def test_multi_line_data_is_joined_with_newlines():
+    events = await sse_events(b"data: first\r\ndata:second\r\nevent: x\r\n\r\n")
+
+    assert events == ["first\nsecond"]
+
+
+async def test_comments_are_skipped_and_a_trailing_event_is_kept():
+    events = await sse_events(b": OPENROUTER PROCESSING\n\n", b"data: last")
+
+    assert events == ["last"]
+
+
+# --- early stop point -------------------------------------------------------
+
+
+def test_early_stop_cuts_at_the_first_sentence_boundary_past_the_limit(summarizer):
+    text = "One two three. Four five six. Seven eight."
+
+    cut = summarizer._early_stop_point(text, 4)
+
+    assert text[:cut] == "One two three. Four five six."
+
+
+def test_early_stop_waits_for_a_boundary(summarizer):
+    # enough words but the sentence is still going (and "3." is not a boundary)
+    assert summarizer._early_stop_point("One two. Three is 3.5 and four", 4) is None
+    assert summarizer._early_stop_point("One two. Three", 4) is None
+
+
+def test_early_stop_keeps_closing_quotes(summarizer):
+    text = 'He said "it passed." Then left'
+
+    assert text[: summarizer._early_stop_point(text, 3)] == 'He said "it passed."'
+
+
+# --- streamed completions against the mock server ---------------------------
+
+
+async def test_full_stream_ends_at_done_with_the_provider_usage(summarizer, mock_api):
+    data = await summarizer._send_request(MESSAGES)
+
+    content = data["choices"][0]["message"]["content"]
+    assert content == _build_reply(MESSAGES, max_words=REPLY_WORDS)
+    assert data["choices"][0]["finish_reason"] == "stop"
+    assert data["streamed"] is True
+    assert data["stopped_early"] is False
+    assert data["time_to_first_token"] is not None
+    assert "estimated" not in data["usage"]
+    assert mock_api.app["stats"]["completed"] == 1
+
+
+async def test_early_stop_cuts_the_stream_and_estimates_usage(summarizer):
+    data = await summarizer._send_request(MESSAGES, word_limit=30)
+
+    content = data["choices"][0]["message"]["content"]
+    assert data["stopped_early"] is True
+    assert data["choices"][0]["finish_reason"] == "early_stop"
+    assert content.endswith(".")
+    assert 30 <= len(content.split()) < 30 + 13  # at most one sentence past the limit
+
+    # the usage block comes last, so a stopped stream never sees it
+    prompt_tokens = estimate_tokens(MESSAGES)
+    assert data["usage"] == {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(content) // 4,
+        "total_tokens": prompt_tokens + len(content) // 4,
+        "estimated": True,
+    }
+
+
+async def test_early_stopped_call_is_accounted_with_the_estimate(summarizer):
+    data = await summarizer._call_api(MESSAGES, word_limit=30)
+
+    (call,) = summarizer._accountant._calls["mock/model"]
+    assert call.streamed is True
+    assert call.succeeded is True
+    assert call.prompt_tokens == data["usage"]["prompt_tokens"]
+    assert call.completion_tokens == data["usage"]["completion_tokens"]
+
+    # only the estimated usage stays reserved, the rest went back to the limiter
+    tokens = summarizer._rate_limiter._store._state.tokens
+    assert tokens.capacity - tokens.level == pytest.approx(data["usage"]["total_tokens"], abs=5)
@@ -0,0 +1,248 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from llm_explorer.rate_limiter import (
+    InMemoryRateLimitStore,
+    RateLimiter,
+    RateLimitState,
+    RateLimitUpdate,
+    SQLiteRateLimitStore,
+    TokenBucket,
+    _parse_duration,
+    parse_rate_limit_headers,
+)
+
+NOW = 1_700_000_000.0
+
+
+# --- header parsing ---------------------------------------------------------
+
+
+def test_openrouter_headers():
+    update = parse_rate_limit_headers(
+        {"X-RateLimit-Limit": "200", "X-RateLimit-Remaining": "150", "X-RateLimit-Reset": "0"},
+        NOW,
+    )
+
+    assert update.requests_limit == 200
+    assert update.requests_remaining == 150
+    assert update.tokens_limit is None
+    assert update.blocked_until is None
+
+
+def test_openai_style_headers():
+    update = parse_rate_limit_headers(
+        {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "59",
+            "x-ratelimit-limit-tokens": "90000",
+            "x-ratelimit-remaining-tokens": "85000",
+        },
+        NOW,
+    )
+
+    assert (update.requests_limit, update.requests_remaining) == (60, 59)
+    assert (update.tokens_limit, update.tokens_remaining) == (90000, 85000)
+
+
+@pytest.mark.parametrize(
+    "reset, expected",
+    [
+        (str(int((NOW + 30) * 1000)), NOW + 30),  # epoch milliseconds (OpenRouter)
+        (str(int(NOW + 30)), NOW + 30),  # epoch seconds
+        ("30", NOW + 30),  # relative seconds
+        ("20ms", NOW + 0.02),
+        ("6m0s", NOW + 360),
+    ],
+)
+def test_exhausted_requests_block_until_reset(reset, expected):
+    update = parse_rate_limit_headers(
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}, NOW
+    )
+
+    assert update.blocked_until == pytest.approx(expected)
+
+
+def test_exhausted_tokens_block_until_token_reset():
+    update = parse_rate_limit_headers(
+        {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "1.5s"}, NOW
+    )
+
+    assert update.blocked_until == pytest.approx(NOW + 1.5)
+
+
+def test_reset_in_the_past_does_not_block():
+    update = parse_rate_limit_headers(
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int((NOW - 5) * 1000))}, NOW
+    )
+
+    assert update.blocked_until is None
+
+
+def test_retry_after_seconds():
+    assert parse_rate_limit_headers({"Retry-After": "12"}, NOW).blocked_until == NOW + 12
+
+
+def test_retry_after_http_date():
+    update = parse_rate_limit_headers({"Retry-After": formatdate(NOW + 90, usegmt=True)}, NOW)
+
+    assert update.blocked_until == pytest.approx(NOW + 90)
+
+
+def test_unparseable_retry_after_is_ignored():
+    assert parse_rate_limit_headers({"Retry-After": "soon"}, NOW).blocked_until is None
+
+
+def test_latest_of_retry_after_and_reset_wins():
+    update = parse_rate_limit_headers(
+        {"Retry-After": "5", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "20"}, NOW
+    )
+
+    assert update.blocked_until == NOW + 20
+
+
+@pytest.mark.parametrize("value", ["5x", "ms", "1h5q"])
+def test_invalid_durations(value):
+    assert _parse_duration(value) is None
+
+
+# --- bucket math ------------------------------------------------------------
+
+
+def test_unknown_limit_never_blocks():
+    bucket = TokenBucket()
+
+    bucket.take(1_000_000)
+    assert bucket.wait_time(1_000_000) == 0.0
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity():
+    bucket = TokenBucket()
+    bucket.set_limit(60, 60.0, NOW)  # one per second, starts full
+
+    bucket.take(60)
+    assert bucket.wait_time(10) == pytest.approx(10.0)
+
+    bucket.refill(NOW + 4)
+    assert bucket.level == pytest.approx(4.0)
+
+    bucket.refill(NOW + 1000)
+    assert bucket.level == 60
+
+
+def test_request_larger_than_the_bucket_waits_for_a_full_bucket():
+    bucket = TokenBucket()
+    bucket.set_limit(100, 60.0, NOW)
+    bucket.take(100)
+
+    assert bucket.wait_time(500) == pytest.approx(60.0)
+
+
+def test_lower_limit_caps_the_level():
+    bucket = TokenBucket()
+    bucket.set_limit(100, 60.0, NOW)
+    bucket.set_limit(10, 60.0, NOW)
+
+    assert (bucket.capacity, bucket.level) == (10, 10)
+
+
+def test_reserve_takes_from_both_buckets_or_reports_the_wait():
+    state = RateLimitState()
+    RateLimitUpdate(requests_limit=2, tokens_limit=600).apply(state, 60.0, NOW)
+
+    assert state.reserve(500, NOW) == 0.0
+    assert (state.requests.level, state.tokens.level) == (1, 100)
+
+    # 400 more tokens at 10 per second
+    assert state.reserve(500, NOW) == pytest.approx(40.0)
+    assert state.requests.level == 1
+
+
+def test_blocked_state_waits_until_unblocked():
+    state = RateLimitState()
+    RateLimitUpdate(blocked_until=NOW + 3).apply(state, 60.0, NOW)
+
+    assert state.reserve(0, NOW) == pytest.approx(3.0)
+    assert state.reserve(0, NOW + 3) == 0.0
+
+
+def test_remaining_header_lowers_the_level():
+    state = RateLimitState()
+    RateLimitUpdate(tokens_limit=1000, tokens_remaining=100).apply(state, 60.0, NOW)
+
+    assert state.tokens.level == 100
+
+
+# --- limiter ----------------------------------------------------------------
+
+
+class ThreadRecordingStore(InMemoryRateLimitStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads = []
+
+    def update(self, update, window_seconds, now):
+        self.threads.append(threading.current_thread())
+        super().update(update, window_seconds, now)
+
+    def refund_tokens(self, tokens, now):
+        self.threads.append(threading.current_thread())
+        super().refund_tokens(tokens, now)
+
+
+async def test_observe_and_refund_run_off_the_event_loop():
+    store = ThreadRecordingStore()
+    limiter = RateLimiter(store=store, tokens_per_minute=1000)
+    store.threads.clear()
+
+    await limiter.acquire(100)
+    await limiter.observe(200, {"x-ratelimit-remaining-tokens": "900"})
+    await limiter.refund(100)
+
+    assert len(store.threads) == 2
+    assert threading.main_thread() not in store.threads
+
+
+async def test_refund_returns_the_unused_estimate():
+    store = InMemoryRateLimitStore()
+    limiter = RateLimiter(store=store, tokens_per_minute=1000)
+
+    await limiter.acquire(400)
+    await limiter.refund(400, 150)
+
+    # 150 used of the 400 reserved
+    assert store._state.tokens.level == pytest.approx(850, abs=1)
+
+
+async def test_failed_attempt_refunds_the_whole_estimate():
+    store = InMemoryRateLimitStore()
+    limiter = RateLimiter(store=store, tokens_per_minute=1000)
+
+    # three attempts of a request that keeps failing
+    for _ in range(3):
+        await limiter.acquire(400)
+        await limiter.refund(400)
+
+    assert store._state.tokens.level == pytest.approx(1000, abs=1)
+
+
+async def test_429_without_hints_pauses_briefly():
+    limiter = RateLimiter()
+
+    update = await limiter.observe(429, {})
+
+    assert update.blocked_until is not None
+
+
+async def test_sqlite_store_is_shared_between_limiters(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = RateLimiter(store=SQLiteRateLimitStore(path), requests_per_minute=1)
+    second = RateLimiter(store=SQLiteRateLimitStore(path))
+
+    await first.acquire()
+
+    # the only request of the minute is spent: the other process has to wait
+    assert second._store.reserve(0, time.time()) > 50
@@ -0,0 +1,48 @@
+import asyncio
+
+from llm_explorer.base_summarizer import BaseSummarizer
+from llm_explorer.routing_summarizer import RoutingSummarizer
+
+ARTICLE = "The council approved the new budget on Tuesday. " * 20
+
+
+class SlowSummarizer(BaseSummarizer):
+    def __init__(self, name: str, delay: float) -> None:
+        super().__init__()
+        self._model_name = name
+        self.delay = delay
+
+    async def summarize_article(self, article: str):
+        await asyncio.sleep(self.delay)
+        return f"summary by {self._model_name}"
+
+
+async def test_fast_primary_is_recorded():
+    router = RoutingSummarizer(SlowSummarizer("primary", 0.01), hedge=SlowSummarizer("hedge", 0.01))
+
+    assert await router.summarize_article(ARTICLE) == "summary by primary"
+    assert len(router._primary_latency) == 1
+
+
+async def test_primary_that_loses_to_the_hedge_is_recorded_as_censored():
+    router = RoutingSummarizer(SlowSummarizer("primary", 5.0), hedge=SlowSummarizer("hedge", 0.01))
+    router.HEDGE_DEFAULT_DELAY = 0.05
+
+    assert await router.summarize_article(ARTICLE) == "summary by hedge"
+    await asyncio.sleep(0)
+
+    # the lost call ran past the hedge delay, so it counts at least that long
+    assert len(router._primary_latency) == 1
+    assert router._primary_latency.percentile(50) >= 0.05
+
+
+async def test_caller_cancelling_before_the_hedge_records_nothing():
+    router = RoutingSummarizer(SlowSummarizer("primary", 5.0), hedge=SlowSummarizer("hedge", 5.0))
+
+    task = asyncio.create_task(router.summarize_article(ARTICLE))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert len(router._primary_latency) == 0
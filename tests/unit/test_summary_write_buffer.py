@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.dialects import postgresql
+
+from database.models.models import SUMMARY_STATUS_FINAL, SummarizedArticles
+from database.repository.summarized_articles import (
+    PresummarizedArticleRepository,
+    SummaryWriteBuffer,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'articles.db'}")
+    SummarizedArticles.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(SummarizedArticles.__table__),
+            [
+                # revised once since it was first scraped
+                {"id": 1, "title": "Revised", "article_url": "u1", "source": "s", "version": 2},
+                {"id": 2, "title": "Unrevised", "article_url": "u2", "source": "s", "version": 1},
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+def stored(engine, id):
+    with engine.connect() as connection:
+        return tuple(
+            connection.execute(
+                select(SummarizedArticles.summary, SummarizedArticles.summary_status).where(
+                    SummarizedArticles.id == id
+                )
+            ).one()
+        )
+
+
+async def test_summary_of_an_older_version_arriving_last_is_superseded(engine):
+    buffer = SummaryWriteBuffer(engine, max_delay=0.01)
+
+    # the revision is summarized first, the original message comes back later
+    assert await buffer.write(1, "summary of v2", version=2) == SummaryWriteBuffer.STORED
+    assert await buffer.write(1, "summary of v1", version=1) == SummaryWriteBuffer.SUPERSEDED
+    await buffer.close()
+
+    assert stored(engine, 1) == ("summary of v2", SUMMARY_STATUS_FINAL)
+    assert buffer.stats["superseded"] == 1
+
+
+async def test_older_version_in_the_same_batch_is_superseded(engine):
+    buffer = SummaryWriteBuffer(engine, max_delay=0.01)
+
+    results = await asyncio.gather(
+        buffer.write(1, "summary of v2", version=2),
+        buffer.write(1, "summary of v1", version=1),
+    )
+    await buffer.close()
+
+    assert results == [SummaryWriteBuffer.STORED, SummaryWriteBuffer.SUPERSEDED]
+    assert stored(engine, 1) == ("summary of v2", SUMMARY_STATUS_FINAL)
+
+
+async def test_unversioned_and_missing_articles(engine):
+    buffer = SummaryWriteBuffer(engine, max_delay=0.01)
+
+    results = await asyncio.gather(
+        buffer.write(2, "summary"),
+        buffer.write(3, "summary of nothing", version=1),
+    )
+    await buffer.close()
+
+    assert results == [SummaryWriteBuffer.STORED, SummaryWriteBuffer.MISSING]
+    assert stored(engine, 2) == ("summary", SUMMARY_STATUS_FINAL)
+
+
+def test_batch_update_matches_on_version():
+    statement = PresummarizedArticleRepository._update_summaries_statement(
+        {1: "a", 2: "b"}, {1: 2}
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "summarized_articles.version = CAST(v.version AS INTEGER)" in sql
+    assert "v.version IS NULL" in sql
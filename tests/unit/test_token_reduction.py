@@ -0,0 +1,53 @@
+import pytest
+
+from llm_explorer.token_reduction import TokenReducer, is_boilerplate
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "By Monday, police had arrested three suspects.",
+        "By evening, the fire was under control.",
+        "The court ruled on the copyright dispute between the two studios.",
+        "Photos: flooding in Mumbai left thousands stranded.",
+        "Watch: the minister explains why the bridge collapsed last night.",
+    ],
+)
+def test_news_sentences_are_kept(sentence):
+    assert not is_boilerplate(sentence)
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "By Priya Sharma",
+        "By Priya Sharma | TOI",
+        "Written by A. K. Singh",
+        "© 2024 Bennett, Coleman & Co. Ltd.",
+        "Copyright 2024 The Hindu",
+        "All rights reserved.",
+        "Photos: Mumbai floods",
+        "Watch:",
+        "Also read: Budget 2024 highlights",
+    ],
+)
+def test_boilerplate_is_dropped(sentence):
+    assert is_boilerplate(sentence)
+
+
+def test_reduce_drops_only_boilerplate():
+    body = (
+        "By Monday, police had arrested three suspects.\n"
+        "The court ruled on the copyright dispute between the two studios.\n"
+        "Photos: flooding in Mumbai left thousands stranded.\n"
+        "Also read: Budget 2024 highlights\n"
+        "By Priya Sharma | TOI"
+    )
+
+    result = TokenReducer().reduce(body)
+
+    assert result.boilerplate_dropped == 2
+    assert "By Monday, police had arrested three suspects." in result.text
+    assert "copyright dispute" in result.text
+    assert "Photos: flooding in Mumbai" in result.text
+    assert "Also read" not in result.text
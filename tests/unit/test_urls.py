@@ -0,0 +1,24 @@
+from article_extractors.utils.urls import canonicalize_url
+
+
+def test_tracking_parameters_fragment_and_case_are_dropped():
+    assert (
+        canonicalize_url("HTTPS://Example.com/News/Story/?utm_source=x&b=2&a=1&fbclid=y#top")
+        == "https://example.com/News/Story?a=1&b=2"
+    )
+
+
+def test_default_port_is_dropped_and_other_ports_kept():
+    assert canonicalize_url("https://example.com:443/a") == "https://example.com/a"
+    assert canonicalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+
+def test_invalid_port_gives_none():
+    assert canonicalize_url("https://example.com:99999/a") is None
+    assert canonicalize_url("https://example.com:abc/a") is None
+
+
+def test_relative_and_missing_urls_give_none():
+    assert canonicalize_url(None) is None
+    assert canonicalize_url("NA") is None
+    assert canonicalize_url("/news/story") is None